@@ -1,4 +1,7 @@
-from django.http import Http404, HttpResponse
+import os
+
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext_lazy as _
 from django_rq.queues import get_redis_connection
@@ -71,6 +74,17 @@ class JobViewSet(NetBoxReadOnlyModelViewSet):
     serializer_class = serializers.JobSerializer
     filterset_class = filtersets.JobFilterSet
 
+    @extend_schema(responses={200: OpenApiTypes.BINARY})
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk):
+        """
+        Download the file produced by the job (if any).
+        """
+        job = self.get_object()
+        if not job.file or not default_storage.exists(job.file):
+            raise Http404(_("This job has no file to download."))
+        return FileResponse(default_storage.open(job.file), as_attachment=True, filename=os.path.basename(job.file))
+
 
 class ObjectChangeViewSet(NetBoxReadOnlyModelViewSet):
     """
@@ -4,6 +4,8 @@ from django.utils.translation import gettext_lazy as _
 from rq.job import JobStatus
 
 __all__ = (
+    'DATA_FILE_HASH_CHUNK_SIZE',
+    'DATA_FILE_SYNC_BATCH_SIZE',
     'JOB_LOG_ENTRY_LEVELS',
     'RQ_TASK_STATUSES',
 )
@@ -32,3 +34,9 @@ JOB_LOG_ENTRY_LEVELS = {
     'warning': Badge(_('Warning'), 'orange'),
     'error': Badge(_('Error'), 'red'),
 }
+
+# Size (in bytes) of the chunks read when hashing a DataFile
+DATA_FILE_HASH_CHUNK_SIZE = 64 * 1024
+
+# Number of DataFiles compared and written per batch during DataSource synchronization
+DATA_FILE_SYNC_BATCH_SIZE = 100
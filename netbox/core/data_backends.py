@@ -1,15 +1,20 @@
+import hashlib
 import logging
 import os
 import re
+import shutil
 import tempfile
 from contextlib import contextmanager
 from pathlib import Path
 from urllib.parse import urlparse
 
 from django import forms
+from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.utils.translation import gettext as _
+from django_pglocks import advisory_lock
 
+from netbox.constants import ADVISORY_LOCK_KEYS
 from netbox.data_backends import DataBackend
 from netbox.utils import register_data_backend
 from utilities.constants import HTTP_PROXY_SUPPORTED_SCHEMAS, HTTP_PROXY_SUPPORTED_SOCK_SCHEMAS
@@ -44,6 +49,20 @@ class LocalBackend(DataBackend):
     name = 'local'
     label = _('Local')
     is_local = True
+    parameters = {
+        'hash_workers': forms.IntegerField(
+            required=False,
+            min_value=1,
+            label=_('Hashing workers'),
+            widget=forms.NumberInput(attrs={'class': 'form-control'}),
+            help_text=_("Number of files to hash in parallel when synchronizing")
+        ),
+    }
+
+    @property
+    def hash_workers(self):
+        if workers := self.params.get('hash_workers'):
+            return int(workers)
 
     @contextmanager
     def fetch(self):
@@ -98,46 +117,174 @@ class GitBackend(DataBackend):
 
         return config
 
-    @contextmanager
-    def fetch(self):
+    @property
+    def mirror_path(self):
+        """
+        Return the path of the persistent local mirror for this repository & branch, or None if mirroring is not
+        available. Mirrors are not used with SOCKS proxies, which are not supported by dulwich's fetch operation.
+        """
+        if not settings.DATA_SOURCE_CACHE_ROOT or self.socks_proxy:
+            return None
+        key = hashlib.sha256(f"{self.url}#{self.params.get('branch') or ''}".encode()).hexdigest()[:16]
+        return os.path.join(settings.DATA_SOURCE_CACHE_ROOT, 'git', key)
+
+    def _get_transport_args(self):
+        """
+        Return the arguments common to both clone & fetch operations.
+        """
         from dulwich import porcelain
 
-        local_path = tempfile.TemporaryDirectory()
-
-        clone_args = {
-            "branch": self.params.get('branch'),
-            "config": self.config,
+        transport_args = {
             "errstream": porcelain.NoneStream(),
         }
 
-        # check if using socks for proxy - if so need to use custom pool_manager
-        if self.socks_proxy:
-            clone_args['pool_manager'] = ProxyPoolManager(self.socks_proxy)
-
         if self.url_scheme in ('http', 'https'):
             # Only pass explicit credentials if URL doesn't already contain embedded username
             # to avoid credential conflicts (see #20902)
             if not url_has_embedded_credentials(self.url) and self.params.get('username'):
-                clone_args.update(
+                transport_args.update(
                     {
                         "username": self.params.get('username'),
                         "password": self.params.get('password'),
                     }
                 )
         if self.url_scheme:
-            clone_args["quiet"] = True
-            clone_args["depth"] = 1
+            transport_args["quiet"] = True
+            transport_args["depth"] = 1
+
+        return transport_args
+
+    def _clone(self, path):
+        from dulwich import porcelain
+
+        clone_args = {
+            "branch": self.params.get('branch'),
+            "config": self.config,
+            **self._get_transport_args(),
+        }
+
+        # check if using socks for proxy - if so need to use custom pool_manager
+        if self.socks_proxy:
+            clone_args['pool_manager'] = ProxyPoolManager(self.socks_proxy)
 
         logger.debug(f"Cloning git repo: {self.url}")
         try:
-            porcelain.clone(self.url, local_path.name, **clone_args)
+            repo = porcelain.clone(self.url, path, **clone_args)
         except BaseException as e:
             raise SyncError(_("Fetching remote data failed ({name}): {error}").format(name=type(e).__name__, error=e))
 
+        with repo:
+            self.revision = repo.head().decode()
+
+    def _update_mirror(self, path):
+        """
+        Fetch the configured branch into an existing mirror and apply any changes to its working tree. Only files
+        which differ between the previous and new commits are written to disk.
+        """
+        from dulwich import porcelain
+        from dulwich.index import build_file_from_blob
+        from dulwich.repo import Repo
+
+        logger.debug(f"Fetching git repo {self.url} into mirror {path}")
+        with Repo(path) as repo:
+            # Apply the current proxy configuration, which is read from the repo config by fetch()
+            repo_config = repo.get_config()
+            for section in self.config.sections():
+                for name, value in self.config.items(section):
+                    repo_config.set(section, name, value)
+            repo_config.write_to_path()
+
+            old_head = repo.head()
+            result = porcelain.fetch(repo, self.url, **self._get_transport_args())
+            if branch := self.params.get('branch'):
+                new_head = result.refs[f'refs/heads/{branch}'.encode()]
+            else:
+                new_head = result.refs[b'HEAD']
+
+            if new_head != old_head:
+                updated, deleted = self._diff(repo, old_head, new_head)
+                for tree_path in deleted:
+                    file_path = os.path.join(path, tree_path)
+                    if os.path.lexists(file_path):
+                        os.remove(file_path)
+                for tree_path, entry in updated.items():
+                    file_path = os.path.join(path, tree_path)
+                    if os.path.isdir(file_path) and not os.path.islink(file_path):
+                        shutil.rmtree(file_path)
+                    elif os.path.lexists(file_path):
+                        os.remove(file_path)
+                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                    build_file_from_blob(repo[entry.sha], entry.mode, file_path.encode())
+                repo.refs[b'HEAD'] = new_head
+
+            self.revision = new_head.decode()
+
+    @staticmethod
+    def _diff(repo, old_commit, new_commit):
+        """
+        Compare two commits, returning a dictionary mapping updated paths to their tree entries and a set of
+        deleted paths.
+        """
+        from dulwich.diff_tree import CHANGE_DELETE, tree_changes
+        from dulwich.objects import S_ISGITLINK
+
+        updated = {}
+        deleted = set()
+        for change in tree_changes(repo.object_store, repo[old_commit].tree, repo[new_commit].tree):
+            if change.type == CHANGE_DELETE:
+                if not S_ISGITLINK(change.old.mode):
+                    deleted.add(change.old.path.decode())
+            elif not S_ISGITLINK(change.new.mode):
+                updated[change.new.path.decode()] = change.new
+
+        return updated, deleted
+
+    @contextmanager
+    def fetch(self):
+        if mirror_path := self.mirror_path:
+            # Hold an advisory lock on the mirror until the caller is done with it, so that concurrent syncs of the same
+            # repository never modify (or remove) the working tree while another is reading from it. The second part of
+            # the lock ID is derived from the mirror's key.
+            lock_id = (ADVISORY_LOCK_KEYS['data-source-mirror'], int(os.path.basename(mirror_path)[:8], 16) - 2**31)
+            with advisory_lock(lock_id):
+                if os.path.isdir(mirror_path):
+                    try:
+                        self._update_mirror(mirror_path)
+                    except Exception as e:
+                        # Discard the mirror and fall back to a fresh clone
+                        logger.warning(f"Failed to update git mirror {mirror_path}; recreating it ({e})")
+                        shutil.rmtree(mirror_path)
+                if not os.path.isdir(mirror_path):
+                    os.makedirs(mirror_path)
+                    try:
+                        self._clone(mirror_path)
+                    except SyncError:
+                        shutil.rmtree(mirror_path)
+                        raise
+                yield mirror_path
+            return
+
+        local_path = tempfile.TemporaryDirectory()
+        self._clone(local_path.name)
+
         yield local_path.name
 
         local_path.cleanup()
 
+    def get_changes(self, since):
+        from dulwich.repo import Repo
+
+        if not (mirror_path := self.mirror_path) or not since or not self.revision:
+            return None
+
+        with Repo(mirror_path) as repo:
+            # The previous commit may not be present (e.g. if the mirror was recreated)
+            if since.encode() not in repo.object_store:
+                return None
+            updated, deleted = self._diff(repo, since.encode(), self.revision.encode())
+
+        return set(updated), deleted
+
 
 @register_data_backend()
 class S3Backend(DataBackend):
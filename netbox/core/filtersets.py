@@ -41,7 +41,7 @@ class DataSourceFilterSet(PrimaryModelFilterSet):
 
     class Meta:
         model = DataSource
-        fields = ('id', 'name', 'enabled', 'description', 'source_url', 'last_synced')
+        fields = ('id', 'name', 'enabled', 'description', 'source_url', 'last_synced', 'last_commit')
 
     def search(self, queryset, name, value):
         if not value.strip():
@@ -52,6 +52,7 @@ class DataSourceFilter(PrimaryModelFilter):
         strawberry_django.filter_field()
     )
     last_synced: DatetimeFilterLookup[datetime] | None = strawberry_django.filter_field()
+    last_commit: FilterLookup[str] | None = strawberry_django.filter_field()
     datafiles: Annotated['DataFileFilter', strawberry.lazy('core.graphql.filters')] | None = (
         strawberry_django.filter_field()
     )
@@ -1,10 +1,12 @@
 import sys
+import uuid
 from datetime import timedelta
 from importlib import import_module
 
 import requests
 from django.conf import settings
 from django.core.cache import cache
+from django.core.files.storage import default_storage
 from django.utils import timezone
 from packaging import version
 
@@ -77,6 +79,7 @@ class SystemHousekeepingJob(JobRunner):
         self.clear_expired_sessions()
         self.prune_changelog()
         self.delete_expired_jobs()
+        self.delete_orphaned_job_files()
         self.check_for_new_releases()
 
     def send_census_report(self):
@@ -157,6 +160,28 @@ class SystemHousekeepingJob(JobRunner):
         count = Job.objects.filter(created__lt=cutoff).delete()[0]
         self.logger.info(f"Deleted {count} expired jobs")
 
+    def delete_orphaned_job_files(self):
+        """
+        Delete any files saved to the default storage backend by jobs which no longer exist.
+        """
+        self.logger.info("Deleting orphaned job files...")
+        try:
+            dirnames, __ = default_storage.listdir('jobs/')
+        except FileNotFoundError:
+            self.logger.info("No job files found; skipping.")
+            return
+
+        job_ids = set()
+        for dirname in dirnames:
+            try:
+                job_ids.add(uuid.UUID(dirname))
+            except ValueError:
+                continue
+        orphaned_ids = job_ids.difference(Job.objects.filter(job_id__in=job_ids).values_list('job_id', flat=True))
+        for job_id in orphaned_ids:
+            Job(job_id=job_id).delete_files()
+        self.logger.info(f"Deleted files for {len(orphaned_ids)} orphaned jobs")
+
     def check_for_new_releases(self):
         """
         Check for new releases and cache the latest release.
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('core', '0021_job_queue_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasource',
+            name='last_commit',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
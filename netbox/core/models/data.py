@@ -1,7 +1,7 @@
-import hashlib
 import logging
 import os
 from fnmatch import fnmatchcase
+from itertools import batched
 from urllib.parse import urlparse
 
 import yaml
@@ -20,7 +20,9 @@ from netbox.models.features import JobsMixin
 from netbox.registry import registry
 from utilities.querysets import RestrictedQuerySet
 from ..choices import *
+from ..constants import DATA_FILE_SYNC_BATCH_SIZE
 from ..exceptions import SyncError
+from ..utils import get_file_hash, get_file_hashes
 
 __all__ = (
     'AutoSyncRecord',
@@ -81,6 +83,13 @@ class DataSource(JobsMixin, PrimaryModel):
         null=True,
         editable=False
     )
+    last_commit = models.CharField(
+        verbose_name=_('last commit'),
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text=_("Revision of the remote source as of the most recent synchronization")
+    )
 
     class Meta:
         ordering = ('name',)
@@ -144,6 +153,20 @@ class DataSource(JobsMixin, PrimaryModel):
             elif self.status == DataSourceStatusChoices.QUEUED:
                 self.status = DataSourceStatusChoices.NEW
 
+        # Discard the last synchronized revision if the source or its ignore rules have changed, to force a full
+        # comparison of files on the next sync
+        if not self._state.adding and self.last_commit:
+            prev = DataSource.objects.filter(pk=self.pk).values(
+                'type', 'source_url', 'parameters', 'ignore_rules'
+            ).first()
+            if prev and prev != {
+                'type': self.type,
+                'source_url': self.source_url,
+                'parameters': self.parameters,
+                'ignore_rules': self.ignore_rules,
+            }:
+                self.last_commit = ''
+
         super().save(*args, **kwargs)
 
     def to_objectchange(self, action):
@@ -197,48 +220,75 @@ class DataSource(JobsMixin, PrimaryModel):
         with backend.fetch() as local_path:
 
             logger.debug(f'Syncing files from source root {local_path}')
-            data_files = self.datafiles.all()
-            known_paths = {df.path for df in data_files}
-            logger.debug(f'Starting with {len(known_paths)} known files')
+            changes = backend.get_changes(self.last_commit) if self.last_commit else None
+            if changes is not None:
+                # Only compare files which have changed since the last synchronized revision
+                changed_paths, deleted_paths = changes
+                changed_paths = {path for path in changed_paths if self._include(path)}
+                logger.debug(
+                    f'Found {len(changed_paths)} changed and {len(deleted_paths)} deleted files since '
+                    f'{self.last_commit}'
+                )
+                data_files = self.datafiles.filter(path__in=changed_paths | deleted_paths)
+            else:
+                data_files = self.datafiles.all()
 
-            # Check for any updated/deleted files
-            updated_files = []
+            # Check for any updated/deleted files. Known files are compared in batches by hash, and file data is
+            # read only for those which have been modified.
+            known_paths = set()
             deleted_file_ids = []
-            for datafile in data_files:
-
-                try:
-                    if datafile.refresh_from_disk(source_root=local_path):
+            updated_count = 0
+            data_files = data_files.only('pk', 'path', 'hash').iterator(chunk_size=DATA_FILE_SYNC_BATCH_SIZE)
+            for batch in batched(data_files, DATA_FILE_SYNC_BATCH_SIZE):
+                file_hashes = get_file_hashes(local_path, [df.path for df in batch], workers=backend.hash_workers)
+                updated_files = []
+                for datafile in batch:
+                    known_paths.add(datafile.path)
+                    if datafile.path not in file_hashes:
+                        # File no longer exists
+                        deleted_file_ids.append(datafile.pk)
+                    elif datafile.refresh_from_disk(source_root=local_path, file_hash=file_hashes[datafile.path]):
                         updated_files.append(datafile)
-                except FileNotFoundError:
-                    # File no longer exists
-                    deleted_file_ids.append(datafile.pk)
-                    continue
 
-            # Bulk update modified files
-            updated_count = DataFile.objects.bulk_update(updated_files, ('last_updated', 'size', 'hash', 'data'))
+                # Bulk update modified files
+                updated_count += DataFile.objects.bulk_update(
+                    updated_files, ('last_updated', 'size', 'hash', 'data')
+                )
+            logger.debug(f'Compared {len(known_paths)} known files')
             logger.debug(f"Updated {updated_count} files")
 
             # Bulk delete deleted files
             deleted_count, __ = DataFile.objects.filter(pk__in=deleted_file_ids).delete()
             logger.debug(f"Deleted {deleted_count} files")
 
-            # Walk the local replication to find new files
-            new_paths = self._walk(local_path) - known_paths
+            # Walk the local replication (or consult the list of changes) to find new files
+            if changes is not None:
+                new_paths = changed_paths - known_paths
+            else:
+                new_paths = self._walk(local_path) - known_paths
 
             # Bulk create new files
-            new_datafiles = []
-            for path in new_paths:
-                datafile = DataFile(source=self, path=path)
-                datafile.refresh_from_disk(source_root=local_path)
-                datafile.full_clean()
-                new_datafiles.append(datafile)
-            created_count = len(DataFile.objects.bulk_create(new_datafiles, batch_size=100))
+            created_count = 0
+            for batch in batched(sorted(new_paths), DATA_FILE_SYNC_BATCH_SIZE):
+                file_hashes = get_file_hashes(local_path, batch, workers=backend.hash_workers)
+                new_datafiles = []
+                for path in batch:
+                    datafile = DataFile(source=self, path=path)
+                    datafile.refresh_from_disk(source_root=local_path, file_hash=file_hashes.get(path))
+                    datafile.full_clean()
+                    new_datafiles.append(datafile)
+                created_count += len(DataFile.objects.bulk_create(new_datafiles))
             logger.debug(f"Created {created_count} data files")
 
-        # Update status & last_synced time
+        # Update status, last_synced time, & revision
         self.status = DataSourceStatusChoices.COMPLETED
         self.last_synced = timezone.now()
-        DataSource.objects.filter(pk=self.pk).update(status=self.status, last_synced=self.last_synced)
+        self.last_commit = backend.revision or ''
+        DataSource.objects.filter(pk=self.pk).update(
+            status=self.status,
+            last_synced=self.last_synced,
+            last_commit=self.last_commit
+        )
 
         # Emit the post_sync signal
         post_sync.send(sender=self.__class__, instance=self)
@@ -262,6 +312,13 @@ class DataSource(JobsMixin, PrimaryModel):
         logger.debug(f"Found {len(paths)} files")
         return paths
 
+    def _include(self, path):
+        """
+        Returns a boolean indicating whether the file at the given relative path would be included by _walk().
+        """
+        dir_name, file_name = os.path.split(path)
+        return not dir_name.startswith('.') and not self._ignore(file_name)
+
     def _ignore(self, filename):
         """
         Returns a boolean indicating whether the file should be ignored per the DataSource's configured
@@ -350,14 +407,14 @@ class DataFile(models.Model):
         # TODO: Something more robust
         return yaml.safe_load(self.data_as_string)
 
-    def refresh_from_disk(self, source_root):
+    def refresh_from_disk(self, source_root, file_hash=None):
         """
         Update instance attributes from the file on disk. Returns True if any attribute
-        has changed.
+        has changed. A precomputed file_hash may be passed to avoid reading the file again.
         """
         file_path = os.path.join(source_root, self.path)
-        with open(file_path, 'rb') as f:
-            file_hash = hashlib.sha256(f.read()).hexdigest()
+        if file_hash is None:
+            file_hash = get_file_hash(file_path)
 
         # Update instance file attributes & data
         if is_modified := file_hash != self.hash:
@@ -8,6 +8,7 @@ from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.postgres.fields import ArrayField
 from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator
 from django.db import models, transaction
@@ -184,6 +185,35 @@ class Job(models.Model):
 
         return f"{int(minutes)} minutes, {seconds:.2f} seconds"
 
+    @property
+    def storage_path(self):
+        """
+        The directory within the default storage backend to which any files produced by the job are saved.
+        """
+        return f'jobs/{self.job_id}/'
+
+    @property
+    def file(self):
+        """
+        Return the path to the file produced by the job (if any), as recorded in its data.
+        """
+        if isinstance(self.data, dict):
+            path = self.data.get('file')
+            if isinstance(path, str) and path.startswith(self.storage_path):
+                return path
+
+    def delete_files(self):
+        """
+        Delete any files saved by the job to the default storage backend.
+        """
+        try:
+            __, filenames = default_storage.listdir(self.storage_path)
+        except FileNotFoundError:
+            return
+        for filename in filenames:
+            default_storage.delete(f'{self.storage_path}{filename}')
+    delete_files.alters_data = True
+
     def delete(self, *args, **kwargs):
         # Use the stored queue name, or fall back to get_queue_for_model for legacy jobs
         rq_queue_name = self.queue_name or get_queue_for_model(self.object_type.model if self.object_type else None)
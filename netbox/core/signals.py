@@ -5,7 +5,8 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.db.models import CASCADE, RESTRICT
 from django.db.models.fields.reverse_related import ManyToManyRel, ManyToOneRel
-from django.db.models.signals import m2m_changed, post_migrate, post_save, pre_delete
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete
 from django.dispatch import receiver, Signal
 from django.core.signals import request_finished
 from django.utils.translation import gettext_lazy as _
@@ -21,6 +22,7 @@ from netbox.config import get_config
 from utilities.data import get_config_value_ci
 from netbox.context import current_request, events_queue
 from netbox.models.features import ChangeLoggingMixin, get_model_features, model_is_public
+from netbox.signals import post_bulk_create
 from utilities.exceptions import AbortRequest
 from .models import ConfigRevision, DataSource, ObjectChange
 
@@ -90,7 +92,8 @@ def handle_changed_object(sender, instance, **kwargs):
     """
     m2m_changed = False
 
-    if not hasattr(instance, 'to_objectchange'):
+    # Objects created in bulk are handled by handle_bulk_created_objects()
+    if kwargs.get('bulk') or not hasattr(instance, 'to_objectchange'):
         return
 
     # Get the current request, or bail if not set
@@ -160,6 +163,40 @@ def handle_changed_object(sender, instance, **kwargs):
         model_updates.labels(instance._meta.model_name).inc()
 
 
+@receiver(post_bulk_create)
+def handle_bulk_created_objects(sender, instances, **kwargs):
+    """
+    Fires when a set of objects has been created in bulk. Records all ObjectChanges in a single query.
+    """
+    if not hasattr(sender, 'to_objectchange'):
+        return
+
+    # Get the current request, or bail if not set
+    request = current_request.get()
+    if request is None:
+        return
+
+    # Create an ObjectChange record for each object
+    objectchanges = []
+    for instance in instances:
+        objectchange = instance.to_objectchange(ObjectChangeActionChoices.ACTION_CREATE)
+        if objectchange and objectchange.has_changes:
+            objectchange.user = request.user
+            objectchange.user_name = request.user.username
+            objectchange.request_id = request.id
+            objectchanges.append(objectchange)
+    ObjectChange.objects.bulk_create(objectchanges)
+
+    # Enqueue the objects for event processing
+    queue = events_queue.get()
+    for instance in instances:
+        enqueue_event(queue, instance, request, OBJECT_CREATED)
+    events_queue.set(queue)
+
+    # Increment metric counters
+    model_inserts.labels(sender._meta.model_name).inc(len(instances))
+
+
 @receiver(pre_delete)
 def handle_deleted_object(sender, instance, **kwargs):
     """
@@ -293,6 +330,18 @@ def auto_sync(instance, **kwargs):
         autosync.object.sync(save=True)
 
 
+#
+# Job handlers
+#
+
+@receiver(post_delete, sender='core.Job')
+def delete_job_files(instance, **kwargs):
+    """
+    Delete any files saved by a Job once its deletion has been committed.
+    """
+    transaction.on_commit(instance.delete_files)
+
+
 @receiver(post_save, sender=ConfigRevision)
 def update_config(sender, instance, **kwargs):
     """
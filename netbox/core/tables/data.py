@@ -32,6 +32,9 @@ class DataSourceTable(PrimaryModelTable):
     last_synced = tables.DateTimeColumn(
         verbose_name=_('Last Synced'),
     )
+    last_commit = tables.Column(
+        verbose_name=_('Last Commit'),
+    )
     file_count = tables.Column(
         verbose_name=_('Files'),
     )
@@ -46,7 +49,7 @@ class DataSourceTable(PrimaryModelTable):
         model = DataSource
         fields = (
             'pk', 'id', 'name', 'type', 'status', 'enabled', 'source_url', 'description', 'sync_interval', 'comments',
-            'parameters', 'last_synced', 'created', 'last_updated', 'file_count',
+            'parameters', 'last_synced', 'last_commit', 'created', 'last_updated', 'file_count',
         )
         default_columns = ('pk', 'name', 'type', 'status', 'enabled', 'description', 'sync_interval', 'file_count')
 
@@ -1,9 +1,14 @@
+import os
+import tempfile
 from unittest import skipIf
 from unittest.mock import patch
 
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
 
 from core.data_backends import url_has_embedded_credentials
+from core.models import DataSource
+from netbox.constants import ADVISORY_LOCK_KEYS
 
 try:
     import dulwich  # noqa: F401
@@ -114,3 +119,111 @@ class GitBackendCredentialIntegrationTests(TestCase):
 
         self.assertEqual(kwargs.get('username'), None)
         self.assertEqual(kwargs.get('password'), None)
+
+
+@skipIf(not DULWICH_AVAILABLE, "dulwich is not installed")
+class GitBackendMirrorTests(TestCase):
+    """
+    Test incremental synchronization of a git data source using a persistent local mirror.
+    """
+
+    def setUp(self):
+        self.repo_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.repo_dir.cleanup)
+        self.addCleanup(self.cache_dir.cleanup)
+
+    def _commit(self, files=None, deleted=None):
+        from dulwich import porcelain
+
+        for path, content in (files or {}).items():
+            file_path = os.path.join(self.repo_dir.name, path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'w') as f:
+                f.write(content)
+        for path in deleted or []:
+            os.remove(os.path.join(self.repo_dir.name, path))
+        porcelain.add(self.repo_dir.name, paths=[os.path.join(self.repo_dir.name, p) for p in files or []])
+        if deleted:
+            porcelain.remove(self.repo_dir.name, paths=[os.path.join(self.repo_dir.name, p) for p in deleted])
+        return porcelain.commit(
+            self.repo_dir.name,
+            message=b'Update',
+            author=b'Test <test@example.com>',
+            committer=b'Test <test@example.com>'
+        ).decode()
+
+    def test_incremental_sync(self):
+        from dulwich import porcelain
+
+        porcelain.init(self.repo_dir.name)
+        first_commit = self._commit(files={
+            'file1.txt': 'foo',
+            'file2.txt': 'bar',
+            'dir/file3.txt': 'baz',
+            'README': 'ignored',
+        })
+        datasource = DataSource.objects.create(
+            name='Data Source 1',
+            type='git',
+            source_url=self.repo_dir.name,
+            ignore_rules='README'
+        )
+
+        with override_settings(DATA_SOURCE_CACHE_ROOT=self.cache_dir.name):
+            datasource.sync()
+            self.assertEqual(datasource.last_commit, first_commit)
+            self.assertEqual(
+                set(datasource.datafiles.values_list('path', flat=True)),
+                {'file1.txt', 'file2.txt', 'dir/file3.txt'}
+            )
+
+            second_commit = self._commit(
+                files={'file1.txt': 'qux', 'dir/file4.txt': 'new', 'README': 'changed'},
+                deleted=['file2.txt']
+            )
+            backend = datasource.get_backend()
+            with backend.fetch() as local_path:
+                self.assertTrue(local_path.startswith(self.cache_dir.name))
+                self.assertEqual(backend.revision, second_commit)
+                self.assertEqual(
+                    backend.get_changes(first_commit),
+                    ({'file1.txt', 'dir/file4.txt', 'README'}, {'file2.txt'})
+                )
+                self.assertFalse(os.path.exists(os.path.join(local_path, 'file2.txt')))
+
+            third_commit = self._commit(files={'dir/file3.txt': 'changed'})
+            datasource.sync()
+            self.assertEqual(datasource.last_commit, third_commit)
+            self.assertEqual(
+                set(datasource.datafiles.values_list('path', flat=True)),
+                {'file1.txt', 'dir/file3.txt', 'dir/file4.txt'}
+            )
+            self.assertEqual(bytes(datasource.datafiles.get(path='file1.txt').data), b'qux')
+            self.assertEqual(bytes(datasource.datafiles.get(path='dir/file3.txt').data), b'changed')
+
+        # Modifying the ignore rules resets the recorded revision
+        datasource.ignore_rules = ''
+        datasource.save()
+        self.assertEqual(datasource.last_commit, '')
+
+    def test_mirror_lock(self):
+        from dulwich import porcelain
+
+        porcelain.init(self.repo_dir.name)
+        self._commit(files={'file1.txt': 'foo'})
+        datasource = DataSource.objects.create(name='Data Source 1', type='git', source_url=self.repo_dir.name)
+
+        def count_locks():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM pg_locks WHERE locktype = 'advisory' AND classid = %s AND objsubid = 2",
+                    [ADVISORY_LOCK_KEYS['data-source-mirror']]
+                )
+                return cursor.fetchone()[0]
+
+        # An advisory lock on the mirror is held for as long as it is in use
+        with override_settings(DATA_SOURCE_CACHE_ROOT=self.cache_dir.name):
+            with datasource.get_backend().fetch():
+                self.assertEqual(count_locks(), 1)
+            self.assertEqual(count_locks(), 0)
@@ -1,8 +1,14 @@
+import hashlib
+import os
+import tempfile
+import uuid
 from unittest.mock import patch, MagicMock
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
-from django.test import TestCase
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
 
 from core.models import DataSource, Job, ObjectType
 from core.choices import ObjectChangeActionChoices
@@ -127,6 +133,52 @@ class DataSourceChangeLoggingTestCase(TestCase):
         self.assertEqual(objectchange.postchange_data['parameters']['password'], CENSOR_TOKEN)
 
 
+class DataSourceSyncTestCase(TestCase):
+
+    def setUp(self):
+        self.source_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.source_dir.cleanup)
+
+    def _write(self, path, content):
+        file_path = os.path.join(self.source_dir.name, path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'wb') as f:
+            f.write(content)
+
+    @patch('core.models.data.DATA_FILE_SYNC_BATCH_SIZE', 2)
+    def test_sync(self):
+        for i in range(5):
+            self._write(f'dir/file{i}.txt', f'content {i}'.encode())
+        self._write('.hidden', b'hidden')
+        datasource = DataSource.objects.create(
+            name='Data Source 1',
+            type='local',
+            source_url=f'file://{self.source_dir.name}',
+            parameters={'hash_workers': 2}
+        )
+
+        datasource.sync()
+        self.assertEqual(datasource.datafiles.count(), 5)
+        datafile = datasource.datafiles.get(path='dir/file0.txt')
+        self.assertEqual(datafile.hash, hashlib.sha256(b'content 0').hexdigest())
+        self.assertEqual(bytes(datafile.data), b'content 0')
+
+        # Modify, delete, and create files
+        self._write('dir/file0.txt', b'modified')
+        os.remove(os.path.join(self.source_dir.name, 'dir/file1.txt'))
+        self._write('file5.txt', b'content 5')
+
+        datasource.sync()
+        self.assertEqual(
+            set(datasource.datafiles.values_list('path', flat=True)),
+            {'dir/file0.txt', 'dir/file2.txt', 'dir/file3.txt', 'dir/file4.txt', 'file5.txt'}
+        )
+        datafile = datasource.datafiles.get(path='dir/file0.txt')
+        self.assertEqual(datafile.hash, hashlib.sha256(b'modified').hexdigest())
+        self.assertEqual(datafile.size, 8)
+        self.assertEqual(bytes(datafile.data), b'modified')
+
+
 class ObjectTypeTest(TestCase):
 
     def test_create(self):
@@ -237,3 +289,20 @@ class JobTest(TestCase):
         mock_get_queue.assert_called_with(custom_queue)
         mock_queue.fetch_job.assert_called_with(str(job.job_id))
         mock_rq_job.cancel.assert_called_once()
+
+    @override_settings(STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    })
+    def test_delete_removes_files(self):
+        """
+        Test that any files saved by a job are deleted along with it.
+        """
+        job = Job.objects.create(name='Test Job', job_id=uuid.uuid4())
+        path = default_storage.save(f'{job.storage_path}output.txt', ContentFile(b'foo'))
+        job.data = {'file': path}
+        self.assertEqual(job.file, path)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Job.objects.filter(pk=job.pk).delete()
+        self.assertFalse(default_storage.exists(path))
@@ -3,6 +3,9 @@ import urllib.parse
 import uuid
 from datetime import datetime
 
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
 from django_rq import get_queue
@@ -140,6 +143,36 @@ class ObjectChangeTestCase(TestCase):
         self.assertHttpStatus(response, 200)
 
 
+@override_settings(STORAGES={
+    'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+class JobDownloadTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.job = Job.objects.create(name='Job 1', job_id=uuid.uuid4(), user=self.user)
+        self.job.data = {'file': default_storage.save(f'{self.job.storage_path}export.txt', ContentFile(b'foo'))}
+        self.job.save()
+
+    def test_download_without_permission(self):
+        response = self.client.get(reverse('core:job_download', kwargs={'pk': self.job.pk}))
+        self.assertHttpStatus(response, 403)
+
+    def test_download(self):
+        self.add_permissions('core.view_job')
+        response = self.client.get(reverse('core:job_download', kwargs={'pk': self.job.pk}))
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="export.txt"')
+        self.assertEqual(b''.join(response.streaming_content), b'foo')
+
+    def test_download_without_file(self):
+        self.add_permissions('core.view_job')
+        Job.objects.filter(pk=self.job.pk).update(data={'file': 'exports/export.txt'})
+        response = self.client.get(reverse('core:job_download', kwargs={'pk': self.job.pk}))
+        self.assertHttpStatus(response, 404)
+
+
 class BackgroundTaskTestCase(TestCase):
     user_permissions = ()
 
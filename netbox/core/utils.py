@@ -1,3 +1,7 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from django.http import Http404
 from django.utils.translation import gettext_lazy as _
 from django_rq.queues import get_queue, get_queue_by_index, get_redis_connection
@@ -14,9 +18,13 @@ from rq.registry import (
     StartedJobRegistry,
 )
 
+from .constants import DATA_FILE_HASH_CHUNK_SIZE
+
 __all__ = (
     'delete_rq_job',
     'enqueue_rq_job',
+    'get_file_hash',
+    'get_file_hashes',
     'get_rq_jobs',
     'get_rq_jobs_from_status',
     'requeue_rq_job',
@@ -153,3 +161,35 @@ def stop_rq_job(job_id):
     queue = get_queue_by_index(queue_index)
 
     return stop_jobs(queue, job_id)[0]
+
+
+def get_file_hash(file_path):
+    """
+    Return the SHA256 hash of the file at the given path, reading it in chunks to bound memory consumption.
+    """
+    file_hash = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(DATA_FILE_HASH_CHUNK_SIZE):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def get_file_hashes(source_root, paths, workers=None):
+    """
+    Return a dictionary mapping each of the given paths (relative to source_root) to the SHA256 hash of its file.
+    Paths which do not exist are omitted. If workers is specified, files are hashed concurrently using a pool of
+    threads.
+    """
+    def _hash(path):
+        try:
+            return path, get_file_hash(os.path.join(source_root, path))
+        except FileNotFoundError:
+            return path, None
+
+    if workers and workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_hash, paths))
+    else:
+        results = [_hash(path) for path in paths]
+
+    return {path: file_hash for path, file_hash in results if file_hash is not None}
@@ -1,4 +1,5 @@
 import json
+import os
 import platform
 
 from copy import deepcopy
@@ -7,8 +8,9 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.core.cache import cache
+from django.core.files.storage import default_storage
 from django.db import connection, ProgrammingError
-from django.http import HttpResponse, HttpResponseForbidden, Http404
+from django.http import FileResponse, HttpResponse, HttpResponseForbidden, Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
@@ -33,6 +35,7 @@ from utilities.data import shallow_compare_dict
 from utilities.forms import ConfirmationForm
 from utilities.htmx import htmx_partial
 from utilities.json import ConfigJSONEncoder
+from utilities.permissions import get_permission_for_model
 from utilities.query import count_related
 from utilities.views import (
     ContentTypePermissionRequiredMixin,
@@ -207,6 +210,23 @@ class JobLogView(generic.ObjectView):
         }
 
 
+@register_model_view(Job, 'download')
+class JobDownloadView(BaseObjectView):
+    """
+    Download the file produced by a job (e.g. a rendered export template).
+    """
+    queryset = Job.objects.all()
+
+    def get_required_permission(self):
+        return get_permission_for_model(self.queryset.model, 'view')
+
+    def get(self, request, pk):
+        job = get_object_or_404(self.queryset, pk=pk)
+        if not job.file or not default_storage.exists(job.file):
+            raise Http404(_("This job has no file to download."))
+        return FileResponse(default_storage.open(job.file), as_attachment=True, filename=os.path.basename(job.file))
+
+
 @register_model_view(Job, 'delete')
 class JobDeleteView(generic.ObjectDeleteView):
     queryset = Job.objects.defer('data')
@@ -77,6 +77,7 @@ class DeviceSerializer(PrimaryModelSerializer):
     device_bay_count = serializers.IntegerField(read_only=True)
     module_bay_count = serializers.IntegerField(read_only=True)
     inventory_item_count = serializers.IntegerField(read_only=True)
+    component_summary = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Device
@@ -87,10 +88,19 @@ class DeviceSerializer(PrimaryModelSerializer):
             'vc_position', 'vc_priority', 'description', 'owner', 'comments', 'config_template', 'local_context_data',
             'tags', 'custom_fields', 'created', 'last_updated', 'console_port_count', 'console_server_port_count',
             'power_port_count', 'power_outlet_count', 'interface_count', 'front_port_count', 'rear_port_count',
-            'device_bay_count', 'module_bay_count', 'inventory_item_count',
+            'device_bay_count', 'module_bay_count', 'inventory_item_count', 'component_summary',
         ]
         brief_fields = ('id', 'url', 'display', 'name', 'description')
 
+    def __init__(self, *args, nested=False, fields=None, omit=None, **kwargs):
+        # Omit the component summary unless it has been named explicitly in `fields` or requested using the `include`
+        # query parameter. (It is thus also omitted from event data and other serializations made without a request.)
+        request = kwargs.get('context', {}).get('request')
+        include = request.query_params.get('include', '').split(',') if hasattr(request, 'query_params') else []
+        if not nested and not fields and 'component_summary' not in include:
+            omit = [*(omit or []), 'component_summary']
+        super().__init__(*args, nested=nested, fields=fields, omit=omit, **kwargs)
+
     @extend_schema_field(NestedDeviceSerializer(allow_null=True))
     def get_parent_device(self, obj):
         try:
@@ -102,6 +112,10 @@ class DeviceSerializer(PrimaryModelSerializer):
         data['device_bay'] = NestedDeviceBaySerializer(instance=device_bay, context=context).data
         return data
 
+    @extend_schema_field(serializers.JSONField())
+    def get_component_summary(self, obj):
+        return obj.get_component_summary()
+
 
 class DeviceWithConfigContextSerializer(DeviceSerializer):
     config_context = serializers.SerializerMethodField(read_only=True, allow_null=True)
@@ -115,6 +129,7 @@ class DeviceWithConfigContextSerializer(DeviceSerializer):
             'local_context_data', 'tags', 'custom_fields', 'created', 'last_updated', 'console_port_count',
             'console_server_port_count', 'power_port_count', 'power_outlet_count', 'interface_count',
             'front_port_count', 'rear_port_count', 'device_bay_count', 'module_bay_count', 'inventory_item_count',
+            'component_summary',
         ]
 
     @extend_schema_field(serializers.JSONField(allow_null=True))
@@ -1,3 +1,5 @@
+import decimal
+
 from django.utils.translation import gettext as _
 from rest_framework import serializers
 
@@ -15,6 +17,10 @@ from .sites import LocationSerializer, SiteSerializer
 
 __all__ = (
     'RackElevationDetailFilterSerializer',
+    'RackElevationListFilterSerializer',
+    'RackElevationSerializer',
+    'RackFreeSpaceFilterSerializer',
+    'RackFreeSpaceSerializer',
     'RackReservationSerializer',
     'RackRoleSerializer',
     'RackSerializer',
@@ -119,6 +125,13 @@ class RackSerializer(RackBaseSerializer):
         default=None
     )
 
+    utilization = serializers.FloatField(
+        read_only=True
+    )
+    power_utilization = serializers.FloatField(
+        read_only=True
+    )
+
     # Related object counts
     device_count = RelatedObjectCountField('devices')
     powerfeed_count = RelatedObjectCountField('powerfeeds')
@@ -130,7 +143,7 @@ class RackSerializer(RackBaseSerializer):
             'role', 'serial', 'asset_tag', 'rack_type', 'form_factor', 'width', 'u_height', 'starting_unit', 'weight',
             'max_weight', 'weight_unit', 'desc_units', 'outer_width', 'outer_height', 'outer_depth', 'outer_unit',
             'mounting_depth', 'airflow', 'description', 'owner', 'comments', 'tags', 'custom_fields', 'created',
-            'last_updated', 'device_count', 'powerfeed_count',
+            'last_updated', 'device_count', 'powerfeed_count', 'utilization', 'power_utilization',
         ]
         brief_fields = ('id', 'url', 'display', 'name', 'description', 'device_count')
 
@@ -198,3 +211,65 @@ class RackElevationDetailFilterSerializer(serializers.Serializer):
         required=False,
         default=True
     )
+
+
+class RackElevationListFilterSerializer(serializers.Serializer):
+    face = serializers.ChoiceField(
+        choices=DeviceFaceChoices,
+        default=DeviceFaceChoices.FACE_FRONT
+    )
+    unit_width = serializers.IntegerField(
+        default=ConfigItem('RACK_ELEVATION_DEFAULT_UNIT_WIDTH')
+    )
+    unit_height = serializers.IntegerField(
+        default=ConfigItem('RACK_ELEVATION_DEFAULT_UNIT_HEIGHT')
+    )
+    legend_width = serializers.IntegerField(
+        default=RACK_ELEVATION_DEFAULT_LEGEND_WIDTH
+    )
+    margin_width = serializers.IntegerField(
+        default=RACK_ELEVATION_DEFAULT_MARGIN_WIDTH
+    )
+    include_images = serializers.BooleanField(
+        required=False,
+        default=True
+    )
+
+
+class RackElevationSerializer(serializers.Serializer):
+    """
+    The elevation of a rack face, rendered as an SVG document.
+    """
+    rack = RackSerializer(nested=True, read_only=True)
+    face = ChoiceField(choices=DeviceFaceChoices, read_only=True)
+    svg = serializers.CharField(read_only=True)
+
+
+class RackFreeSpaceFilterSerializer(serializers.Serializer):
+    device_height = serializers.DecimalField(
+        max_digits=4,
+        decimal_places=1,
+        min_value=decimal.Decimal(0.5),
+        default=decimal.Decimal(1)
+    )
+    face = serializers.ChoiceField(
+        choices=DeviceFaceChoices,
+        required=False,
+        default=None
+    )
+    exclude_reserved = serializers.BooleanField(
+        required=False,
+        default=False
+    )
+
+
+class RackFreeSpaceSerializer(serializers.Serializer):
+    """
+    The positions within a rack at which a device of the requested height can be installed.
+    """
+    rack = RackSerializer(nested=True, read_only=True)
+    face = ChoiceField(choices=DeviceFaceChoices, read_only=True, allow_null=True)
+    available_units = serializers.ListField(
+        child=serializers.DecimalField(max_digits=4, decimal_places=1),
+        read_only=True
+    )
@@ -1,17 +1,25 @@
+import hashlib
+import json
+
 from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.core.cache import cache
 from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags, quote_etag
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.routers import APIRootView
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.viewsets import ViewSet
 
 from dcim import filtersets
-from dcim.constants import CABLE_TRACE_SVG_DEFAULT_WIDTH
+from dcim.constants import CABLE_TRACE_CACHE_TIMEOUT, CABLE_TRACE_SVG_DEFAULT_WIDTH
 from dcim.models import *
-from dcim.svg import CableTraceSVG
+from dcim.svg import CableTraceSVG, render_rack_elevations
+from dcim.utils import get_trace_fingerprint
 from extras.api.mixins import ConfigContextQuerySetMixin, RenderConfigMixin
 from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
 from netbox.api.metadata import ContentTypeMetadata
@@ -43,18 +51,44 @@ class PathEndpointMixin(object):
         Trace a complete cable path and return each segment as a three-tuple of (termination, cable, termination).
         """
         obj = get_object_or_404(self.queryset, pk=pk)
-
-        # Initialize the path array
-        path = []
-
-        # Render SVG image if requested
-        if request.GET.get('render', None) == 'svg':
+        render_svg = request.GET.get('render', None) == 'svg'
+        if render_svg:
             try:
                 width = int(request.GET.get('width', CABLE_TRACE_SVG_DEFAULT_WIDTH))
             except (ValueError, TypeError):
                 width = CABLE_TRACE_SVG_DEFAULT_WIDTH
-            drawing = CableTraceSVG(obj, base_url=request.build_absolute_uri('/'), width=width)
-            return HttpResponse(drawing.render().tostring(), content_type='image/svg+xml')
+        base_url = request.build_absolute_uri('/')
+
+        # Identify the trace by a fingerprint of its cable path(s) along with the rendering parameters. If the client
+        # already has the current trace, or it has been cached, it needn't be traced or rendered again.
+        fingerprint = hashlib.sha256(repr((
+            get_trace_fingerprint(obj), base_url, width if render_svg else None
+        )).encode()).hexdigest()
+        etag = quote_etag(fingerprint)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        cache_key = f'dcim.trace.{fingerprint}'
+        content = cache.get(cache_key)
+
+        # Render SVG image if requested
+        if render_svg:
+            if content is None:
+                drawing = CableTraceSVG(obj, base_url=base_url, width=width)
+                content = drawing.render().tostring()
+                cache.set(cache_key, content, CABLE_TRACE_CACHE_TIMEOUT)
+            response = HttpResponse(content, content_type='image/svg+xml')
+            response['ETag'] = etag
+            return response
+
+        if content is None:
+            content = json.loads(json.dumps(self._serialize_trace(obj, request), cls=JSONEncoder))
+            cache.set(cache_key, content, CABLE_TRACE_CACHE_TIMEOUT)
+
+        return Response(content, headers={'ETag': etag})
+
+    @staticmethod
+    def _serialize_trace(obj, request):
+        path = []
 
         # Serialize path objects, iterating over each three-tuple in the path
         for near_ends, cable, far_ends in obj.trace():
@@ -72,7 +106,7 @@ class PathEndpointMixin(object):
 
             path.append((near_ends, cable, far_ends))
 
-        return Response(path)
+        return path
 
 
 class PassThroughPortMixin(object):
@@ -178,7 +212,7 @@ class RackTypeViewSet(NetBoxModelViewSet):
 #
 
 class RackViewSet(NetBoxModelViewSet):
-    queryset = Rack.objects.all()
+    queryset = Rack.objects.annotate_utilization()
     serializer_class = serializers.RackSerializer
     filterset_class = filtersets.RackFilterSet
 
@@ -208,18 +242,19 @@ class RackViewSet(NetBoxModelViewSet):
                 except ValueError:
                     pass
 
-            # Render and return the elevation as an SVG drawing with the correct content type
-            drawing = rack.get_elevation_svg(
+            # Render (or retrieve from cache) and return the elevation as an SVG drawing with the correct content type
+            content = render_rack_elevations(
+                [rack],
                 face=data['face'],
                 user=request.user,
+                highlight_params=highlight_params,
                 unit_width=data['unit_width'],
                 unit_height=data['unit_height'],
                 legend_width=data['legend_width'],
                 include_images=data['include_images'],
-                base_url=request.build_absolute_uri('/'),
-                highlight_params=highlight_params
-            )
-            return HttpResponse(drawing.tostring(), content_type='image/svg+xml')
+                base_url=request.build_absolute_uri('/')
+            )[rack.pk]
+            return HttpResponse(content, content_type='image/svg+xml')
 
         else:
             # Return a JSON representation of the rack units in the elevation
@@ -240,6 +275,81 @@ class RackViewSet(NetBoxModelViewSet):
                 rack_units = serializers.RackUnitSerializer(page, many=True, context={'request': request})
                 return self.get_paginated_response(rack_units.data)
 
+    @extend_schema(
+        operation_id='dcim_racks_elevations_list',
+        parameters=[serializers.RackElevationListFilterSerializer],
+        responses={200: serializers.RackElevationSerializer(many=True)}
+    )
+    @action(detail=False)
+    def elevations(self, request):
+        """
+        Render the elevations of all matching racks as SVG documents. The contents of all racks are retrieved in bulk,
+        and each rendered elevation is cached until the rack or its contents are modified.
+        """
+        serializer = serializers.RackElevationListFilterSerializer(data=request.GET)
+        if not serializer.is_valid():
+            return Response(serializer.errors, 400)
+        data = serializer.validated_data
+
+        racks = self.paginate_queryset(self.filter_queryset(self.queryset))
+        content = render_rack_elevations(
+            racks,
+            face=data['face'],
+            user=request.user,
+            unit_width=data['unit_width'],
+            unit_height=data['unit_height'],
+            legend_width=data['legend_width'],
+            margin_width=data['margin_width'],
+            include_images=data['include_images'],
+            base_url=request.build_absolute_uri('/')
+        )
+        elevations = [
+            {'rack': rack, 'face': data['face'], 'svg': content[rack.pk]} for rack in racks
+        ]
+        serializer = serializers.RackElevationSerializer(elevations, many=True, context={'request': request})
+
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        operation_id='dcim_racks_free_space_list',
+        parameters=[serializers.RackFreeSpaceFilterSerializer],
+        responses={200: serializers.RackFreeSpaceSerializer(many=True)}
+    )
+    @action(detail=False, url_path='free-space')
+    def free_space(self, request):
+        """
+        List the positions within each matching rack at which a device of the given height can be installed. The
+        occupancy of all matching racks is determined at once, and only racks with room for the device are returned.
+        """
+        serializer = serializers.RackFreeSpaceFilterSerializer(data=request.GET)
+        if not serializer.is_valid():
+            return Response(serializer.errors, 400)
+        data = serializer.validated_data
+
+        # Utilization is not needed here, so bypass its annotation
+        racks = self.filter_queryset(Rack.objects.restrict(request.user, 'view'))
+        occupancy = racks.get_occupancy(
+            face=data['face'],
+            include_reservations=data['exclude_reserved']
+        )
+        results = []
+        for rack in racks:
+            available_units = rack.get_available_units(
+                u_height=data['device_height'],
+                rack_face=data['face'],
+                occupancy=occupancy[rack.pk]
+            )
+            if available_units:
+                results.append({
+                    'rack': rack,
+                    'face': data['face'],
+                    'available_units': available_units,
+                })
+        results = self.paginate_queryset(results)
+        serializer = serializers.RackFreeSpaceSerializer(results, many=True, context={'request': request})
+
+        return self.get_paginated_response(serializer.data)
+
 
 #
 # Rack reservations
@@ -55,9 +55,10 @@ class BaseCableProfile:
             return self._mapping.get((connector, position))
         return connector, position
 
-    def get_peer_termination(self, termination, position):
+    def get_peer_termination(self, termination, position, cable_terminations=None):
         """
-        Given a terminating object, return the peer terminating object (if any) on the opposite end of the cable.
+        Given a terminating object, return the peer terminating object (if any) on the opposite end of the cable. The
+        cable's CableTerminations may be passed if already loaded to avoid querying the database.
         """
         try:
             connector, position = self.get_mapped_position(
@@ -70,6 +71,15 @@ class BaseCableProfile:
                 f"Could not map connector {termination.cable_connector} position {position} on side "
                 f"{termination.cable_end}"
             )
+        if cable_terminations is not None:
+            peers = [
+                ct for ct in cable_terminations
+                if ct.cable_end == termination.opposite_cable_end and ct.connector == connector and
+                position in (ct.positions or ())
+            ]
+            if len(peers) > 1:
+                raise CableTermination.MultipleObjectsReturned
+            return (peers[0].termination, position) if peers else (None, None)
         try:
             ct = CableTermination.objects.get(
                 cable=termination.cable,
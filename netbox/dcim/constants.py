@@ -17,6 +17,9 @@ RACK_ELEVATION_BORDER_WIDTH = 2
 RACK_ELEVATION_DEFAULT_LEGEND_WIDTH = 30
 RACK_ELEVATION_DEFAULT_MARGIN_WIDTH = 15
 
+# Rendered rack elevations are cached for up to one day (seconds)
+RACK_ELEVATION_CACHE_TIMEOUT = 86400
+
 RACK_STARTING_UNIT_DEFAULT = 1
 
 
@@ -111,6 +114,9 @@ MODULAR_COMPONENT_MODELS = Q(
 
 CABLE_TRACE_SVG_DEFAULT_WIDTH = 400
 
+# Rendered cable traces are cached for up to one day (seconds)
+CABLE_TRACE_CACHE_TIMEOUT = 86400
+
 # Cable endpoint types
 CABLE_TERMINATION_MODELS = Q(
     Q(app_label='circuits', model__in=(
@@ -128,6 +134,10 @@ CABLE_TERMINATION_MODELS = Q(
     ))
 )
 
+# Components which are cabled or marked as connected (counted by Device's connected component counters)
+CONNECTED_COMPONENT_CONDITION = Q(cable__isnull=False) | Q(mark_connected=True)
+CONNECTED_INTERFACE_CONDITION = CONNECTED_COMPONENT_CONDITION | Q(wireless_link__isnull=False)
+
 COMPATIBLE_TERMINATION_TYPES = {
     'circuittermination': ['interface', 'frontport', 'rearport', 'circuittermination'],
     'consoleport': ['consoleserverport', 'frontport', 'rearport'],
@@ -461,6 +461,22 @@ class RackFilterSet(PrimaryModelFilterSet, TenancyFilterSet, ContactModelFilterS
     serial = MultiValueCharFilter(
         lookup_expr='iexact'
     )
+    utilization__gte = django_filters.NumberFilter(
+        method='filter_utilization',
+        label=_('Space utilization (%) is at least'),
+    )
+    utilization__lte = django_filters.NumberFilter(
+        method='filter_utilization',
+        label=_('Space utilization (%) is at most'),
+    )
+    power_utilization__gte = django_filters.NumberFilter(
+        method='filter_utilization',
+        label=_('Power utilization (%) is at least'),
+    )
+    power_utilization__lte = django_filters.NumberFilter(
+        method='filter_utilization',
+        label=_('Power utilization (%) is at most'),
+    )
 
     class Meta:
         model = Rack
@@ -482,6 +498,9 @@ class RackFilterSet(PrimaryModelFilterSet, TenancyFilterSet, ContactModelFilterS
             Q(comments__icontains=value)
         )
 
+    def filter_utilization(self, queryset, name, value):
+        return queryset.annotate_utilization().filter(**{name: value})
+
 
 @register_filterset
 class RackReservationFilterSet(PrimaryModelFilterSet, TenancyFilterSet):
@@ -1402,6 +1421,14 @@ class DeviceFilterSet(
             'device_bay_count',
             'module_bay_count',
             'inventory_item_count',
+            'connected_console_port_count',
+            'connected_console_server_port_count',
+            'connected_power_port_count',
+            'connected_power_outlet_count',
+            'connected_interface_count',
+            'enabled_interface_count',
+            'connected_front_port_count',
+            'connected_rear_port_count',
         )
 
     def search(self, queryset, name, value):
@@ -358,6 +358,10 @@ class RackFilterForm(TenancyFilterForm, ContactModelFilterForm, RackBaseFilterFo
         FieldSet('form_factor', 'width', 'u_height', 'airflow', name=_('Hardware')),
         FieldSet('starting_unit', 'desc_units', name=_('Numbering')),
         FieldSet('weight', 'max_weight', 'weight_unit', name=_('Weight')),
+        FieldSet(
+            'utilization__gte', 'utilization__lte', 'power_utilization__gte', 'power_utilization__lte',
+            name=_('Utilization')
+        ),
         FieldSet('tenant_group_id', 'tenant_id', name=_('Tenant')),
         FieldSet('owner_group_id', 'owner_id', name=_('Ownership')),
         FieldSet('contact', 'contact_role', 'contact_group', name=_('Contacts')),
@@ -427,6 +431,28 @@ class RackFilterForm(TenancyFilterForm, ContactModelFilterForm, RackBaseFilterFo
         label=_('Asset tag'),
         required=False
     )
+    utilization__gte = forms.DecimalField(
+        label=_('Space utilization (min %)'),
+        required=False,
+        min_value=0,
+        max_value=100
+    )
+    utilization__lte = forms.DecimalField(
+        label=_('Space utilization (max %)'),
+        required=False,
+        min_value=0,
+        max_value=100
+    )
+    power_utilization__gte = forms.DecimalField(
+        label=_('Power utilization (min %)'),
+        required=False,
+        min_value=0
+    )
+    power_utilization__lte = forms.DecimalField(
+        label=_('Power utilization (max %)'),
+        required=False,
+        min_value=0
+    )
     tag = TagFilterField(model)
 
 
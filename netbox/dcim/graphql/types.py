@@ -224,7 +224,7 @@ class ConsoleServerPortTemplateType(ModularComponentTemplateType):
 
 @strawberry_django.type(
     models.Device,
-    fields='__all__',
+    exclude=['_config_context'],
     filters=DeviceFilter,
     pagination=True
 )
@@ -239,6 +239,14 @@ class DeviceType(ConfigContextMixin, ImageAttachmentsMixin, ContactsMixin, Prima
     device_bay_count: BigInt
     module_bay_count: BigInt
     inventory_item_count: BigInt
+    connected_console_port_count: BigInt
+    connected_console_server_port_count: BigInt
+    connected_power_port_count: BigInt
+    connected_power_outlet_count: BigInt
+    connected_interface_count: BigInt
+    enabled_interface_count: BigInt
+    connected_front_port_count: BigInt
+    connected_rear_port_count: BigInt
     config_template: Annotated["ConfigTemplateType", strawberry.lazy('extras.graphql.types')] | None
     device_type: Annotated["DeviceTypeType", strawberry.lazy('dcim.graphql.types')]
     role: Annotated["DeviceRoleType", strawberry.lazy('dcim.graphql.types')]
@@ -0,0 +1,54 @@
+import time
+from collections import Counter
+
+from netbox.jobs import JobRunner
+from .tracing import finish_rebuild, get_partitions, get_rebuild_partitions, rebuild_partition, start_rebuild
+
+__all__ = (
+    'CablePathRebuildJob',
+)
+
+
+class CablePathRebuildJob(JobRunner):
+    """
+    Rebuild all CablePaths, one partition (site or device) at a time. An interrupted rebuild can be resumed by
+    enqueuing the job with resume=True. If dry_run is true, the traced paths are compared with the existing paths and
+    nothing is written.
+    """
+
+    class Meta:
+        name = 'Cable Path Rebuild'
+
+    def run(self, partition_by='site', resume=False, dry_run=False, *args, **kwargs):
+        if dry_run:
+            partitions = get_partitions(partition_by)
+        elif resume and (partitions := get_rebuild_partitions()) is not None:
+            self.logger.info(f"Resuming rebuild ({len(partitions)} partitions remaining)")
+        else:
+            start_rebuild(partition_by)
+            partitions = get_rebuild_partitions()
+        self.logger.info(f"Tracing cable paths for {len(partitions)} partitions")
+
+        counts = Counter()
+        start = time.monotonic()
+        for partition in partitions:
+            counts += rebuild_partition(*partition, dry_run=dry_run)
+        elapsed = time.monotonic() - start
+        self.logger.info(
+            f"Traced {counts['paths']} paths in {elapsed:.1f} seconds "
+            f"({counts['paths'] / elapsed if elapsed else 0:.1f} paths/sec)"
+        )
+
+        if dry_run:
+            self.logger.info(
+                f"{counts['missing']} paths missing, {counts['changed']} changed, {counts['stale']} stale"
+            )
+        else:
+            counts['deleted'] = finish_rebuild()
+            self.logger.info(f"Deleted {counts['deleted']} orphaned paths")
+
+        self.job.data = {
+            **counts,
+            'partitions': len(partitions),
+            'elapsed': round(elapsed, 3),
+        }
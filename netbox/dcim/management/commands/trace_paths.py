@@ -1,10 +1,18 @@
-from django.core.management.base import BaseCommand
+import multiprocessing
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
 from django.core.management.color import no_style
-from django.db import connection
+from django.db import connection, connections
 from django.db.models import Q
+from django.utils.translation import gettext as _
 
+from dcim.jobs import CablePathRebuildJob
 from dcim.models import CablePath, ConsolePort, ConsoleServerPort, Interface, PowerFeed, PowerOutlet, PowerPort
 from dcim.signals import create_cablepaths
+from dcim.tracing import finish_rebuild, get_partitions, get_rebuild_partitions, rebuild_partition, start_rebuild
 
 ENDPOINT_MODELS = (
     ConsolePort,
@@ -16,6 +24,10 @@ ENDPOINT_MODELS = (
 )
 
 
+def rebuild(partition, dry_run):
+    return partition, rebuild_partition(*partition, dry_run=dry_run)
+
+
 class Command(BaseCommand):
     help = "Generate any missing cable paths among all cable termination objects in NetBox"
 
@@ -28,6 +40,27 @@ class Command(BaseCommand):
             "--no-input", action='store_true', dest='no_input',
             help="Do not prompt user for any input/confirmation"
         )
+        parser.add_argument(
+            "--partition-by", choices=('site', 'device'), dest='partition_by',
+            help="Rebuild all cable paths one site or one device at a time, replacing the existing paths of each "
+                 "partition in a single transaction"
+        )
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="The number of worker processes to use for a partitioned rebuild"
+        )
+        parser.add_argument(
+            "--resume", action='store_true',
+            help="Resume an interrupted partitioned rebuild"
+        )
+        parser.add_argument(
+            "--dry-run", action='store_true', dest='dry_run',
+            help="Trace all cable paths and compare them with the existing paths, without making any changes"
+        )
+        parser.add_argument(
+            "--background", action='store_true',
+            help="Enqueue a partitioned rebuild as a background job"
+        )
 
     def draw_progress_bar(self, percentage):
         """
@@ -38,6 +71,10 @@ class Command(BaseCommand):
 
     def handle(self, *model_names, **options):
 
+        # The remaining options apply only to a partitioned rebuild (by site, unless specified otherwise)
+        if options['partition_by'] or options['resume'] or options['dry_run'] or options['background']:
+            return self.rebuild_partitions(**options)
+
         # If --force was passed, first delete all existing CablePaths
         if options['force']:
             cable_paths = CablePath.objects.all()
@@ -88,3 +125,73 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(f'\n  Retraced {i} {model._meta.verbose_name_plural}'))
 
         self.stdout.write(self.style.SUCCESS('Finished.'))
+
+    def rebuild_partitions(self, **options):
+        """
+        Rebuild all cable paths one partition at a time.
+        """
+        partition_by = options['partition_by'] or 'site'
+        if options['background']:
+            job = CablePathRebuildJob.enqueue(
+                partition_by=partition_by,
+                resume=options['resume'],
+                dry_run=options['dry_run']
+            )
+            self.stdout.write(self.style.SUCCESS(f'Enqueued job {job.pk} ({job.job_id}).'))
+            return
+
+        if options['dry_run']:
+            partitions = get_partitions(partition_by)
+            self.stdout.write(f'Validating cable paths for {len(partitions)} partitions.')
+        elif options['resume']:
+            partitions = get_rebuild_partitions()
+            if partitions is None:
+                raise CommandError(_("No interrupted rebuild found."))
+            self.stdout.write(f'Resuming rebuild ({len(partitions)} partitions remaining).')
+        else:
+            start_rebuild(partition_by)
+            partitions = get_rebuild_partitions()
+            self.stdout.write(f'Rebuilding cable paths for {len(partitions)} partitions.')
+
+        counts = Counter()
+        start = time.monotonic()
+        results = self._rebuild_partitions(partitions, options['workers'], options['dry_run'])
+        for i, (_partition, partition_counts) in enumerate(results, start=1):
+            counts += partition_counts
+            if not i % 100 or i == len(partitions):
+                self.draw_progress_bar(i * 100 / len(partitions))
+        elapsed = time.monotonic() - start
+        self.stdout.write('')
+
+        if options['dry_run']:
+            self.stdout.write(
+                f'Traced {counts["paths"]} paths in {elapsed:.1f} seconds: {counts["missing"]} missing, '
+                f'{counts["changed"]} changed, {counts["stale"]} stale.'
+            )
+            if counts['missing'] or counts['changed'] or counts['stale']:
+                raise CommandError(_("Existing cable paths do not match the traced paths."))
+            self.stdout.write(self.style.SUCCESS('All existing cable paths are valid.'))
+            return
+
+        deleted_count = finish_rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {counts["paths"]} paths in {elapsed:.1f} seconds '
+            f'({counts["paths"] / elapsed if elapsed else 0:.1f} paths/sec); deleted {deleted_count} orphaned paths.'
+        ))
+
+    def _rebuild_partitions(self, partitions, workers, dry_run):
+        """
+        Rebuild each partition, yielding the partition and its counts as each one completes.
+        """
+        if workers < 2:
+            for partition in partitions:
+                yield rebuild(partition, dry_run)
+            return
+
+        # Close all database connections before forking the worker processes. Otherwise, each worker would inherit
+        # (and share) the open connections of this process, rather than opening its own.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as executor:
+            futures = [executor.submit(rebuild, partition, dry_run) for partition in partitions]
+            for future in as_completed(futures):
+                yield future.result()
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('dcim', '0226_add_mptt_tree_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='device',
+            name='_config_context',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,137 @@
+import utilities.fields
+from django.db import migrations
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+CONNECTED_COMPONENT_CONDITION = Q(cable__isnull=False) | Q(mark_connected=True)
+CONNECTED_INTERFACE_CONDITION = CONNECTED_COMPONENT_CONDITION | Q(wireless_link__isnull=False)
+
+
+def populate_device_component_counts(apps, schema_editor):
+    """
+    Populate the connected & enabled component counters on all Devices.
+    """
+    Device = apps.get_model('dcim', 'Device')
+    db_alias = schema_editor.connection.alias
+
+    counts = {
+        'connected_console_port_count': ('consoleports', CONNECTED_COMPONENT_CONDITION),
+        'connected_console_server_port_count': ('consoleserverports', CONNECTED_COMPONENT_CONDITION),
+        'connected_power_port_count': ('powerports', CONNECTED_COMPONENT_CONDITION),
+        'connected_power_outlet_count': ('poweroutlets', CONNECTED_COMPONENT_CONDITION),
+        'connected_interface_count': ('interfaces', CONNECTED_INTERFACE_CONDITION),
+        'enabled_interface_count': ('interfaces', Q(enabled=True)),
+        'connected_front_port_count': ('frontports', CONNECTED_COMPONENT_CONDITION),
+        'connected_rear_port_count': ('rearports', CONNECTED_COMPONENT_CONDITION),
+    }
+
+    for field_name, (related_name, condition) in counts.items():
+        ComponentModel = Device._meta.get_field(related_name).related_model
+        count_subquery = (
+            ComponentModel.objects.using(db_alias)
+            .filter(condition, device=OuterRef('pk'))
+            .values('device')
+            .annotate(_count=Count('pk'))
+            .values('_count')
+        )
+        Device.objects.using(db_alias).update(**{
+            field_name: Coalesce(Subquery(count_subquery), 0)
+        })
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('dcim', '0228_cablepath_nodes_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='device',
+            name='connected_console_port_count',
+            field=utilities.fields.CounterCacheField(
+                condition=CONNECTED_COMPONENT_CONDITION,
+                default=0,
+                editable=False,
+                to_field='device',
+                to_model='dcim.ConsolePort',
+            ),
+        ),
+        migrations.AddField(
+            model_name='device',
+            name='connected_console_server_port_count',
+            field=utilities.fields.CounterCacheField(
+                condition=CONNECTED_COMPONENT_CONDITION,
+                default=0,
+                editable=False,
+                to_field='device',
+                to_model='dcim.ConsoleServerPort',
+            ),
+        ),
+        migrations.AddField(
+            model_name='device',
+            name='connected_front_port_count',
+            field=utilities.fields.CounterCacheField(
+                condition=CONNECTED_COMPONENT_CONDITION,
+                default=0,
+                editable=False,
+                to_field='device',
+                to_model='dcim.FrontPort',
+            ),
+        ),
+        migrations.AddField(
+            model_name='device',
+            name='connected_interface_count',
+            field=utilities.fields.CounterCacheField(
+                condition=CONNECTED_INTERFACE_CONDITION,
+                default=0,
+                editable=False,
+                to_field='device',
+                to_model='dcim.Interface',
+            ),
+        ),
+        migrations.AddField(
+            model_name='device',
+            name='connected_power_outlet_count',
+            field=utilities.fields.CounterCacheField(
+                condition=CONNECTED_COMPONENT_CONDITION,
+                default=0,
+                editable=False,
+                to_field='device',
+                to_model='dcim.PowerOutlet',
+            ),
+        ),
+        migrations.AddField(
+            model_name='device',
+            name='connected_power_port_count',
+            field=utilities.fields.CounterCacheField(
+                condition=CONNECTED_COMPONENT_CONDITION,
+                default=0,
+                editable=False,
+                to_field='device',
+                to_model='dcim.PowerPort',
+            ),
+        ),
+        migrations.AddField(
+            model_name='device',
+            name='connected_rear_port_count',
+            field=utilities.fields.CounterCacheField(
+                condition=CONNECTED_COMPONENT_CONDITION,
+                default=0,
+                editable=False,
+                to_field='device',
+                to_model='dcim.RearPort',
+            ),
+        ),
+        migrations.AddField(
+            model_name='device',
+            name='enabled_interface_count',
+            field=utilities.fields.CounterCacheField(
+                condition=Q(enabled=True),
+                default=0,
+                editable=False,
+                to_field='device',
+                to_model='dcim.Interface',
+            ),
+        ),
+        migrations.RunPython(populate_device_component_counts, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,7 @@ import logging
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
@@ -641,6 +642,9 @@ class CablePath(models.Model):
     class Meta:
         verbose_name = _('cable path')
         verbose_name_plural = _('cable paths')
+        indexes = (
+            GinIndex(fields=('_nodes',), name='dcim_cablepath_nodes'),
+        )
 
     def __str__(self):
         return f"Path #{self.pk}: {len(self.path)} hops"
@@ -712,16 +716,22 @@ class CablePath(models.Model):
         return int(len(self.path) / 3)
 
     @classmethod
-    def from_origin(cls, terminations):
+    def from_origin(cls, terminations, graph=None):
         """
         Create a new CablePath instance as traced from the given termination objects. These can be any object to which a
         Cable or WirelessLink connects (interfaces, console ports, circuit termination, etc.). All terminations must be
         of the same type and must belong to the same parent object.
+
+        Cables, port mappings, and circuit terminations are looked up via a CableGraph. A preloaded graph may be passed
+        to trace many paths efficiently; otherwise, objects are loaded as they are encountered.
         """
         from circuits.models import CircuitTermination, Circuit
+        from dcim.tracing import CableGraph
 
         if not terminations:
             return None
+        if graph is None:
+            graph = CableGraph()
 
         # Ensure all originating terminations are attached to the same link
         if len(terminations) > 1 and not all(t.link == terminations[0].link for t in terminations[1:]):
@@ -809,28 +819,22 @@ class CablePath(models.Model):
                 if links[0].profile:
                     cable_profile = links[0].profile_class()
                     position = position_stack.pop()[0] if position_stack else None
-                    term, position = cable_profile.get_peer_termination(terminations[0], position)
+                    term, position = cable_profile.get_peer_termination(
+                        terminations[0],
+                        position,
+                        cable_terminations=graph.get_cable_terminations(terminations[0].cable_id)
+                    )
                     remote_terminations = [term]
                     position_stack.append([position])
 
                 # Legacy (positionless) behavior
                 else:
-                    termination_type = ObjectType.objects.get_for_model(terminations[0])
-                    local_cable_terminations = CableTermination.objects.filter(
-                        termination_type=termination_type,
-                        termination_id__in=[t.pk for t in terminations]
-                    )
+                    remote_cable_terminations = graph.get_far_cable_terminations(terminations)
 
-                    q_filter = Q()
-                    for lct in local_cable_terminations:
-                        cable_end = 'A' if lct.cable_end == 'B' else 'B'
-                        q_filter |= Q(cable=lct.cable, cable_end=cable_end)
-
-                    # Make sure this filter has been populated; if not, we have probably been given invalid data
-                    if not q_filter:
+                    # Make sure local CableTerminations were found; if not, we have probably been given invalid data
+                    if remote_cable_terminations is None:
                         break
 
-                    remote_cable_terminations = CableTermination.objects.filter(q_filter)
                     remote_terminations = [ct.termination for ct in remote_cable_terminations]
             else:
                 # WirelessLink
@@ -860,10 +864,7 @@ class CablePath(models.Model):
                 # Follow FrontPorts to their corresponding RearPorts
                 if remote_terminations[0].positions > 1 and position_stack:
                     positions = position_stack.pop()
-                    q_filter = Q()
-                    for rt in remote_terminations:
-                        q_filter |= Q(front_port=rt, front_port_position__in=positions)
-                    port_mappings = PortMapping.objects.filter(q_filter)
+                    port_mappings = graph.get_port_mappings(remote_terminations, positions)
                 elif remote_terminations[0].positions > 1:
                     is_split = True
                     logger.debug(
@@ -872,7 +873,7 @@ class CablePath(models.Model):
                     )
                     break
                 else:
-                    port_mappings = PortMapping.objects.filter(front_port__in=remote_terminations)
+                    port_mappings = graph.get_port_mappings(remote_terminations)
                 if not port_mappings:
                     break
 
@@ -885,10 +886,7 @@ class CablePath(models.Model):
                 # Follow RearPorts to their corresponding FrontPorts
                 if remote_terminations[0].positions > 1 and position_stack:
                     positions = position_stack.pop()
-                    q_filter = Q()
-                    for rt in remote_terminations:
-                        q_filter |= Q(rear_port=rt, rear_port_position__in=positions)
-                    port_mappings = PortMapping.objects.filter(q_filter)
+                    port_mappings = graph.get_port_mappings(remote_terminations, positions)
                 elif remote_terminations[0].positions > 1:
                     is_split = True
                     logger.debug(
@@ -897,7 +895,7 @@ class CablePath(models.Model):
                     )
                     break
                 else:
-                    port_mappings = PortMapping.objects.filter(rear_port__in=remote_terminations)
+                    port_mappings = graph.get_port_mappings(remote_terminations)
                 if not port_mappings:
                     break
 
@@ -908,17 +906,9 @@ class CablePath(models.Model):
 
             elif isinstance(remote_terminations[0], CircuitTermination):
                 # Follow a CircuitTermination to its corresponding CircuitTermination (A to Z or vice versa)
-                qs = Q()
-                for remote_termination in remote_terminations:
-                    qs |= Q(
-                        circuit=remote_termination.circuit,
-                        term_side='Z' if remote_termination.term_side == 'A' else 'A'
-                    )
-
-                # Get all circuit terminations
-                circuit_terminations = CircuitTermination.objects.filter(qs)
+                circuit_terminations = graph.get_circuit_peers(remote_terminations)
 
-                if not circuit_terminations.exists():
+                if not circuit_terminations:
                     break
                 elif all([ct._provider_network for ct in circuit_terminations]):
                     # Circuit terminates to a ProviderNetwork
@@ -962,11 +952,11 @@ class CablePath(models.Model):
             is_split=is_split
         )
 
-    def retrace(self):
+    def retrace(self, graph=None):
         """
         Retrace the path from the currently-defined originating termination(s)
         """
-        _new = self.from_origin(self.origins)
+        _new = self.from_origin(self.origins, graph=graph)
         if _new:
             self.path = _new.path
             self.is_complete = _new.is_complete
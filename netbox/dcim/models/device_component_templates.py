@@ -385,10 +385,18 @@ class PowerOutletTemplate(ModularComponentTemplateModel):
                     )
                 )
 
-    def instantiate(self, **kwargs):
+    def instantiate(self, power_ports=None, **kwargs):
+        """
+        Args:
+            power_ports: An optional mapping of names to the PowerPorts instantiated for the same device or module,
+                         used to resolve the assigned power port without a database query
+        """
         if self.power_port:
             power_port_name = self.power_port.resolve_name(kwargs.get('module'))
-            power_port = PowerPort.objects.get(name=power_port_name, **kwargs)
+            if power_ports is not None:
+                power_port = power_ports.get(power_port_name)
+            else:
+                power_port = PowerPort.objects.get(name=power_port_name, **kwargs)
         else:
             power_port = None
         return self.component_model(
@@ -10,7 +10,6 @@ from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.models import F, ProtectedError, prefetch_related_objects
 from django.db.models.functions import Lower
-from django.db.models.signals import post_save
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
@@ -26,6 +25,7 @@ from netbox.config import ConfigItem
 from netbox.models import NestedGroupModel, OrganizationalModel, PrimaryModel
 from netbox.models.features import ContactsMixin, ImageAttachmentsMixin
 from netbox.models.mixins import WeightMixin
+from netbox.signals import send_post_bulk_create
 from utilities.fields import ColorField, CounterCacheField
 from utilities.prefetch import get_prefetchable_fields
 from utilities.tracking import TrackingModelMixin
@@ -720,6 +720,54 @@ class Device(
         to_model='dcim.InventoryItem',
         to_field='device'
     )
+    connected_console_port_count = CounterCacheField(
+        to_model='dcim.ConsolePort',
+        to_field='device',
+        condition=CONNECTED_COMPONENT_CONDITION
+    )
+    connected_console_server_port_count = CounterCacheField(
+        to_model='dcim.ConsoleServerPort',
+        to_field='device',
+        condition=CONNECTED_COMPONENT_CONDITION
+    )
+    connected_power_port_count = CounterCacheField(
+        to_model='dcim.PowerPort',
+        to_field='device',
+        condition=CONNECTED_COMPONENT_CONDITION
+    )
+    connected_power_outlet_count = CounterCacheField(
+        to_model='dcim.PowerOutlet',
+        to_field='device',
+        condition=CONNECTED_COMPONENT_CONDITION
+    )
+    connected_interface_count = CounterCacheField(
+        to_model='dcim.Interface',
+        to_field='device',
+        condition=CONNECTED_INTERFACE_CONDITION
+    )
+    enabled_interface_count = CounterCacheField(
+        to_model='dcim.Interface',
+        to_field='device',
+        condition=models.Q(enabled=True)
+    )
+    connected_front_port_count = CounterCacheField(
+        to_model='dcim.FrontPort',
+        to_field='device',
+        condition=CONNECTED_COMPONENT_CONDITION
+    )
+    connected_rear_port_count = CounterCacheField(
+        to_model='dcim.RearPort',
+        to_field='device',
+        condition=CONNECTED_COMPONENT_CONDITION
+    )
+
+    # Materialized merge of all applicable ConfigContexts (excluding local context data). Null if not yet computed or
+    # invalidated by a change.
+    _config_context = models.JSONField(
+        blank=True,
+        null=True,
+        editable=False
+    )
 
     objects = ConfigContextModelQuerySet.as_manager()
 
@@ -971,19 +1019,11 @@ class Device(
                 component._location = self.location
                 component._rack = self.rack
             components = model.objects.bulk_create(components)
-            # Prefetch related objects to minimize queries needed during post_save
+            # Prefetch related objects to minimize queries needed by signal receivers
             prefetch_fields = get_prefetchable_fields(model)
             prefetch_related_objects(components, *prefetch_fields)
-            # Manually send the post_save signal for each of the newly created components
-            for component in components:
-                post_save.send(
-                    sender=model,
-                    instance=component,
-                    created=True,
-                    raw=False,
-                    using='default',
-                    update_fields=None
-                )
+            # Signal the creation of all components at once
+            send_post_bulk_create(model, components)
         else:
             for obj in queryset:
                 component = obj.instantiate(device=self)
@@ -1068,6 +1108,48 @@ class Device(
     def interfaces_count(self):
         return self.vc_interfaces().count()
 
+    def serialize_object(self, exclude=None):
+        # Omit the counters underlying the component summary, which change along with the device's components
+        exclude = [
+            *(exclude or []),
+            *(
+                field.name for field in self._meta.concrete_fields
+                if isinstance(field, CounterCacheField) and field.condition is not None
+            ),
+        ]
+        return super().serialize_object(exclude=exclude)
+
+    def get_component_summary(self):
+        """
+        Return the number of components of each type assigned to this Device, including the number of connected and
+        unconnected ports and of enabled and disabled interfaces. All values are read from cached counter fields.
+        """
+        summary = {}
+        for name, counter_prefix in (
+            ('console_ports', 'console_port'),
+            ('console_server_ports', 'console_server_port'),
+            ('power_ports', 'power_port'),
+            ('power_outlets', 'power_outlet'),
+            ('interfaces', 'interface'),
+            ('front_ports', 'front_port'),
+            ('rear_ports', 'rear_port'),
+        ):
+            total = getattr(self, f'{counter_prefix}_count')
+            connected = getattr(self, f'connected_{counter_prefix}_count')
+            summary[name] = {
+                'total': total,
+                'connected': connected,
+                'unconnected': total - connected,
+            }
+        summary['interfaces'].update({
+            'enabled': self.enabled_interface_count,
+            'disabled': self.interface_count - self.enabled_interface_count,
+        })
+        summary['device_bays'] = {'total': self.device_bay_count}
+        summary['module_bays'] = {'total': self.module_bay_count}
+        summary['inventory_items'] = {'total': self.inventory_item_count}
+        return summary
+
     def get_vc_master(self):
         """
         If this Device is a VirtualChassis member, return the VC master. Otherwise, return None.
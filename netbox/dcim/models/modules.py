@@ -2,6 +2,7 @@ import jsonschema
 import yaml
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import prefetch_related_objects
 from django.db.models.signals import post_save
 from django.utils.translation import gettext_lazy as _
 from jsonschema.exceptions import ValidationError as JSONValidationError
@@ -12,8 +13,10 @@ from extras.models import ConfigContextModel, CustomField
 from netbox.models import PrimaryModel
 from netbox.models.features import ImageAttachmentsMixin
 from netbox.models.mixins import WeightMixin
+from netbox.signals import send_post_bulk_create
 from utilities.fields import CounterCacheField
 from utilities.jsonschema import validate_schema
+from utilities.prefetch import get_prefetchable_fields
 from utilities.string import title
 from utilities.tracking import TrackingModelMixin
 from .device_components import *
@@ -283,6 +286,7 @@ class Module(TrackingModelMixin, PrimaryModel, ConfigContextModel):
             return
 
         # Iterate all component types
+        power_ports = None
         for templates, component_attribute, component_model in [
             ("consoleporttemplates", "consoleports", ConsolePort),
             ("consoleserverporttemplates", "consoleserverports", ConsoleServerPort),
@@ -293,32 +297,31 @@ class Module(TrackingModelMixin, PrimaryModel, ConfigContextModel):
             ("frontporttemplates", "frontports", FrontPort),
             ("modulebaytemplates", "modulebays", ModuleBay),
         ]:
-            create_instances = []
-            update_instances = []
-
-            # Prefetch installed components
-            installed_components = {
-                component.name: component
-                for component in getattr(self.device, component_attribute).filter(module__isnull=True)
-            }
-
-            # Get the template for the module type.
-            for template in getattr(self.module_type, templates).all():
-                template_instance = template.instantiate(device=self.device, module=self)
-
-                if adopt_components:
-                    existing_item = installed_components.get(template_instance.name)
+            # Instantiate a component from each of the module type's templates, keyed by resolved name
+            if component_model is PowerOutlet:
+                # Resolve the power port assigned to each outlet from those created (or adopted) for this module
+                templates = getattr(self.module_type, templates).select_related('power_port')
+                instances = [
+                    template.instantiate(device=self.device, module=self, power_ports=power_ports)
+                    for template in templates
+                ]
+            else:
+                templates = getattr(self.module_type, templates).all()
+                instances = [template.instantiate(device=self.device, module=self) for template in templates]
+            instances = {instance.name: instance for instance in instances}
 
-                    # Check if there's a component with the same name already
-                    if existing_item:
-                        # Assign it to the module
-                        existing_item.module = self
-                        update_instances.append(existing_item)
-                        continue
+            # Adopt any unassigned components with the same names in a single query
+            update_instances = []
+            if adopt_components and instances:
+                update_instances = list(
+                    getattr(self.device, component_attribute).filter(module__isnull=True, name__in=instances.keys())
+                )
+                for component in update_instances:
+                    component.module = self
+                    del instances[component.name]
 
-                # Only create new components if replication is enabled
-                if not disable_replication:
-                    create_instances.append(template_instance)
+            # Only create new components if replication is enabled
+            create_instances = [] if disable_replication else list(instances.values())
 
             # Set default values for any applicable custom fields
             if cf_defaults := CustomField.objects.get_defaults_for_model(component_model):
@@ -331,35 +334,35 @@ class Module(TrackingModelMixin, PrimaryModel, ConfigContextModel):
                 component._location = self.device.location
                 component._rack = self.device.rack
 
-            if component_model is not ModuleBay:
+            if component_model is ModuleBay:
+                # ModuleBays must be saved individually for MPTT
+                for instance in create_instances:
+                    instance.save()
+            elif create_instances:
                 component_model.objects.bulk_create(create_instances)
-                # Emit the post_save signal for each newly created object
-                for component in create_instances:
+                # Prefetch related objects to minimize queries needed by signal receivers
+                prefetch_related_objects(create_instances, *get_prefetchable_fields(component_model))
+                # Signal the creation of all components at once
+                send_post_bulk_create(component_model, create_instances)
+
+            if update_instances:
+                update_fields = ['module']
+                component_model.objects.bulk_update(update_instances, update_fields)
+                # Emit the post_save signal for each updated object
+                for component in update_instances:
                     post_save.send(
                         sender=component_model,
                         instance=component,
-                        created=True,
+                        created=False,
                         raw=False,
                         using='default',
-                        update_fields=None
+                        update_fields=update_fields
                     )
-            else:
-                # ModuleBays must be saved individually for MPTT
-                for instance in create_instances:
-                    instance.save()
 
-            update_fields = ['module']
-            component_model.objects.bulk_update(update_instances, update_fields)
-            # Emit the post_save signal for each updated object
-            for component in update_instances:
-                post_save.send(
-                    sender=component_model,
-                    instance=component,
-                    created=False,
-                    raw=False,
-                    using='default',
-                    update_fields=update_fields
-                )
+            if component_model is PowerPort:
+                power_ports = {
+                    component.name: component for component in (*create_instances, *update_instances)
+                }
 
         # Replicate any front/rear port mappings from the ModuleType
         create_port_mappings(self.device, self.module_type, self)
@@ -1,4 +1,5 @@
 import decimal
+import math
 from functools import cached_property
 
 from django.conf import settings
@@ -12,7 +13,9 @@ from django.utils.translation import gettext_lazy as _
 
 from dcim.choices import *
 from dcim.constants import *
+from dcim.querysets import RackQuerySet
 from dcim.svg import RackElevationSVG
+from dcim.utils import get_contiguous_space
 from netbox.choices import ColorChoices
 from netbox.models import OrganizationalModel, PrimaryModel
 from netbox.models.mixins import WeightMixin
@@ -339,6 +342,8 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, TrackingModelMixin, RackBase):
         related_query_name='rack'
     )
 
+    objects = RackQuerySet.as_manager()
+
     clone_fields = (
         'site', 'location', 'tenant', 'status', 'role', 'form_factor', 'width', 'airflow', 'u_height', 'desc_units',
         'outer_width', 'outer_height', 'outer_depth', 'outer_unit', 'mounting_depth', 'weight', 'max_weight',
@@ -515,45 +520,40 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, TrackingModelMixin, RackBase):
 
         return [u for u in elevation.values()]
 
-    def get_available_units(self, u_height=1.0, rack_face=None, exclude=None, ignore_excluded_devices=False):
+    def get_available_units(
+            self, u_height=1.0, rack_face=None, exclude=None, ignore_excluded_devices=False, occupancy=None
+    ):
         """
         Return a list of units within the rack available to accommodate a device of a given U height (default 1).
         Optionally exclude one or more devices when calculating empty units (needed when moving a device from one
         position to another within a rack).
 
-        :param u_height: Minimum number of contiguous free units required
+        :param u_height: Minimum number of contiguous free units required (if zero, every free half-unit is returned)
         :param rack_face: The face of the rack (front or rear) required; 'None' if device is full depth
         :param exclude: List of devices IDs to exclude (useful when moving a device within a rack)
         :param ignore_excluded_devices: Ignore devices that are marked to exclude from utilization calculations
+        :param occupancy: A bitmap of the rack's occupied half-units, as returned by RackQuerySet.get_occupancy()
+            (optional); if None, it will be determined from the devices installed within the rack
         """
-        # Gather all devices which consume U space within the rack
-        devices = self.devices.prefetch_related('device_type').filter(position__gte=1)
-        if ignore_excluded_devices:
-            devices = devices.exclude(device_type__exclude_from_utilization=True)
-
-        if exclude is not None:
-            devices = devices.exclude(pk__in=exclude)
-
-        # Initialize the rack unit skeleton
-        units = list(self.units)
-
-        # Remove units consumed by installed devices
-        for d in devices:
-            if rack_face is None or d.face == rack_face or d.device_type.is_full_depth:
-                for u in drange(d.position, d.position + d.device_type.u_height, 0.5):
-                    try:
-                        units.remove(u)
-                    except ValueError:
-                        # Found overlapping devices in the rack!
-                        pass
-
-        # Remove units without enough space above them to accommodate a device of the specified height
-        available_units = []
-        for u in units:
-            if set(drange(u, u + decimal.Decimal(u_height), 0.5)).issubset(units):
-                available_units.append(u)
-
-        return list(reversed(available_units))
+        if occupancy is None:
+            occupancy = 0
+            if not self._state.adding:
+                occupancy = Rack.objects.filter(pk=self.pk).get_occupancy(
+                    face=rack_face,
+                    exclude=exclude,
+                    ignore_excluded_devices=ignore_excluded_devices
+                )[self.pk]
+
+        # Find each position with enough free half-units above it to accommodate a device of the specified height
+        available = get_contiguous_space(
+            occupancy,
+            size=self.u_height * 2,
+            length=math.ceil(decimal.Decimal(u_height) * 2)
+        )
+
+        return [
+            u for u in reversed(list(self.units)) if available >> int((u - self.starting_unit) * 2) & 1
+        ]
 
     def get_reserved_units(self):
         """
@@ -614,18 +614,11 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, TrackingModelMixin, RackBase):
         Determine the utilization rate of the rack and return it as a percentage. Occupied and reserved units both count
         as utilized.
         """
-        # Determine unoccupied units
-        total_units = len(list(self.units))
-        available_units = self.get_available_units(u_height=0.5, ignore_excluded_devices=True)
-
-        # Remove reserved units
-        for ru in self.get_reserved_units():
-            for u in drange(ru, ru + 1, 0.5):
-                if u in available_units:
-                    available_units.remove(u)
-
-        occupied_unit_count = total_units - len(available_units)
-        percentage = float(occupied_unit_count) / total_units * 100
+        occupancy = Rack.objects.filter(pk=self.pk).get_occupancy(
+            ignore_excluded_devices=True,
+            include_reservations=True
+        )[self.pk]
+        percentage = float(occupancy.bit_count()) / (self.u_height * 2) * 100
 
         return percentage
 
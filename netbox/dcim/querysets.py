@@ -0,0 +1,125 @@
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import FloatField, IntegerField
+from django.db.models.expressions import RawSQL
+
+from utilities.querysets import RestrictedQuerySet
+
+__all__ = (
+    'RackQuerySet',
+)
+
+
+class RackQuerySet(RestrictedQuerySet):
+
+    @staticmethod
+    def _get_occupied_units_sql(face=None, exclude=None, ignore_excluded_devices=False, include_reservations=False):
+        """
+        Return the SQL (and its parameters) for a subquery listing the distinct half-units occupied within a Rack, each
+        represented by twice its unit number. The subquery is correlated with the outer "dcim_rack" table. Both
+        annotate_utilization() and get_occupancy() are derived from it; see get_occupancy() for its parameters.
+        """
+        conditions = ['U1."rack_id" = "dcim_rack"."id"', 'U1."position" >= 1']
+        params = []
+        if face is not None:
+            conditions.append('(U1."face" = %s OR U2."is_full_depth")')
+            params.append(face)
+        if ignore_excluded_devices:
+            conditions.append('NOT U2."exclude_from_utilization"')
+        if exclude:
+            conditions.append('NOT (U1."id" = ANY(%s))')
+            params.append(list(exclude))
+
+        units_sql = (
+            'SELECT generate_series('
+            '(2 * U1."position")::integer, (2 * (U1."position" + U2."u_height"))::integer - 1'
+            ') AS "u" '
+            'FROM "dcim_device" U1 INNER JOIN "dcim_devicetype" U2 ON (U1."device_type_id" = U2."id") '
+            f'WHERE {" AND ".join(conditions)}'
+        )
+        if include_reservations:
+            units_sql += (
+                ' UNION ALL '
+                'SELECT generate_series(2 * U4."unit", 2 * U4."unit" + 1) AS "u" '
+                'FROM "dcim_rackreservation" U3 CROSS JOIN LATERAL unnest(U3."units") AS U4("unit") '
+                'WHERE U3."rack_id" = "dcim_rack"."id"'
+            )
+
+        sql = (
+            f'SELECT DISTINCT U0."u" FROM ({units_sql}) U0 '
+            'WHERE U0."u" BETWEEN 2 * "dcim_rack"."starting_unit" '
+            'AND 2 * ("dcim_rack"."starting_unit" + "dcim_rack"."u_height") - 1'
+        )
+        return sql, params
+
+    def annotate_utilization(self):
+        """
+        Annotate the space and power utilization of each Rack (as percentages) using correlated subqueries, matching
+        the results of Rack.get_utilization() and Rack.get_power_utilization().
+
+        Space utilization is the proportion of half-units within the rack which are occupied by devices (excluding
+        those with device types marked exclude_from_utilization) or reserved, as determined by get_occupancy(). Power
+        utilization is the sum of the power allocated to each PowerPort connected to a PowerFeed in the rack, as a
+        percentage of the total power available from the rack's feeds. A PowerPort which defines neither an allocated
+        nor a maximum draw inherits the total allocated draw of the PowerPorts connected to its PowerOutlets.
+        """
+        if 'utilization' in self.query.annotations:
+            return self
+
+        units_sql, units_params = self._get_occupied_units_sql(ignore_excluded_devices=True, include_reservations=True)
+        return self.annotate(
+            utilization=RawSQL(
+                'SELECT COUNT(*)::double precision / (2 * "dcim_rack"."u_height") * 100 '
+                f'FROM ({units_sql}) U0',
+                units_params,
+                output_field=FloatField()
+            ),
+            power_utilization=RawSQL(
+                'SELECT COALESCE(ROUND(SUM(U0."allocated")::numeric / NULLIF(SUM(U0."available"), 0) * 100, 1), 0) '
+                'FROM ('
+                'SELECT U1."available_power" AS "available", 0 AS "allocated" '
+                'FROM "dcim_powerfeed" U1 WHERE U1."rack_id" = "dcim_rack"."id" '
+                'UNION ALL '
+                'SELECT 0, CASE WHEN U3."allocated_draw" IS NULL AND U3."maximum_draw" IS NULL THEN ('
+                'SELECT COALESCE(SUM(U4."allocated_draw"), 0) FROM "dcim_powerport" U4 WHERE U4."id" IN ('
+                'SELECT U5."id" FROM "dcim_powerport" U5 INNER JOIN "dcim_poweroutlet" U6 '
+                'ON (U5."cable_id" = U6."cable_id" AND U5."cable_end" <> U6."cable_end") '
+                'WHERE U6."power_port_id" = U3."id")'
+                ') ELSE COALESCE(U3."allocated_draw", 0) END '
+                'FROM "dcim_powerfeed" U2 INNER JOIN "dcim_powerport" U3 '
+                'ON (U2."cable_id" = U3."cable_id" AND U2."cable_end" <> U3."cable_end") '
+                'WHERE U2."rack_id" = "dcim_rack"."id"'
+                ') U0',
+                (),
+                output_field=FloatField()
+            )
+        )
+
+    def get_occupancy(self, face=None, exclude=None, ignore_excluded_devices=False, include_reservations=False):
+        """
+        Return a mapping of each Rack's PK to a bitmap of its occupied half-units, in which bit n represents the
+        half-unit at position starting_unit + n/2. The occupancy of all racks is determined in a single query; a rack
+        with no occupied units maps to zero.
+
+        :param face: Consider only devices installed on this face (or full depth); if None, all devices are considered
+        :param exclude: List of device IDs to exclude
+        :param ignore_excluded_devices: Ignore devices that are marked to exclude from utilization calculations
+        :param include_reservations: Treat reserved units as occupied
+        """
+        units_sql, units_params = self._get_occupied_units_sql(
+            face=face,
+            exclude=exclude,
+            ignore_excluded_devices=ignore_excluded_devices,
+            include_reservations=include_reservations
+        )
+        racks = self.order_by().annotate(
+            occupied_units=RawSQL(
+                'SELECT ARRAY_AGG(U0."u" - 2 * "dcim_rack"."starting_unit") '
+                f'FROM ({units_sql}) U0',
+                units_params,
+                output_field=ArrayField(IntegerField())
+            )
+        )
+
+        return {
+            pk: sum(1 << u for u in units or ()) for pk, units in racks.values_list('pk', 'occupied_units')
+        }
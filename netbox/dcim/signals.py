@@ -6,6 +6,7 @@ from django.dispatch import receiver
 
 from dcim.choices import CableEndChoices, LinkStatusChoices
 from ipam.models import Prefix
+from utilities.counters import recalculate_counters
 from virtualization.models import Cluster, VMInterface
 from wireless.models import WirelessLAN
 from .models import (
@@ -14,6 +15,7 @@ from .models import (
     Site, VirtualChassis,
 )
 from .models.cables import trace_paths
+from .tracing import CableGraph
 from .utils import create_cablepaths, rebuild_paths
 
 COMPONENT_MODELS = (
@@ -143,8 +145,9 @@ def retrace_cable_paths(instance, **kwargs):
     """
     When a Cable is deleted, check for and update its connected endpoints
     """
+    graph = CableGraph()
     for cablepath in CablePath.objects.filter(_nodes__contains=instance):
-        cablepath.retrace()
+        cablepath.retrace(graph=graph)
 
 
 @receiver((post_delete, post_save), sender=PortMapping)
@@ -152,10 +155,11 @@ def update_passthrough_port_paths(instance, **kwargs):
     """
     When a PortMapping is created or deleted, retrace any CablePaths which traverse its front and/or rear ports.
     """
+    graph = CableGraph()
     for cablepath in CablePath.objects.filter(
         Q(_nodes__contains=instance.front_port) | Q(_nodes__contains=instance.rear_port)
     ):
-        cablepath.retrace()
+        cablepath.retrace(graph=graph)
 
 
 @receiver(post_delete, sender=CableTermination)
@@ -165,6 +169,7 @@ def nullify_connected_endpoints(instance, **kwargs):
     """
     model = instance.termination_type.model_class()
     model.objects.filter(pk=instance.termination_id).update(cable=None, cable_end='')
+    recalculate_counters(model, [instance.termination_id])
 
     for cablepath in CablePath.objects.filter(_nodes__contains=instance.cable):
         # Remove the deleted CableTermination if it's one of the path's originating nodes
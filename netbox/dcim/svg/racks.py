@@ -1,4 +1,4 @@
-import decimal
+import hashlib
 import svgwrite
 from svgwrite.container import Hyperlink
 from svgwrite.image import Image
@@ -8,20 +8,27 @@ from svgwrite.shapes import Rect
 from svgwrite.text import Text
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import FieldError
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.template.defaultfilters import floatformat
 from django.urls import reverse
 from django.utils.http import urlencode
+from django.utils.translation import get_language
 
 from netbox.config import get_config
 from utilities.data import array_to_ranges
 from utilities.html import foreground_color
-from dcim.constants import RACK_ELEVATION_BORDER_WIDTH
+from dcim.constants import (
+    RACK_ELEVATION_BORDER_WIDTH, RACK_ELEVATION_CACHE_TIMEOUT, RACK_ELEVATION_DEFAULT_LEGEND_WIDTH,
+    RACK_ELEVATION_DEFAULT_MARGIN_WIDTH,
+)
 
 
 __all__ = (
     'RackElevationSVG',
+    'get_rack_elevation_data',
+    'render_rack_elevations',
 )
 
 GRADIENT_RESERVED = '#b0b0ff'
@@ -36,7 +43,7 @@ def get_device_name(device):
     else:
         name = str(device.device_type)
     if device.devicebay_count:
-        name += ' ({}/{})'.format(device.get_children().count(), device.devicebay_count)
+        name += ' ({}/{})'.format(device.child_count, device.devicebay_count)
 
     return name
 
@@ -82,6 +89,106 @@ def truncate_text(text, width, font_size=15):
     return text if len(text) <= max_char else text[:max_char] + '...'
 
 
+def get_rack_elevation_data(racks, user=None, highlight_params=None):
+    """
+    Retrieve the devices and reservations needed to render the elevations of the specified racks, using a fixed number
+    of queries regardless of the number of racks. Returns a dictionary mapping each rack ID to a dictionary of its
+    devices, reservations, and the IDs of devices which are permitted to be viewed by the user and highlighted.
+
+    :param racks: An iterable of Racks
+    :param user: User instance. If specified, only devices viewable by this user will be permitted.
+    :param highlight_params: Iterable of two-tuples which identifies attributes of devices to highlight
+    """
+    from dcim.models import Device, RackReservation
+
+    rack_ids = [rack.pk for rack in racks]
+    data = {
+        rack_id: {
+            'devices': [],
+            'reservations': [],
+            'permitted_device_ids': set(),
+            'highlight_device_ids': set(),
+        } for rack_id in rack_ids
+    }
+
+    # Retrieve all devices which occupy space within the racks
+    devices = Device.objects.filter(
+        rack__in=rack_ids,
+        position__gt=0,
+        device_type__u_height__gt=0
+    ).select_related(
+        'device_type__manufacturer',
+        'role'
+    ).annotate(
+        devicebay_count=Count('devicebays'),
+        child_count=Count('devicebays', filter=Q(devicebays__installed_device__isnull=False))
+    )
+    for device in devices:
+        data[device.rack_id]['devices'].append(device)
+
+    for reservation in RackReservation.objects.filter(rack__in=rack_ids):
+        data[reservation.rack_id]['reservations'].append(reservation)
+
+    # Determine the subset of devices within each rack that are viewable by the user, if any
+    permitted_devices = Device.objects.filter(rack__in=rack_ids)
+    if user is not None:
+        permitted_devices = permitted_devices.restrict(user, 'view')
+        for pk, rack_id in permitted_devices.values_list('pk', 'rack_id'):
+            data[rack_id]['permitted_device_ids'].add(pk)
+    else:
+        for rack_data in data.values():
+            rack_data['permitted_device_ids'] = {device.pk for device in rack_data['devices']}
+
+    # Determine device(s) to highlight within each elevation (if any)
+    if highlight_params:
+        q = Q()
+        for k, v in highlight_params:
+            q |= Q(**{k: v})
+        try:
+            for pk, rack_id in permitted_devices.filter(q).values_list('pk', 'rack_id'):
+                data[rack_id]['highlight_device_ids'].add(pk)
+        except FieldError:
+            pass
+
+    return data
+
+
+def render_rack_elevations(racks, face, user=None, highlight_params=None, **kwargs):
+    """
+    Render the elevations of the specified racks as SVG documents, retrieving the content of all racks in bulk. Each
+    rendered elevation is cached under a fingerprint of its content, so that an elevation is re-rendered only after it
+    has been modified. Returns a dictionary mapping each rack ID to its SVG document (as a string).
+
+    :param racks: An iterable of Racks
+    :param face: The rack face to render (front or rear)
+    :param user: User instance. If specified, only devices viewable by this user will be fully displayed.
+    :param highlight_params: Iterable of two-tuples which identifies attributes of devices to highlight
+    :param kwargs: Additional keyword arguments to pass to RackElevationSVG
+    """
+    data = get_rack_elevation_data(racks, user=user, highlight_params=highlight_params)
+
+    elevations = {}
+    cache_keys = {}
+    for rack in racks:
+        elevation = RackElevationSVG(rack, data=data[rack.pk], **kwargs)
+        elevations[rack.pk] = elevation
+        cache_keys[rack.pk] = f'dcim.rack_elevation.{elevation.get_fingerprint(face)}'
+    cached = cache.get_many(cache_keys.values())
+
+    rendered = {}
+    uncached = {}
+    for rack_id, elevation in elevations.items():
+        cache_key = cache_keys[rack_id]
+        if cache_key in cached:
+            rendered[rack_id] = cached[cache_key]
+        else:
+            rendered[rack_id] = uncached[cache_key] = elevation.render(face).tostring()
+    if uncached:
+        cache.set_many(uncached, RACK_ELEVATION_CACHE_TIMEOUT)
+
+    return rendered
+
+
 class RackElevationSVG:
     """
     Use this class to render a rack elevation as an SVG image.
@@ -95,9 +202,11 @@ class RackElevationSVG:
     :param include_images: If true, the SVG document will embed front/rear device face images, where available
     :param base_url: Base URL for links within the SVG document. If none, links will be relative.
     :param highlight_params: Iterable of two-tuples which identifies attributes of devices to highlight
+    :param data: The devices and reservations within the rack, as returned by get_rack_elevation_data(). If not
+        specified, these will be retrieved for the rack.
     """
     def __init__(self, rack, unit_height=None, unit_width=None, legend_width=None, margin_width=None, user=None,
-                 include_images=True, base_url=None, highlight_params=None):
+                 include_images=True, base_url=None, highlight_params=None, data=None):
         self.rack = rack
         self.include_images = include_images
         self.base_url = base_url.rstrip('/') if base_url is not None else ''
@@ -106,25 +215,49 @@ class RackElevationSVG:
         config = get_config()
         self.unit_width = unit_width or config.RACK_ELEVATION_DEFAULT_UNIT_WIDTH
         self.unit_height = unit_height or config.RACK_ELEVATION_DEFAULT_UNIT_HEIGHT
-        self.legend_width = legend_width or config.RACK_ELEVATION_DEFAULT_LEGEND_WIDTH
-        self.margin_width = margin_width or config.RACK_ELEVATION_DEFAULT_MARGIN_WIDTH
-
-        # Determine the subset of devices within this rack that are viewable by the user, if any
-        permitted_devices = self.rack.devices
-        if user is not None:
-            permitted_devices = permitted_devices.restrict(user, 'view')
-        self.permitted_device_ids = permitted_devices.values_list('pk', flat=True)
-
-        # Determine device(s) to highlight within the elevation (if any)
-        self.highlight_devices = []
-        if highlight_params:
-            q = Q()
-            for k, v in highlight_params:
-                q |= Q(**{k: v})
-            try:
-                self.highlight_devices = permitted_devices.filter(q)
-            except FieldError:
-                pass
+        self.legend_width = legend_width or RACK_ELEVATION_DEFAULT_LEGEND_WIDTH
+        self.margin_width = margin_width or RACK_ELEVATION_DEFAULT_MARGIN_WIDTH
+
+        # Retrieve the devices and reservations within this rack, and determine which devices are viewable by the
+        # user and which are to be highlighted
+        if data is None:
+            data = get_rack_elevation_data([rack], user=user, highlight_params=highlight_params)[rack.pk]
+        self.devices = data['devices']
+        self.reservations = data['reservations']
+        self.permitted_device_ids = data['permitted_device_ids']
+        self.highlight_device_ids = data['highlight_device_ids']
+
+    def get_fingerprint(self, face):
+        """
+        Return a fingerprint of everything which determines the rendered elevation of the specified rack face: the
+        drawing parameters, and the attributes of the rack and of each device and reservation within it.
+        """
+        rack = self.rack
+        content = [
+            settings.RELEASE.full_version,
+            get_language(),
+            face,
+            self.unit_width,
+            self.unit_height,
+            self.legend_width,
+            self.margin_width,
+            self.include_images,
+            self.base_url,
+            (rack.pk, rack.u_height, rack.starting_unit, rack.desc_units, rack.site_id, rack.location_id),
+        ]
+        for device in self.devices:
+            device_type = device.device_type
+            content.append((
+                device.pk, device.name, device.label, device.status, device.face, device.position, device.asset_tag,
+                device.serial, device.description, device.devicebay_count, device.child_count, device.role.name,
+                device.role.color, device_type.manufacturer.name, device_type.model, device_type.u_height,
+                device_type.is_full_depth, device_type.front_image.name, device_type.rear_image.name,
+                device.pk in self.permitted_device_ids, device.pk in self.highlight_device_ids,
+            ))
+        for reservation in self.reservations:
+            content.append((reservation.pk, reservation.units, reservation.description))
+
+        return hashlib.sha256(repr(content).encode()).hexdigest()
 
     @staticmethod
     def _add_gradient(drawing, id_, color):
@@ -185,7 +318,7 @@ class RackElevationSVG:
         )
 
         # Determine whether highlighting is in use, and if so, whether to shade this device
-        is_shaded = self.highlight_devices and device not in self.highlight_devices
+        is_shaded = self.highlight_device_ids and device.pk not in self.highlight_device_ids
         css_extra = ' shaded' if is_shaded else ''
 
         # Create hyperlink element
@@ -279,7 +412,7 @@ class RackElevationSVG:
         """
         Draw any rack reservations in the right-hand margin alongside the rack elevation.
         """
-        for reservation in self.rack.reservations.all():
+        for reservation in self.reservations:
             for segment in array_to_ranges(reservation.units):
                 u_height = 1 if len(segment) == 1 else segment[1] + 1 - segment[0]
                 coords = self._get_device_coords(segment[0], u_height)
@@ -303,8 +436,8 @@ class RackElevationSVG:
         url_string = '{}?{}&position={{}}'.format(
             reverse('dcim:device_add'),
             urlencode({
-                'site': self.rack.site.pk,
-                'location': self.rack.location.pk if self.rack.location else '',
+                'site': self.rack.site_id,
+                'location': self.rack.location_id or '',
                 'rack': self.rack.pk,
                 'face': face,
             })
@@ -325,30 +458,39 @@ class RackElevationSVG:
 
             self.drawing.add(link)
 
+    def get_face_devices(self, face):
+        """
+        Return a list of (position, device) for each device visible on the specified rack face, ordered from the top
+        of the rack elevation.
+        """
+        devices = {}
+        for device in self.devices:
+            if device.face == face or device.device_type.is_full_depth:
+                devices[device.position] = device
+
+        return [(u, devices[u]) for u in self.rack.units if u in devices]
+
     def draw_face(self, face, opposite=False):
         """
         Draw any occupied rack units for the specified rack face.
         """
-        for unit in self.rack.get_rack_units(face=face, expand_devices=False):
-
-            # Loop through all units in the elevation
-            device = unit['device']
-            height = unit.get('height', decimal.Decimal(1.0))
+        for position, device in self.get_face_devices(face):
+            height = device.device_type.u_height
 
-            device_coords = self._get_device_coords(unit['id'], height)
+            device_coords = self._get_device_coords(position, height)
             device_size = (
                 self.unit_width,
                 int(self.unit_height * height)
             )
 
             # Draw the device
-            if device and device.pk in self.permitted_device_ids:
+            if device.pk in self.permitted_device_ids:
                 if device.face == face and not opposite:
                     self.draw_device_front(device, device_coords, device_size)
                 else:
                     self.draw_device_rear(device, device_coords, device_size)
 
-            elif device:
+            else:
                 # Devices which the user does not have permission to view are rendered only as unavailable space
                 self.drawing.add(Rect(device_coords, device_size, class_='blocked'))
 
@@ -135,11 +135,11 @@ class RackTable(TenancyColumnsMixin, ContactsColumnMixin, PrimaryModelTable):
         verbose_name=_('Devices')
     )
     get_utilization = columns.UtilizationColumn(
-        orderable=False,
+        accessor='utilization',
         verbose_name=_('Space')
     )
     get_power_utilization = columns.UtilizationColumn(
-        orderable=False,
+        accessor='power_utilization',
         verbose_name=_('Power')
     )
     tags = columns.TagColumn(
@@ -1,20 +1,31 @@
+import io
 import json
+import tarfile
+import uuid
+from unittest.mock import patch
 
+from django.core.files.storage import default_storage
+from django.db import connection
 from django.test import override_settings, tag
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.translation import gettext as _
 from rest_framework import status
 
+from core.models import Job
 from dcim.choices import *
 from dcim.constants import *
 from dcim.models import *
-from extras.models import ConfigTemplate
+from extras.events import serialize_for_event
+from extras.jobs import RenderConfigTemplatesJob
+from extras.models import ConfigContext, ConfigTemplate
 from ipam.choices import VLANQinQRoleChoices
 from ipam.models import ASN, RIR, VLAN, VRF
 from netbox.api.serializers import GenericObjectSerializer
 from tenancy.models import Tenant
 from users.constants import TOKEN_PREFIX
 from users.models import Token, User
+from utilities.data import drange
 from utilities.testing import APITestCase, APIViewTestCases, create_test_device, disable_logging
 from virtualization.models import Cluster, ClusterType
 from wireless.choices import WirelessChannelChoices
@@ -67,6 +78,62 @@ class Mixins:
             self.assertEqual(segment1[1]['label'], cable.label)
             self.assertEqual(segment1[2][0]['name'], peer_obj.name)
 
+        def test_trace_cached(self):
+            """
+            Test the caching and ETag validation of cable traces.
+            """
+            obj = self.model.objects.first()
+            peer_device = Device.objects.create(
+                site=Site.objects.first(),
+                device_type=DeviceType.objects.first(),
+                role=DeviceRole.objects.first(),
+                name='Peer Device'
+            )
+            peer_obj = self.peer_termination_type.objects.create(
+                device=peer_device,
+                name='Peer Termination'
+            )
+            cable = Cable(a_terminations=[obj], b_terminations=[peer_obj], label='Cable 1')
+            cable.save()
+
+            self.add_permissions(f'dcim.view_{self.model._meta.model_name}')
+            url = reverse(f'dcim-api:{self.model._meta.model_name}-trace', kwargs={'pk': obj.pk})
+            response = self.client.get(url, **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            etag = response['ETag']
+
+            # A conditional request for the current trace should not return it again
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+            self.assertHttpStatus(response, status.HTTP_304_NOT_MODIFIED)
+
+            # A repeated request for the SVG rendering should be served from cache
+            response = self.client.get(f'{url}?render=svg', **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            svg = response.content
+            with patch('dcim.api.views.CableTraceSVG') as cable_trace_svg:
+                response = self.client.get(f'{url}?render=svg', **self.header)
+                self.assertFalse(cable_trace_svg.called)
+            self.assertEqual(response.content, svg)
+            self.assertNotEqual(response['ETag'], etag)
+
+            # Modifying the cable should invalidate the trace
+            cable.label = 'Cable 2'
+            cable.save()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            self.assertNotEqual(response['ETag'], etag)
+            self.assertEqual(response.data[0][1]['label'], 'Cable 2')
+
+            # Modifying a related object included in the display of the trace (e.g. the peer device's role) should
+            # also invalidate it
+            etag = response['ETag']
+            role = peer_device.role
+            role.color = '00ff00'
+            role.save()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            self.assertNotEqual(response['ETag'], etag)
+
 
 class RegionTest(APIViewTestCases.APIViewTestCase):
     model = Region
@@ -463,6 +530,106 @@ class RackTest(APIViewTestCases.APIViewTestCase):
         self.assertHttpStatus(response, status.HTTP_200_OK)
         self.assertEqual(response.get('Content-Type'), 'image/svg+xml')
 
+    def test_get_rack_elevations(self):
+        """
+        GET the elevations of multiple racks in SVG format.
+        """
+        racks = Rack.objects.all()
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        devices = [
+            Device.objects.create(
+                device_type=device_type,
+                role=role,
+                site=rack.site,
+                rack=rack,
+                name=f'Device {i}',
+                position=i,
+                face=DeviceFaceChoices.FACE_FRONT
+            ) for i, rack in enumerate(racks, start=1)
+        ]
+        RackReservation.objects.create(rack=racks[0], units=[10, 11], user=self.user, description='Reservation 1')
+        self.add_permissions('dcim.view_rack', 'dcim.view_device')
+        url = reverse('dcim-api:rack-elevations')
+
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        for elevation, rack in zip(response.data['results'], racks):
+            self.assertEqual(elevation['rack']['id'], rack.pk)
+            self.assertEqual(
+                elevation['svg'],
+                rack.get_elevation_svg(user=self.user, base_url='http://testserver/').tostring()
+            )
+
+        # A repeated request should be served from cache
+        with patch('dcim.svg.racks.RackElevationSVG.render') as render:
+            response = self.client.get(url, **self.header)
+            self.assertFalse(render.called)
+
+        # Modifying a device should invalidate the elevation of its rack only
+        devices[0].name = 'Device 4'
+        devices[0].save()
+        with patch('dcim.svg.racks.RackElevationSVG.render') as render:
+            response = self.client.get(url, **self.header)
+            self.assertEqual(render.call_count, 1)
+
+    def test_get_rack_free_space(self):
+        """
+        GET the positions within all racks at which a device of a given height can be installed.
+        """
+        racks = Rack.objects.all()
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(
+            manufacturer=manufacturer, model='Device Type 1', slug='device-type-1', u_height=40
+        )
+        Device.objects.create(
+            device_type=device_type,
+            role=DeviceRole.objects.create(name='Device Role 1', slug='device-role-1'),
+            site=racks[0].site,
+            rack=racks[0],
+            name='Device 1',
+            position=1,
+            face=DeviceFaceChoices.FACE_FRONT
+        )
+        RackReservation.objects.create(rack=racks[1], units=list(range(1, 41)), user=self.user)
+        self.add_permissions('dcim.view_rack')
+        url = reverse('dcim-api:rack-free-space')
+
+        def get_racks_with_room(params):
+            response = self.client.get(f'{url}?{params}', **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            self.assertEqual(response.data['count'], len(response.data['results']))
+            return [result['rack']['id'] for result in response.data['results']]
+
+        # The first rack has only two free units
+        response = self.client.get(f'{url}?device_height=2&face=front', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['results'][0]['available_units'], [41])
+
+        # Racks without room for the device are omitted
+        response = self.client.get(f'{url}?device_height=3&face=front', **self.header)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(response.data['results'][0]['rack']['id'], racks[1].pk)
+        self.assertEqual(response.data['results'][0]['available_units'], list(drange(1, 40.5, 0.5)))
+
+        # Reserved units are unavailable only if requested
+        self.assertEqual(get_racks_with_room('device_height=3'), [racks[1].pk, racks[2].pk])
+        self.assertEqual(get_racks_with_room('device_height=3&exclude_reserved=true'), [racks[2].pk])
+
+        # Racks can be filtered, and those with room are paginated
+        self.assertEqual(get_racks_with_room(f'device_height=3&id={racks[1].pk}'), [racks[1].pk])
+        self.assertEqual(get_racks_with_room(f'device_height=3&id={racks[0].pk}'), [])
+        response = self.client.get(f'{url}?device_height=3&limit=1&offset=1', **self.header)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual([result['rack']['id'] for result in response.data['results']], [racks[2].pk])
+
+        # The requested height must be valid
+        response = self.client.get(f'{url}?device_height=0', **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+
 
 class RackReservationTest(APIViewTestCases.APIViewTestCase):
     model = RackReservation
@@ -1520,6 +1687,51 @@ class DeviceTest(APIViewTestCases.APIViewTestCase):
 
         self.assertFalse('config_context' in response.data['results'][0])
 
+    def test_component_summary(self):
+        """
+        Check that a summary of each device's components is included only when requested by passing
+        ?include=component_summary.
+        """
+        device = Device.objects.first()
+        Interface.objects.create(device=device, name='Interface 1', type=InterfaceTypeChoices.TYPE_1GE_FIXED)
+        Interface.objects.create(
+            device=device, name='Interface 2', type=InterfaceTypeChoices.TYPE_1GE_FIXED, enabled=False
+        )
+        Interface.objects.create(
+            device=device, name='Interface 3', type=InterfaceTypeChoices.TYPE_1GE_FIXED, mark_connected=True
+        )
+        self.add_permissions('dcim.view_device')
+        url = reverse('dcim-api:device-detail', kwargs={'pk': device.pk})
+
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertNotIn('component_summary', response.data)
+
+        response = self.client.get(f'{url}?include=component_summary', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['component_summary']['interfaces'], {
+            'total': 3,
+            'connected': 1,
+            'unconnected': 2,
+            'enabled': 2,
+            'disabled': 1,
+        })
+        self.assertEqual(response.data['component_summary']['console_ports'], {
+            'total': 0,
+            'connected': 0,
+            'unconnected': 0,
+        })
+
+        # The summary should also be available when listing devices
+        response = self.client.get(f'{reverse("dcim-api:device-list")}?include=component_summary', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertIn('component_summary', response.data['results'][0])
+
+        # The summary (and its underlying counters) should be omitted from change and event data
+        device.refresh_from_db()
+        self.assertNotIn('component_summary', serialize_for_event(device))
+        self.assertNotIn('connected_interface_count', device.serialize_object())
+
     def test_unique_name_per_site_constraint(self):
         """
         Check that creating a device with a duplicate name within a site fails.
@@ -1633,6 +1845,96 @@ class DeviceTest(APIViewTestCases.APIViewTestCase):
         response = self.client.post(url, {}, format='json', HTTP_AUTHORIZATION=token_header)
         self.assertHttpStatus(response, status.HTTP_200_OK)
 
+    def test_render_configs(self):
+        configtemplates = (
+            ConfigTemplate(name='Config Template 1', template_code='{{ device.name }} {{ foo }}', file_extension='txt'),
+            ConfigTemplate(name='Config Template 2', template_code='{{ device.name.missing() }}'),
+        )
+        ConfigTemplate.objects.bulk_create(configtemplates)
+        devices = Device.objects.order_by('pk')[:3]
+        Device.objects.filter(pk=devices[0].pk).update(config_template=configtemplates[0])
+        Device.objects.filter(pk=devices[1].pk).update(config_template=configtemplates[1])
+
+        self.add_permissions('dcim.render_config_device', 'dcim.view_device')
+        url = reverse('dcim-api:device-render-configs')
+        query = '&'.join(f'id={device.pk}' for device in devices)
+
+        # Render as NDJSON
+        response = self.client.post(f'{url}?{query}', {'foo': 'bar'}, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        results = {
+            result['id']: result for result in map(json.loads, b''.join(response.streaming_content).splitlines())
+        }
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[devices[0].pk]['content'], f'{devices[0].name} bar')
+        self.assertEqual(results[devices[0].pk]['configtemplate'], configtemplates[0].pk)
+        self.assertIn('error', results[devices[1].pk])
+        self.assertIn('error', results[devices[2].pk])
+        self.assertIsNone(results[devices[2].pk]['configtemplate'])
+
+        # Render as a tar archive
+        response = self.client.post(f'{url}?{query}&output=tar', {'foo': 'bar'}, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        with tarfile.open(fileobj=io.BytesIO(b''.join(response.streaming_content))) as archive:
+            filename = f'{devices[0].pk}-{devices[0].name}.txt'.replace(' ', '_')
+            self.assertEqual(archive.getnames(), [filename, 'errors.json'])
+            self.assertEqual(archive.extractfile(filename).read().decode(), f'{devices[0].name} bar')
+            self.assertEqual(len(json.load(archive.extractfile('errors.json'))), 2)
+
+    @override_settings(MATERIALIZE_CONFIG_CONTEXTS=True)
+    def test_render_configs_unmaterialized(self):
+        """
+        Check that the config context data of objects lacking a materialized context is resolved in bulk.
+        """
+        configtemplate = ConfigTemplate.objects.create(name='Config Template 1', template_code='{{ foo }}')
+        ConfigContext.objects.create(name='Config Context 1', data={'foo': 'bar'})
+        Device.objects.update(config_template=configtemplate, _config_context=None)
+        devices = Device.objects.order_by('pk')
+
+        self.add_permissions('dcim.render_config_device', 'dcim.view_device')
+        url = reverse('dcim-api:device-render-configs')
+        query_counts = []
+        for count in (1, 3):
+            query = '&'.join(f'id={device.pk}' for device in devices[:count])
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(f'{url}?{query}', {}, format='json', **self.header)
+                results = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+            self.assertEqual([result['content'] for result in results], ['bar'] * count)
+            query_counts.append(len(queries))
+        self.assertLessEqual(query_counts[1], query_counts[0])
+
+    @override_settings(STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    })
+    def test_render_configs_background(self):
+        configtemplate = ConfigTemplate.objects.create(name='Config Template 1', template_code='{{ device.name }}')
+        device = Device.objects.first()
+        Device.objects.filter(pk=device.pk).update(config_template=configtemplate)
+
+        self.add_permissions('dcim.render_config_device', 'dcim.view_device')
+        url = reverse('dcim-api:device-render-configs')
+        with patch('extras.jobs.RenderConfigTemplatesJob.enqueue') as mock_enqueue:
+            mock_enqueue.return_value = Job(name='Render Config Templates', job_id=uuid.uuid4(), user=self.user)
+            response = self.client.post(f'{url}?id={device.pk}&background=true', {}, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_202_ACCEPTED)
+        self.assertEqual(mock_enqueue.call_args.kwargs['filters'], {'id': [str(device.pk)]})
+
+        # Run the job
+        job = Job.objects.create(name='Render Config Templates', job_id=uuid.uuid4(), user=self.user)
+        RenderConfigTemplatesJob(job).run(**{
+            k: v for k, v in mock_enqueue.call_args.kwargs.items() if k in ('model', 'filters', 'context')
+        })
+        self.assertEqual(job.data['rendered'], 1)
+        with default_storage.open(job.file) as f, tarfile.open(fileobj=f) as archive:
+            self.assertEqual(archive.getnames(), [f'{device.pk}-{device.name}'.replace(' ', '_')])
+
+    def test_render_configs_without_permission(self):
+        url = reverse('dcim-api:device-render-configs')
+        response = self.client.post(url, {}, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), b'')
+
 
 class ModuleTest(APIViewTestCases.APIViewTestCase):
     model = Module
@@ -1699,6 +2001,39 @@ class ModuleTest(APIViewTestCases.APIViewTestCase):
             },
         ]
 
+    def test_install_modules(self):
+        """
+        Install multiple modules, replicating their components, with a single POST request.
+        """
+        device = Device.objects.first()
+        module_type = ModuleType.objects.create(manufacturer=Manufacturer.objects.first(), model='Line Card 1')
+        InterfaceTemplate.objects.bulk_create([
+            InterfaceTemplate(
+                module_type=module_type, name=f'Interface {{module}}/{i}', type=InterfaceTypeChoices.TYPE_1GE_FIXED
+            )
+            for i in range(1, 49)
+        ])
+        module_bays = [
+            ModuleBay.objects.create(device=device, name=f'Line Card Bay {i}', position=str(i))
+            for i in range(1, 17)
+        ]
+        self.add_permissions('dcim.add_module', 'dcim.view_modulebay', 'dcim.view_moduletype', 'dcim.view_device')
+        data = [
+            {
+                'device': device.pk,
+                'module_bay': module_bay.pk,
+                'module_type': module_type.pk,
+            } for module_bay in module_bays
+        ]
+
+        response = self.client.post(self._get_list_url(), data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 16)
+        for module_bay in module_bays:
+            module = Module.objects.get(module_bay=module_bay)
+            self.assertEqual(module.interfaces.count(), 48)
+            self.assertTrue(module.interfaces.filter(name=f'Interface {module_bay.position}/48').exists())
+
 
 class ConsolePortTest(Mixins.ComponentTraceMixin, APIViewTestCases.APIViewTestCase):
     model = ConsolePort
@@ -1,8 +1,17 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from circuits.models import *
 from dcim.choices import LinkStatusChoices
 from dcim.models import *
 from dcim.svg import CableTraceSVG
 from dcim.tests.utils import CablePathTestCase
+from dcim.tracing import get_rebuild_partitions, rebuild_partition, start_rebuild
+from dcim.utils import delete_cablepaths, rebuild_paths
 from utilities.exceptions import AbortRequest
 
 
@@ -2841,6 +2850,61 @@ class LegacyCablePathTests(CablePathTestCase):
         interface3.refresh_from_db()
         self.assertPathIsNotSet(interface3)
 
+    def test_304_rebuild_paths_in_bulk(self):
+        """
+        [IF1:N] --C1:N-- [FP1:N] [RP1] --C3-- [RP2] [FP2:N] --C2:N-- [IF2:N]
+
+        Rebuilding the paths which traverse a trunk should reproduce them exactly, using a number of queries
+        independent of the number of paths.
+        """
+        rearport1 = RearPort.objects.create(device=self.device, name='Rear Port 1', positions=8)
+        rearport2 = RearPort.objects.create(device=self.device, name='Rear Port 2', positions=8)
+        for i in range(1, 9):
+            frontport1 = FrontPort.objects.create(device=self.device, name=f'Front Port 1:{i}')
+            frontport2 = FrontPort.objects.create(device=self.device, name=f'Front Port 2:{i}')
+            PortMapping.objects.bulk_create([
+                PortMapping(
+                    device=self.device,
+                    front_port=frontport1,
+                    front_port_position=1,
+                    rear_port=rearport1,
+                    rear_port_position=i,
+                ),
+                PortMapping(
+                    device=self.device,
+                    front_port=frontport2,
+                    front_port_position=1,
+                    rear_port=rearport2,
+                    rear_port_position=i,
+                ),
+            ])
+            Cable(
+                a_terminations=[Interface.objects.create(device=self.device, name=f'Interface 1:{i}')],
+                b_terminations=[frontport1]
+            ).save()
+            Cable(
+                a_terminations=[Interface.objects.create(device=self.device, name=f'Interface 2:{i}')],
+                b_terminations=[frontport2]
+            ).save()
+        cable3 = Cable(a_terminations=[rearport1], b_terminations=[rearport2])
+        cable3.save()
+
+        def get_paths():
+            return sorted(
+                (cp.path, cp.is_complete, cp.is_active, cp.is_split) for cp in CablePath.objects.all()
+            )
+
+        paths = get_paths()
+        self.assertEqual(len(paths), 16)
+        self.assertTrue(all(is_complete for _, is_complete, _, _ in paths))
+
+        with CaptureQueriesContext(connection) as queries:
+            rebuild_paths([cable3])
+        self.assertEqual(get_paths(), paths)
+        self.assertLess(len(queries), 30)
+        for interface in Interface.objects.all():
+            self.assertEqual(interface._path.origins, [interface])
+
     def test_401_exclude_midspan_devices(self):
         """
         [IF1] --C1-- [FP1][Test Device][RP1] --C2-- [RP2][Test Device][FP2] --C3-- [IF2]
@@ -2982,3 +3046,90 @@ class LegacyCablePathTests(CablePathTestCase):
         self.assertEqual(CablePath.objects.count(), 1)
         interface.refresh_from_db()
         self.assertPathIsSet(interface, path)
+
+
+class CablePathRebuildTestCase(CablePathTestCase):
+    """
+    Test the rebuilding of all CablePaths by the trace_paths management command.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        site2 = Site.objects.create(name='Site 2', slug='site-2')
+        device2 = Device.objects.create(
+            site=site2, device_type=cls.device.device_type, role=cls.device.role, name='Test Device 2'
+        )
+        interfaces = [
+            Interface.objects.create(device=cls.device, name='Interface 1'),
+            Interface.objects.create(device=device2, name='Interface 2'),
+            Interface.objects.create(device=cls.device, name='Interface 3'),
+            Interface.objects.create(device=cls.device, name='Interface 4'),
+            Interface.objects.create(device=device2, name='Interface 5'),
+        ]
+        frontport1 = FrontPort.objects.create(device=cls.device, name='Front Port 1')
+        rearport1 = RearPort.objects.create(device=cls.device, name='Rear Port 1')
+        frontport2 = FrontPort.objects.create(device=device2, name='Front Port 2')
+        rearport2 = RearPort.objects.create(device=device2, name='Rear Port 2')
+        PortMapping.objects.bulk_create([
+            PortMapping(device=cls.device, front_port=frontport1, rear_port=rearport1),
+            PortMapping(device=device2, front_port=frontport2, rear_port=rearport2),
+        ])
+        powerfeed = PowerFeed.objects.create(power_panel=cls.powerpanel, name='Power Feed 1')
+        powerport = PowerPort.objects.create(device=device2, name='Power Port 1')
+
+        # [IF1] --C1-- [FP1] [RP1] --C2-- [RP2] [FP2] --C3-- [IF2]
+        # [IF3, IF4] --C4-- [IF5]
+        # [PF1] --C5-- [PP1]
+        Cable(a_terminations=[interfaces[0]], b_terminations=[frontport1]).save()
+        Cable(a_terminations=[rearport1], b_terminations=[rearport2]).save()
+        Cable(a_terminations=[frontport2], b_terminations=[interfaces[1]]).save()
+        Cable(a_terminations=[interfaces[2], interfaces[3]], b_terminations=[interfaces[4]]).save()
+        Cable(a_terminations=[powerfeed], b_terminations=[powerport]).save()
+
+    @staticmethod
+    def get_paths():
+        return sorted(
+            (cp.path, cp.is_complete, cp.is_active, cp.is_split) for cp in CablePath.objects.all()
+        )
+
+    def assertOriginPathsSet(self):
+        for cp in CablePath.objects.all():
+            for origin in cp.origins:
+                self.assertPathIsSet(origin, cp)
+
+    def test_rebuild_cablepaths(self):
+        paths = self.get_paths()
+        self.assertEqual(len(paths), 6)
+
+        # Corrupt the existing paths
+        interface = Interface.objects.get(name='Interface 1')
+        delete_cablepaths([interface._path])
+        CablePath.objects.filter(_nodes__contains=Interface.objects.get(name='Interface 5')).update(is_active=False)
+
+        with self.assertRaises(CommandError):
+            call_command('trace_paths', dry_run=True, stdout=StringIO())
+
+        call_command('trace_paths', partition_by='site', stdout=StringIO())
+        self.assertEqual(self.get_paths(), paths)
+        self.assertOriginPathsSet()
+        self.assertIsNone(get_rebuild_partitions())
+
+        # Validation should now succeed
+        call_command('trace_paths', dry_run=True, stdout=StringIO())
+
+    def test_resume_rebuild(self):
+        paths = self.get_paths()
+
+        start_rebuild('device')
+        partitions = get_rebuild_partitions()
+        self.assertEqual(len(partitions), 3)  # Two devices and one power panel
+
+        # Rebuild only the first partition
+        self.assertEqual(rebuild_partition(*partitions[0])['paths'], 2)
+        self.assertEqual(get_rebuild_partitions(), partitions[1:])
+
+        call_command('trace_paths', resume=True, stdout=StringIO())
+        self.assertEqual(self.get_paths(), paths)
+        self.assertOriginPathsSet()
+        self.assertIsNone(get_rebuild_partitions())
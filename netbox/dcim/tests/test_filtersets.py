@@ -1078,6 +1078,23 @@ class RackTestCase(TestCase, ChangeLoggedFilterSetTests):
         params = {'airflow': RackAirflowChoices.FRONT_TO_REAR}
         self.assertEqual(self.filterset(params, self.queryset).qs.count(), 1)
 
+    def test_utilization(self):
+        RackReservation.objects.create(
+            rack=Rack.objects.first(),
+            units=[1],
+            user=User.objects.create(username='User 1')
+        )
+        params = {'utilization__gte': 1}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 1)
+        params = {'utilization__lte': 0}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 4)
+
+    def test_power_utilization(self):
+        params = {'power_utilization__lte': 0}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 5)
+        params = {'power_utilization__gte': 1}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 0)
+
 
 class RackReservationTestCase(TestCase, ChangeLoggedFilterSetTests):
     queryset = RackReservation.objects.all()
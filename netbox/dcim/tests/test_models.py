@@ -1,14 +1,21 @@
+import uuid
+
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from django.test import tag, TestCase
+from django.db import connection
+from django.test import RequestFactory, tag, TestCase
+from django.test.utils import CaptureQueriesContext
 
 from circuits.models import *
-from core.models import ObjectType
+from core.models import ObjectChange, ObjectType
 from dcim.choices import *
 from dcim.models import *
-from extras.models import CustomField
+from extras.models import CachedValue, CustomField
 from ipam.models import Prefix
 from netbox.choices import WeightUnitChoices
+from netbox.context_managers import event_tracking
 from tenancy.models import Tenant
+from users.models import User
 from utilities.data import drange
 from virtualization.models import Cluster, ClusterType
 
@@ -369,6 +376,123 @@ class RackTestCase(TestCase):
         rack.refresh_from_db()
         self.assertEqual(rack.get_utilization(), 1 / 42 * 100)
 
+    def test_annotate_utilization(self):
+        site = Site.objects.first()
+        role = DeviceRole.objects.first()
+        racks = (
+            Rack.objects.first(),
+            Rack.objects.create(name='Rack 2', site=site, u_height=10, starting_unit=10),
+            Rack.objects.create(name='Rack 3', site=site, u_height=10),
+        )
+        excluded_device_type = DeviceType.objects.create(
+            manufacturer=Manufacturer.objects.first(),
+            model='Device Type 4',
+            slug='device-type-4',
+            u_height=2,
+            exclude_from_utilization=True
+        )
+
+        # Occupy space in the first two racks
+        devices = (
+            Device(name='Device 1', device_type=DeviceType.objects.get(u_height=1), position=1),
+            Device(name='Device 2', device_type=excluded_device_type, position=5),
+            Device(name='Device 3', device_type=DeviceType.objects.get(u_height=0.5), position=10.5, rack=racks[1]),
+            Device(name='Device 4', device_type=DeviceType.objects.get(u_height=1), position=12, rack=racks[1]),
+            Device(name='Device 5', device_type=DeviceType.objects.get(u_height=0)),
+        )
+        for device in devices:
+            device.site = site
+            device.role = role
+            device.rack = device.rack or racks[0]
+            device.face = DeviceFaceChoices.FACE_FRONT if device.position else ''
+            device.save()
+        RackReservation.objects.create(rack=racks[1], units=[12, 13, 15], user=User.objects.create(username='user1'))
+
+        # Allocate power in the first rack: PowerPort 1 defines its allocated draw, while PowerPort 2 inherits the
+        # draw of the PowerPorts connected to its outlets
+        power_panel = PowerPanel.objects.create(site=site, name='Power Panel 1')
+        power_feeds = (
+            PowerFeed.objects.create(power_panel=power_panel, rack=racks[0], name='Power Feed 1'),
+            PowerFeed.objects.create(power_panel=power_panel, rack=racks[0], name='Power Feed 2'),
+            PowerFeed.objects.create(power_panel=power_panel, rack=racks[2], name='Power Feed 3'),
+        )
+        power_ports = (
+            PowerPort.objects.create(device=devices[0], name='Power Port 1', allocated_draw=1000),
+            PowerPort.objects.create(device=devices[1], name='Power Port 2'),
+            PowerPort.objects.create(device=devices[2], name='Power Port 3', allocated_draw=300, maximum_draw=400),
+            PowerPort.objects.create(device=devices[3], name='Power Port 4', allocated_draw=200),
+        )
+        power_outlets = (
+            PowerOutlet.objects.create(device=devices[1], name='Power Outlet 1', power_port=power_ports[1]),
+            PowerOutlet.objects.create(device=devices[1], name='Power Outlet 2', power_port=power_ports[1]),
+        )
+        Cable(a_terminations=[power_feeds[0]], b_terminations=[power_ports[0]]).save()
+        Cable(a_terminations=[power_feeds[1]], b_terminations=[power_ports[1]]).save()
+        Cable(a_terminations=[power_outlets[0]], b_terminations=[power_ports[2]]).save()
+        Cable(a_terminations=[power_outlets[1]], b_terminations=[power_ports[3]]).save()
+
+        with self.assertNumQueries(1):
+            annotated_racks = list(Rack.objects.annotate_utilization().order_by('pk'))
+        for rack in annotated_racks:
+            self.assertAlmostEqual(rack.utilization, rack.get_utilization())
+            self.assertEqual(rack.power_utilization, rack.get_power_utilization())
+        self.assertEqual([rack.utilization for rack in annotated_racks], [1 / 42 * 100, 35.0, 0.0])
+        self.assertEqual([rack.power_utilization for rack in annotated_racks], [52.1, 0.0, 0.0])
+
+    def test_get_occupancy(self):
+        site = Site.objects.first()
+        role = DeviceRole.objects.first()
+        racks = (
+            Rack.objects.create(name='Rack 2', site=site, u_height=6, starting_unit=10, desc_units=True),
+            Rack.objects.create(name='Rack 3', site=site, u_height=4),
+        )
+        device_types = (
+            DeviceType.objects.get(u_height=1),
+            DeviceType.objects.get(u_height=0.5),
+            DeviceType.objects.create(
+                manufacturer=Manufacturer.objects.first(),
+                model='Device Type 4',
+                slug='device-type-4',
+                u_height=1,
+                is_full_depth=False
+            ),
+        )
+        front, rear = DeviceFaceChoices.FACE_FRONT, DeviceFaceChoices.FACE_REAR
+        devices = (
+            Device(name='Device 1', device_type=device_types[0], position=12, face=front),
+            Device(name='Device 2', device_type=device_types[2], position=14, face=rear),
+            Device(name='Device 3', device_type=device_types[1], position=10.5, face=front),
+        )
+        for device in devices:
+            device.site = site
+            device.role = role
+            device.rack = racks[0]
+            device.save()
+        RackReservation.objects.create(rack=racks[1], units=[2], user=User.objects.create(username='user1'))
+        queryset = Rack.objects.filter(pk__in=[rack.pk for rack in racks])
+
+        # Bit n represents the half-unit at starting_unit + n/2
+        with self.assertNumQueries(1):
+            occupancy = queryset.get_occupancy(face=front)
+        self.assertEqual(occupancy, {racks[0].pk: 0b110010, racks[1].pk: 0})
+        self.assertEqual(queryset.get_occupancy()[racks[0].pk], 0b1100110010)
+        self.assertEqual(queryset.get_occupancy(include_reservations=True)[racks[1].pk], 0b1100)
+
+        # Available units are listed from the bottom of the rack, in the order of its units
+        self.assertEqual(racks[0].get_available_units(u_height=2, rack_face=front), [14, 13.5, 13])
+        self.assertEqual(racks[0].get_available_units(rack_face=front), [15, 14.5, 14, 13.5, 13, 11])
+        self.assertEqual(racks[0].get_available_units(u_height=2, rack_face=rear), [])
+        self.assertEqual(racks[0].get_available_units(u_height=2, exclude=[devices[1].pk]), [14, 13.5, 13])
+        self.assertEqual(racks[1].get_available_units(u_height=2), [1, 1.5, 2, 2.5, 3])
+        self.assertEqual(racks[1].get_utilization(), 25.0)
+        self.assertEqual(queryset.annotate_utilization().get(pk=racks[1].pk).utilization, 25.0)
+
+        # A height of zero requires no contiguous space, so every free half-unit is returned
+        self.assertEqual(
+            racks[0].get_available_units(u_height=0, rack_face=front),
+            [15.5, 15, 14.5, 14, 13.5, 13, 11.5, 11, 10]
+        )
+
 
 class DeviceTestCase(TestCase):
 
@@ -559,6 +683,65 @@ class DeviceTestCase(TestCase):
         )
         self.assertEqual(inventoryitem.cf['cf1'], 'foo')
 
+    def test_device_creation_signals_components_in_bulk(self):
+        """
+        Creating a device should record changes, cache search values and update counters for its components using a
+        number of queries which does not depend on the number of components.
+        """
+        manufacturer = Manufacturer.objects.first()
+        device_types = (
+            DeviceType(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1'),
+            DeviceType(manufacturer=manufacturer, model='Device Type 2', slug='device-type-2'),
+        )
+        DeviceType.objects.bulk_create(device_types)
+        for device_type, count in zip(device_types, (1, 48)):
+            InterfaceTemplate.objects.bulk_create([
+                InterfaceTemplate(
+                    device_type=device_type, name=f'Interface {i}', type=InterfaceTypeChoices.TYPE_1GE_FIXED
+                )
+                for i in range(1, count + 1)
+            ])
+            ConsolePortTemplate.objects.bulk_create([
+                ConsolePortTemplate(device_type=device_type, name=f'Console Port {i}') for i in range(1, count + 1)
+            ])
+
+        request = RequestFactory().get('/')
+        request.id = uuid.uuid4()
+        request.user = User.objects.create(username='User 1')
+        query_counts = []
+        for device_type in device_types:
+            ContentType.objects.clear_cache()
+            with event_tracking(request), CaptureQueriesContext(connection) as queries:
+                device = Device.objects.create(
+                    site=Site.objects.first(),
+                    device_type=device_type,
+                    role=DeviceRole.objects.first(),
+                    name=device_type.model
+                )
+            query_counts.append(len(queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+
+        device.refresh_from_db()
+        self.assertEqual(device.interface_count, 48)
+        self.assertEqual(device.enabled_interface_count, 48)
+        self.assertEqual(device.console_port_count, 48)
+        self.assertEqual(
+            ObjectChange.objects.filter(
+                changed_object_type=ObjectType.objects.get_for_model(Interface),
+                related_object_id=device.pk,
+                request_id=request.id
+            ).count(),
+            48
+        )
+        self.assertEqual(
+            CachedValue.objects.filter(
+                object_type=ObjectType.objects.get_for_model(Interface),
+                object_id__in=device.interfaces.values('pk'),
+                field='name'
+            ).count(),
+            48
+        )
+
     def test_multiple_unnamed_devices(self):
 
         device1 = Device(
@@ -1011,6 +1194,85 @@ class ModuleBayTestCase(TestCase):
         self.assertEqual(RearPort.objects.filter(module=module).count(), 1)
         self.assertEqual(PortMapping.objects.filter(front_port__module=module).count(), 0)
 
+    def test_module_installation_queries(self):
+        """
+        Installing a module should require a number of queries which does not depend on the number of components
+        defined by its module type.
+        """
+        device = Device.objects.first()
+        manufacturer = Manufacturer.objects.first()
+        module_types = (
+            ModuleType(manufacturer=manufacturer, model='Line Card 1'),
+            ModuleType(manufacturer=manufacturer, model='Line Card 2'),
+        )
+        ModuleType.objects.bulk_create(module_types)
+        for module_type, count in zip(module_types, (1, 48)):
+            InterfaceTemplate.objects.bulk_create([
+                InterfaceTemplate(
+                    module_type=module_type, name=f'Interface {{module}}/{i}', type=InterfaceTypeChoices.TYPE_1GE_FIXED
+                )
+                for i in range(1, count + 1)
+            ])
+            power_ports = PowerPortTemplate.objects.bulk_create([
+                PowerPortTemplate(module_type=module_type, name=f'Power Port {{module}}/{i}')
+                for i in range(1, count + 1)
+            ])
+            PowerOutletTemplate.objects.bulk_create([
+                PowerOutletTemplate(module_type=module_type, name=f'Power Outlet {{module}}/{i}', power_port=power_port)
+                for i, power_port in enumerate(power_ports, start=1)
+            ])
+
+        query_counts = []
+        for i, module_type in enumerate(module_types, start=1):
+            module_bay = ModuleBay.objects.create(device=device, name=f'Line Card Bay {i}', position=str(i))
+            ContentType.objects.clear_cache()
+            with CaptureQueriesContext(connection) as queries:
+                module = Module.objects.create(device=device, module_bay=module_bay, module_type=module_type)
+            query_counts.append(len(queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+
+        self.assertEqual(module.interfaces.count(), 48)
+        self.assertEqual(module.powerports.count(), 48)
+        power_outlet = module.poweroutlets.get(name='Power Outlet 2/48')
+        self.assertEqual(power_outlet.power_port.name, 'Power Port 2/48')
+        self.assertEqual(power_outlet.power_port.module, module)
+
+    def test_module_installation_adopts_components(self):
+        device = Device.objects.first()
+        manufacturer = Manufacturer.objects.first()
+        module_bay = ModuleBay.objects.create(device=device, name='Line Card Bay 1', position='1')
+        module_type = ModuleType.objects.create(manufacturer=manufacturer, model='Line Card 1')
+        InterfaceTemplate.objects.bulk_create([
+            InterfaceTemplate(
+                module_type=module_type, name=f'Interface {{module}}/{i}', type=InterfaceTypeChoices.TYPE_1GE_FIXED
+            )
+            for i in range(1, 5)
+        ])
+        PowerPortTemplate.objects.create(module_type=module_type, name='Power Port 1')
+        PowerOutletTemplate.objects.create(
+            module_type=module_type,
+            name='Power Outlet 1',
+            power_port=PowerPortTemplate.objects.get(module_type=module_type)
+        )
+
+        # Create the components to be adopted
+        interfaces = Interface.objects.bulk_create([
+            Interface(device=device, name=f'Interface 1/{i}', type=InterfaceTypeChoices.TYPE_1GE_FIXED)
+            for i in range(1, 3)
+        ])
+        power_port = PowerPort.objects.create(device=device, name='Power Port 1')
+
+        module = Module(device=device, module_bay=module_bay, module_type=module_type)
+        module._adopt_components = True
+        module.save()
+
+        self.assertEqual(module.interfaces.count(), 4)
+        for interface in interfaces:
+            interface.refresh_from_db()
+            self.assertEqual(interface.module, module)
+        self.assertEqual(module.powerports.get(), power_port)
+        self.assertEqual(module.poweroutlets.get().power_port, power_port)
+
 
 class CableTestCase(TestCase):
 
@@ -1201,6 +1463,18 @@ class CableTestCase(TestCase):
         with self.assertRaises(ValidationError):
             cable.clean()
 
+    def test_cablepath_node_lookup_uses_index(self):
+        """
+        Test that looking up CablePaths by node employs the GIN index on _nodes.
+        """
+        interface = Interface.objects.get(device__name='TestDevice1', name='eth0')
+        self.assertTrue(CablePath.objects.filter(_nodes__contains=interface).exists())
+
+        # Disable sequential scans, which the query planner would otherwise prefer for such a small table
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        self.assertIn('dcim_cablepath_nodes', CablePath.objects.filter(_nodes__contains=interface).explain())
+
 
 class VirtualDeviceContextTestCase(TestCase):
 
@@ -0,0 +1,497 @@
+from collections import Counter, defaultdict
+from itertools import chain
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from circuits.models import CircuitTermination
+from dcim.models import (
+    Cable, CablePath, CableTermination, ConsolePort, ConsoleServerPort, Device, FrontPort, Interface, PortMapping,
+    PowerFeed, PowerOutlet, PowerPanel, PowerPort, RearPort, Site,
+)
+from dcim.utils import decompile_path_node, delete_cablepaths, object_to_path_node, save_cablepaths, trace_cablepaths
+
+__all__ = (
+    'CableGraph',
+    'finish_rebuild',
+    'get_rebuild_partitions',
+    'rebuild_partition',
+    'start_rebuild',
+)
+
+REBUILD_PARTITION_TABLE = 'dcim_cablepath_rebuild_partition'
+
+# Models from which CablePaths originate
+ENDPOINT_MODELS = (
+    ConsolePort,
+    ConsoleServerPort,
+    Interface,
+    PowerFeed,
+    PowerOutlet,
+    PowerPort,
+)
+
+# Parent objects to be selected alongside terminating objects (used to validate mid-span terminations)
+PARENT_FIELDS = ('device', 'circuit', 'power_panel', '_provider_network')
+
+
+def cable_termination_sort_key(cable_termination):
+    """
+    Mirror the ordering of CableTermination (cable, cable_end, connector, pk). PostgreSQL sorts null values last.
+    """
+    return (
+        cable_termination.cable_id,
+        cable_termination.cable_end,
+        cable_termination.connector is None,
+        cable_termination.connector or 0,
+        cable_termination.pk,
+    )
+
+
+class CableGraph:
+    """
+    An in-memory representation of the cables, cable terminations, port mappings, and circuit terminations traversed
+    by CablePaths. Objects are loaded in bulk, either up front by calling preload() or lazily as they are first
+    encountered during a trace, so that many paths can be traced against a single graph with a minimal number of
+    queries.
+
+    A graph reflects the state of the database at the time each object was loaded; it should not be reused across
+    changes to cables or port mappings.
+    """
+    def __init__(self):
+        # Terminating objects (interfaces, front ports, circuit terminations, etc.), keyed by (model, pk)
+        self._objects = {}
+        # Cables by PK
+        self._cables = {}
+        # CableTerminations by cable PK, and by (termination type ID, termination ID)
+        self._cable_terminations = {}
+        self._terminations_index = {}
+        # PortMappings by (FrontPort|RearPort, pk)
+        self._port_mappings = {}
+        # CircuitTerminations by circuit PK
+        self._circuit_terminations = {}
+
+    #
+    # Loading
+    #
+
+    def _register(self, obj):
+        """
+        Add a terminating object to the graph (if not already present) and return the canonical instance.
+        """
+        key = (obj._meta.concrete_model, obj.pk)
+        if key in self._objects:
+            return self._objects[key]
+        self._objects[key] = obj
+        if (cable := self._cables.get(getattr(obj, 'cable_id', None))) is not None:
+            obj.cable = cable
+        return obj
+
+    def _get_queryset(self, model):
+        queryset = model.objects.all()
+        field_names = {field.name for field in model._meta.concrete_fields}
+        if related_fields := [name for name in PARENT_FIELDS if name in field_names]:
+            queryset = queryset.select_related(*related_fields)
+        if model is CircuitTermination:
+            queryset = queryset.prefetch_related('termination')
+        return queryset
+
+    def _load_objects(self, model, pks):
+        """
+        Return a dictionary mapping the given PKs to instances of the specified model, loading any not yet present.
+        """
+        model = model._meta.concrete_model
+        if missing := {pk for pk in pks if (model, pk) not in self._objects}:
+            for obj in self._get_queryset(model).filter(pk__in=missing):
+                self._register(obj)
+        return {
+            pk: self._objects[(model, pk)] for pk in pks if (model, pk) in self._objects
+        }
+
+    def load(self, model, query):
+        """
+        Load all objects of the given model matching a query (a Q object) into the graph, and return them.
+        """
+        return [self._register(obj) for obj in self._get_queryset(model).filter(query)]
+
+    def load_cables(self, pks):
+        """
+        Load the specified Cables along with all their CableTerminations and terminating objects. Returns a list of
+        the terminating objects attached to newly loaded cables.
+        """
+        if not (pks := {pk for pk in pks if pk is not None and pk not in self._cables}):
+            return []
+
+        for cable in Cable.objects.filter(pk__in=pks):
+            self._cables[cable.pk] = cable
+            self._cable_terminations[cable.pk] = []
+        cable_terminations = [
+            ct for ct in CableTermination.objects.filter(cable__in=pks) if ct.cable_id in self._cables
+        ]
+
+        # Load terminating objects in bulk, one query per type
+        termination_ids = defaultdict(set)
+        for ct in cable_terminations:
+            termination_ids[ct.termination_type_id].add(ct.termination_id)
+        objects = {}
+        for type_id, ids in termination_ids.items():
+            model = ContentType.objects.get_for_id(type_id).model_class()
+            for pk, obj in self._load_objects(model, ids).items():
+                objects[(type_id, pk)] = obj
+
+        termination_field = CableTermination._meta.get_field('termination')
+        terminations = []
+        for ct in cable_terminations:
+            cable = self._cables[ct.cable_id]
+            ct.cable = cable
+            self._cable_terminations[cable.pk].append(ct)
+            self._terminations_index[(ct.termination_type_id, ct.termination_id)] = ct
+            if (obj := objects.get((ct.termination_type_id, ct.termination_id))) is not None:
+                termination_field.set_cached_value(ct, obj)
+                if obj.cable_id == cable.pk:
+                    obj.cable = cable
+                terminations.append(obj)
+
+        return terminations
+
+    def load_port_mappings(self, ports):
+        """
+        Load the PortMappings for the given FrontPorts and/or RearPorts, along with the ports on their opposite sides.
+        Returns a list of the mapped ports which were not previously present in the graph.
+        """
+        front_port_ids = {
+            port.pk for port in ports if isinstance(port, FrontPort) and (FrontPort, port.pk) not in self._port_mappings
+        }
+        rear_port_ids = {
+            port.pk for port in ports if isinstance(port, RearPort) and (RearPort, port.pk) not in self._port_mappings
+        }
+        if not front_port_ids and not rear_port_ids:
+            return []
+
+        for pk in front_port_ids:
+            self._port_mappings[(FrontPort, pk)] = []
+        for pk in rear_port_ids:
+            self._port_mappings[(RearPort, pk)] = []
+        mappings = list(
+            PortMapping.objects.filter(
+                Q(front_port__in=front_port_ids) | Q(rear_port__in=rear_port_ids)
+            ).order_by('pk')
+        )
+
+        known = set(self._objects)
+        front_ports = self._load_objects(FrontPort, {m.front_port_id for m in mappings})
+        rear_ports = self._load_objects(RearPort, {m.rear_port_id for m in mappings})
+        new_ports = [
+            obj for key, obj in self._objects.items() if key not in known
+        ]
+
+        for mapping in mappings:
+            mapping.front_port = front_ports[mapping.front_port_id]
+            mapping.rear_port = rear_ports[mapping.rear_port_id]
+            if mapping.front_port_id in front_port_ids:
+                self._port_mappings[(FrontPort, mapping.front_port_id)].append(mapping)
+            if mapping.rear_port_id in rear_port_ids:
+                self._port_mappings[(RearPort, mapping.rear_port_id)].append(mapping)
+
+        return new_ports
+
+    def load_circuits(self, pks):
+        """
+        Load all CircuitTerminations belonging to the specified Circuits. Returns a list of the CircuitTerminations
+        which were not previously present in the graph.
+        """
+        if not (pks := {pk for pk in pks if pk not in self._circuit_terminations}):
+            return []
+
+        for pk in pks:
+            self._circuit_terminations[pk] = []
+        known = set(self._objects)
+        new_terminations = []
+        for obj in self._get_queryset(CircuitTermination).filter(circuit__in=pks).order_by('circuit', 'term_side'):
+            if (CircuitTermination, obj.pk) not in known:
+                new_terminations.append(obj)
+            self._circuit_terminations[obj.circuit_id].append(self._register(obj))
+
+        return new_terminations
+
+    def preload(self, origins):
+        """
+        Load the entire subgraph reachable from the given origins: every cable, port mapping, and circuit which may
+        be traversed when tracing paths from them.
+        """
+        frontier = list(origins)
+        while frontier:
+            terminations = [*frontier, *self.load_cables(getattr(obj, 'cable_id', None) for obj in frontier)]
+            frontier = [
+                *self.load_port_mappings([obj for obj in terminations if isinstance(obj, (FrontPort, RearPort))]),
+                *self.load_circuits(obj.circuit_id for obj in terminations if isinstance(obj, CircuitTermination)),
+            ]
+
+    #
+    # Lookups
+    #
+
+    def get_origins(self, cable_paths):
+        """
+        Return a list of the originating objects of each of the given CablePaths, loading them in bulk. Origins which
+        no longer exist are omitted.
+        """
+        origins = [
+            [decompile_path_node(node) for node in cp.path[0]] for cp in cable_paths
+        ]
+        object_ids = defaultdict(set)
+        for ct_id, object_id in chain(*origins):
+            object_ids[ct_id].add(object_id)
+        objects = {}
+        for ct_id, ids in object_ids.items():
+            model = ContentType.objects.get_for_id(ct_id).model_class()
+            for pk, obj in self._load_objects(model, ids).items():
+                objects[(ct_id, pk)] = obj
+
+        return [
+            [objects[node] for node in nodes if node in objects] for nodes in origins
+        ]
+
+    def get_cable_terminations(self, cable_id):
+        """
+        Return all CableTerminations belonging to the specified Cable, in their natural ordering.
+        """
+        self.load_cables([cable_id])
+        return self._cable_terminations.get(cable_id, [])
+
+    def get_far_cable_terminations(self, terminations):
+        """
+        Return the CableTerminations on the opposite ends of the cables attached to the given terminating objects.
+        Returns None if none of the objects has a CableTermination.
+        """
+        self.load_cables(getattr(t, 'cable_id', None) for t in terminations)
+        termination_type = ContentType.objects.get_for_model(terminations[0])
+        local_cable_terminations = [
+            ct for t in terminations if (ct := self._terminations_index.get((termination_type.pk, t.pk)))
+        ]
+        if not local_cable_terminations:
+            return None
+
+        cable_ends = {
+            (lct.cable_id, 'A' if lct.cable_end == 'B' else 'B')
+            for lct in local_cable_terminations
+        }
+        return sorted(
+            (
+                ct for cable_id in {cable_id for cable_id, _ in cable_ends}
+                for ct in self._cable_terminations[cable_id] if (ct.cable_id, ct.cable_end) in cable_ends
+            ),
+            key=cable_termination_sort_key
+        )
+
+    def get_port_mappings(self, ports, positions=None):
+        """
+        Return the PortMappings for the given FrontPorts or RearPorts, optionally limited to the specified positions
+        on those ports.
+        """
+        self.load_port_mappings(ports)
+        mappings = {}
+        for port in ports:
+            for mapping in self._port_mappings[(port._meta.concrete_model, port.pk)]:
+                if isinstance(port, FrontPort):
+                    port_position = mapping.front_port_position
+                else:
+                    port_position = mapping.rear_port_position
+                if positions is None or port_position in positions:
+                    mappings[mapping.pk] = mapping
+        return [mappings[pk] for pk in sorted(mappings)]
+
+    def get_circuit_peers(self, circuit_terminations):
+        """
+        Return the CircuitTerminations on the opposite sides of the circuits to which the given CircuitTerminations
+        belong.
+        """
+        circuit_ids = {ct.circuit_id for ct in circuit_terminations}
+
+        # Ordering across multiple circuits depends on their providers; defer to the database
+        if len(circuit_ids) > 1:
+            q = Q()
+            for ct in circuit_terminations:
+                q |= Q(circuit=ct.circuit_id, term_side='Z' if ct.term_side == 'A' else 'A')
+            return [self._register(obj) for obj in self._get_queryset(CircuitTermination).filter(q)]
+
+        self.load_circuits(circuit_ids)
+        term_sides = {'Z' if ct.term_side == 'A' else 'A' for ct in circuit_terminations}
+        return [
+            ct for circuit_id in circuit_ids for ct in self._circuit_terminations[circuit_id]
+            if ct.term_side in term_sides
+        ]
+
+
+#
+# Rebuilding
+#
+
+def get_partition_lookup(model, partition_by):
+    """
+    Return the lookup relating an endpoint model to the object by which its CablePaths are partitioned during a
+    rebuild, and the model of that object. Paths may be partitioned by site, or by device (power feeds are partitioned
+    by power panel).
+    """
+    if model is PowerFeed:
+        return ('power_panel__site', Site) if partition_by == 'site' else ('power_panel', PowerPanel)
+    return ('_site', Site) if partition_by == 'site' else ('device', Device)
+
+
+def get_partition(obj, partition_by):
+    """
+    Return the (object type ID, object ID) of the partition to which an endpoint belongs.
+    """
+    lookup, partition_model = get_partition_lookup(type(obj), partition_by)
+    *related, field_name = lookup.split('__')
+    for name in related:
+        obj = getattr(obj, name)
+    return ContentType.objects.get_for_model(partition_model).pk, getattr(obj, f'{field_name}_id')
+
+
+def get_endpoint_filter(model):
+    """
+    Return a Q object matching endpoints which may originate a CablePath: those which are attached to a link, or which
+    reference an existing path.
+    """
+    query = Q(cable__isnull=False) | Q(_path__isnull=False)
+    if hasattr(model, 'wireless_link'):
+        query |= Q(wireless_link__isnull=False)
+    return query
+
+
+def get_partitions(partition_by='site'):
+    """
+    Return a sorted list of the (object type ID, object ID) partitions of all CablePaths.
+    """
+    partitions = set()
+    for model in ENDPOINT_MODELS:
+        lookup, partition_model = get_partition_lookup(model, partition_by)
+        object_type = ContentType.objects.get_for_model(partition_model)
+        partitions.update(
+            (object_type.pk, pk)
+            for pk in model.objects.filter(get_endpoint_filter(model)).values_list(lookup, flat=True).distinct()
+        )
+    return sorted(partitions)
+
+
+def start_rebuild(partition_by='site'):
+    """
+    Prepare to rebuild all CablePaths, one partition (a site or device) at a time. The progress of the rebuild is
+    recorded in a partition table, so that an interrupted rebuild can be resumed.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {REBUILD_PARTITION_TABLE}')
+        cursor.execute(
+            f'CREATE UNLOGGED TABLE {REBUILD_PARTITION_TABLE} ('
+            f'object_type_id integer NOT NULL, object_id bigint NOT NULL, timestamp timestamptz)'
+        )
+        cursor.executemany(
+            f'INSERT INTO {REBUILD_PARTITION_TABLE} (object_type_id, object_id) VALUES (%s, %s)',
+            get_partitions(partition_by)
+        )
+
+
+def get_rebuild_partitions():
+    """
+    Return a list of the (object type ID, object ID) partitions of the current rebuild which have not yet been
+    completed, or None if no rebuild is in progress.
+    """
+    if REBUILD_PARTITION_TABLE not in connection.introspection.table_names():
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT object_type_id, object_id FROM {REBUILD_PARTITION_TABLE} '
+            f'WHERE timestamp IS NULL ORDER BY object_type_id, object_id'
+        )
+        return cursor.fetchall()
+
+
+def rebuild_partition(object_type_id, object_id, dry_run=False):
+    """
+    Retrace all CablePaths originating from endpoints within a partition against a single preloaded CableGraph, and
+    replace the partition's existing paths. Returns a Counter of the number of paths traced.
+
+    If `dry_run` is true, nothing is written. Instead, the traced paths are compared with the existing paths, and the
+    number of paths which are missing or have changed is counted, along with the number of existing paths which would
+    be deleted.
+    """
+    partition = (object_type_id, object_id)
+    partition_model = ContentType.objects.get_for_id(object_type_id).model_class()
+    partition_by = 'site' if partition_model is Site else 'device'
+
+    graph = CableGraph()
+    endpoints = []
+    for model in ENDPOINT_MODELS:
+        lookup, model_partition = get_partition_lookup(model, partition_by)
+        if model_partition is partition_model:
+            endpoints.extend(graph.load(model, Q(**{lookup: object_id}) & get_endpoint_filter(model)))
+    graph.preload(endpoints)
+
+    # Group endpoints by the end of the link to which they are attached. Each group is rebuilt by the partition of
+    # its first member, as its members may belong to different partitions.
+    groups = {}
+    path_ids = set()
+    for obj in endpoints:
+        if obj.cable_id:
+            key = (obj.cable_id, obj.cable_end)
+            if key not in groups:
+                members = [
+                    ct.termination for ct in graph.get_cable_terminations(obj.cable_id)
+                    if ct.cable_end == obj.cable_end and ct.termination is not None
+                ]
+                owner = min(members, key=lambda t: (ContentType.objects.get_for_model(t).pk, t.pk))
+                groups[key] = members if get_partition(owner, partition_by) == partition else []
+        elif getattr(obj, 'wireless_link_id', None):
+            groups[('wireless', obj.pk)] = [obj]
+        elif obj._path_id:
+            # Stale path from a disconnected endpoint
+            path_ids.add(obj._path_id)
+    groups = [members for members in groups.values() if members]
+    path_ids.update(obj._path_id for obj in chain(*groups) if obj._path_id)
+
+    cable_paths = list(chain.from_iterable(trace_cablepaths(members, graph=graph) for members in groups))
+    counts = Counter(paths=len(cable_paths))
+
+    if dry_run:
+        existing_paths = CablePath.objects.in_bulk(path_ids)
+        origin_paths = {object_to_path_node(obj): obj._path_id for obj in chain(*groups)}
+        for cp in cable_paths:
+            existing = existing_paths.pop(origin_paths[cp.path[0][0]], None)
+            if existing is None:
+                counts['missing'] += 1
+            elif (existing.path, existing.is_complete, existing.is_active, existing.is_split) != (
+                cp.path, cp.is_complete, cp.is_active, cp.is_split
+            ):
+                counts['changed'] += 1
+        counts['stale'] = len(existing_paths)
+        return counts
+
+    with transaction.atomic():
+        delete_cablepaths(CablePath.objects.filter(pk__in=path_ids).only('pk'))
+        save_cablepaths(cable_paths)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {REBUILD_PARTITION_TABLE} SET timestamp = %s WHERE object_type_id = %s AND object_id = %s',
+                [timezone.now(), object_type_id, object_id]
+            )
+
+    return counts
+
+
+def finish_rebuild():
+    """
+    Delete any CablePaths not referenced by an endpoint (e.g. those left behind by deleted endpoints), and discard the
+    partition table. Returns the number of paths deleted.
+    """
+    with transaction.atomic():
+        orphans = CablePath.objects.filter(**{
+            f'{relation.name}__isnull': True for relation in CablePath._meta.related_objects
+        }).only('pk')
+        delete_cablepaths(orphans)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {REBUILD_PARTITION_TABLE}')
+
+    return len(orphans)
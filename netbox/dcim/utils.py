@@ -1,8 +1,11 @@
+import hashlib
 from collections import defaultdict
+from itertools import batched, chain
 
 from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
-from django.db import router, transaction
+from django.db import connections, router, transaction
+from django.db.models import Case, Q, Value, When
 
 
 def compile_path_node(ct_id, object_id):
@@ -33,11 +36,12 @@ def path_node_to_object(repr):
     return ct.model_class().objects.filter(pk=object_id).first()
 
 
-def create_cablepaths(objects):
+def trace_cablepaths(objects, graph=None):
     """
-    Create CablePaths for all paths originating from the specified set of nodes.
+    Trace (but do not save) CablePaths for all paths originating from the specified set of nodes.
 
     :param objects: Iterable of cabled objects (e.g. Interfaces)
+    :param graph: A CableGraph to trace against (optional)
     """
     from dcim.models import CablePath
 
@@ -46,9 +50,67 @@ def create_cablepaths(objects):
     for obj in objects:
         origins[obj.cable_connector].append(obj)
 
-    for connector, objects in origins.items():
-        if cp := CablePath.from_origin(objects):
-            cp.save()
+    return [
+        cp for objects in origins.values() if (cp := CablePath.from_origin(objects, graph=graph))
+    ]
+
+
+def create_cablepaths(objects, graph=None):
+    """
+    Create CablePaths for all paths originating from the specified set of nodes.
+
+    :param objects: Iterable of cabled objects (e.g. Interfaces)
+    :param graph: A CableGraph to trace against (optional)
+    """
+    save_cablepaths(trace_cablepaths(objects, graph=graph))
+
+
+def save_cablepaths(cable_paths, batch_size=1000):
+    """
+    Save newly traced CablePaths in bulk, recording a reference to each CablePath on its originating object(s). This
+    is equivalent to calling save() on each CablePath.
+    """
+    from dcim.models import CablePath
+
+    for cp in cable_paths:
+        cp._nodes = list(chain(*cp.path))
+    CablePath.objects.bulk_create(cable_paths, batch_size=batch_size)
+
+    # Group origins by type, mapping each origin's PK to its new CablePath
+    origin_paths = defaultdict(dict)
+    for cp in cable_paths:
+        for node in cp.path[0]:
+            ct_id, object_id = decompile_path_node(node)
+            origin_paths[ct_id][object_id] = cp.pk
+    for ct_id, paths in origin_paths.items():
+        model = ContentType.objects.get_for_id(ct_id).model_class()
+        for batch in batched(paths.items(), batch_size):
+            model.objects.filter(pk__in=[pk for pk, _ in batch]).update(
+                _path=Case(*[When(pk=pk, then=Value(path_id)) for pk, path_id in batch])
+            )
+
+
+def delete_cablepaths(cable_paths):
+    """
+    Delete CablePaths in bulk, clearing all references to them (e.g. from their originating objects). Unlike calling
+    delete() on each CablePath, this sends no signals.
+    """
+    from dcim.models import CablePath
+
+    pks = [cp.pk for cp in cable_paths]
+    for relation in CablePath._meta.related_objects:
+        relation.related_model.objects.filter(**{f'{relation.field.name}__in': pks}).update(
+            **{relation.field.name: None}
+        )
+
+    # With all references cleared, delete the paths with a single statement. QuerySet.delete() would instead fetch
+    # every path in order to send the (global) pre_delete and post_delete signals, which do not apply to this
+    # private model.
+    connection = connections[router.db_for_write(CablePath)]
+    table = connection.ops.quote_name(CablePath._meta.db_table)
+    pk_column = connection.ops.quote_name(CablePath._meta.pk.column)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE {pk_column} = ANY(%s)', [pks])
 
 
 def rebuild_paths(terminations):
@@ -56,14 +118,105 @@ def rebuild_paths(terminations):
     Rebuild all CablePaths which traverse the specified nodes.
     """
     from dcim.models import CablePath
+    from dcim.tracing import CableGraph
+
+    if not terminations:
+        return
 
+    q = Q()
     for obj in terminations:
-        cable_paths = CablePath.objects.filter(_nodes__contains=obj)
+        q |= Q(_nodes__contains=obj)
+
+    with transaction.atomic(using=router.db_for_write(CablePath)):
+        cable_paths = list(CablePath.objects.filter(q))
+        graph = CableGraph()
+        origins = graph.get_origins(cable_paths)
+        delete_cablepaths(cable_paths)
+
+        # Retrace all affected paths against a single preloaded graph
+        graph.preload(chain(*origins))
+        save_cablepaths(list(chain.from_iterable(trace_cablepaths(objects, graph=graph) for objects in origins)))
+
+
+# Related objects included in the display of each object within a rendered cable trace
+TRACE_DISPLAY_FIELDS = {
+    'dcim.device': ('role', 'device_type', 'device_type__manufacturer', 'site', 'location', 'rack'),
+    'circuits.circuit': ('provider', 'type'),
+    'circuits.providernetwork': ('provider',),
+}
+
+
+def get_trace_fingerprint(origin):
+    """
+    Return a fingerprint of the cable trace from the given PathEndpoint, without tracing it. This is a hash of every
+    CablePath traversed by the trace (including the paths of bridged interfaces), and of the last_updated time of each
+    object in those paths, of their parent objects, and of any related objects included in the display of the trace
+    (e.g. a device's role and type, or a circuit's provider). Any change which would alter the trace alters the
+    fingerprint.
+    """
+    from dcim.models import CablePath, Interface
+
+    def get_display_fields(model):
+        fields = TRACE_DISPLAY_FIELDS.get(model._meta.label_lower, ())
+        return fields, [get_related_model(model, name) for name in fields]
+
+    def get_related_model(model, lookup):
+        for name in lookup.split('__'):
+            model = model._meta.get_field(name).related_model
+        return model
 
-        with transaction.atomic(using=router.db_for_write(CablePath)):
-            for cp in cable_paths:
-                cp.delete()
-                create_cablepaths(cp.origins)
+    fingerprint = hashlib.sha256()
+    path_ids = set()
+    path_id = origin._path_id
+    while path_id and path_id not in path_ids:
+        path_ids.add(path_id)
+        cp = CablePath.objects.filter(pk=path_id).values('path', 'is_complete', 'is_active', 'is_split').first()
+        if cp is None:
+            break
+        fingerprint.update(repr((path_id, *cp.values())).encode())
+
+        # Record the last_updated time of each object in the path, of its parent, and of any related display objects
+        object_ids = defaultdict(set)
+        for node in chain(*cp['path']):
+            ct_id, object_id = decompile_path_node(node)
+            object_ids[ct_id].add(object_id)
+        parent_ids = defaultdict(set)
+        related_ids = defaultdict(set)
+        bridge_id = None
+        for ct_id, ids in object_ids.items():
+            model = ContentType.objects.get_for_id(ct_id).model_class()
+            field_names = {field.name for field in model._meta.concrete_fields}
+            parent_fields = [name for name in ('device', 'circuit', 'power_panel') if name in field_names]
+            display_fields, display_models = get_display_fields(model)
+            fields = ['pk', 'last_updated', *[f'{name}_id' for name in parent_fields], *display_fields]
+            if model is Interface:
+                fields.append('bridge_id')
+            for values in model.objects.filter(pk__in=ids).order_by('pk').values(*fields):
+                fingerprint.update(repr((ct_id, *values.values())).encode())
+                for name in parent_fields:
+                    parent_model = model._meta.get_field(name).related_model
+                    parent_ids[parent_model].add(values[f'{name}_id'])
+                for name, related_model in zip(display_fields, display_models):
+                    related_ids[related_model].add(values[name])
+                if cp['is_complete'] and cp['path'][-1] == [compile_path_node(ct_id, values['pk'])]:
+                    bridge_id = values.get('bridge_id')
+        for model, ids in parent_ids.items():
+            display_fields, display_models = get_display_fields(model)
+            for values in model.objects.filter(pk__in=ids).order_by('pk').values('pk', 'last_updated', *display_fields):
+                fingerprint.update(repr((model._meta.label, *values.values())).encode())
+                for name, related_model in zip(display_fields, display_models):
+                    related_ids[related_model].add(values[name])
+        for model, ids in related_ids.items():
+            ids.discard(None)
+            for values in model.objects.filter(pk__in=ids).order_by('pk').values_list('pk', 'last_updated'):
+                fingerprint.update(repr((model._meta.label, *values)).encode())
+
+        # Follow a bridged interface (if any) to its own path
+        path_id = None
+        if bridge_id:
+            path_id = Interface.objects.filter(pk=bridge_id).values_list('_path_id', flat=True).first()
+
+    return fingerprint.hexdigest()
 
 
 def update_interface_bridges(device, interface_templates, module=None):
@@ -73,16 +226,25 @@ def update_interface_bridges(device, interface_templates, module=None):
     """
     Interface = apps.get_model('dcim', 'Interface')
 
-    for interface_template in interface_templates.exclude(bridge=None):
-        interface = Interface.objects.get(device=device, name=interface_template.resolve_name(module=module))
+    # Map the resolved name of each bridged interface to that of its bridge
+    bridges = {
+        interface_template.resolve_name(module=module): interface_template.bridge.resolve_name(module=module)
+        for interface_template in interface_templates.exclude(bridge=None).select_related('bridge')
+    }
+    if not bridges:
+        return
 
-        if interface_template.bridge:
-            interface.bridge = Interface.objects.get(
-                device=device,
-                name=interface_template.bridge.resolve_name(module=module)
-            )
-            interface.full_clean()
-            interface.save()
+    # Retrieve all bridged & bridge interfaces in a single query
+    interfaces = {
+        interface.name: interface
+        for interface in Interface.objects.filter(device=device, name__in={*bridges.keys(), *bridges.values()})
+    }
+
+    for name, bridge_name in bridges.items():
+        interface = interfaces[name]
+        interface.bridge = interfaces[bridge_name]
+        interface.full_clean()
+        interface.save()
 
 
 def create_port_mappings(device, device_or_module_type, module=None):
@@ -116,3 +278,19 @@ def create_port_mappings(device, device_or_module_type, module=None):
             )
         )
     PortMapping.objects.bulk_create(mappings)
+
+
+def get_contiguous_space(occupied, size, length):
+    """
+    Given a bitmap of occupied slots within a space of the given size, return a bitmap in which bit n is set if the
+    `length` contiguous slots beginning at slot n are all free. For example, with a rack's half-unit occupancy (see
+    RackQuerySet.get_occupancy()), a length of 2 * u_height yields each position at which a device will fit.
+    """
+    free = ~occupied & ((1 << size) - 1)
+    # Repeatedly AND the bitmap with itself shifted by the run length found so far, doubling it at each step
+    run = 1
+    while run < length:
+        step = min(run, length - run)
+        free &= free >> step
+        run += step
+    return free
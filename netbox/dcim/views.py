@@ -43,6 +43,7 @@ from .choices import DeviceFaceChoices, InterfaceModeChoices
 from .models import *
 from .models.device_components import PortMapping
 from .object_actions import BulkAddComponents, BulkDisconnect
+from .svg import render_rack_elevations
 from .ui import panels
 
 CABLE_TERMINATION_TYPES = {
@@ -936,7 +937,7 @@ class RackTypeBulkDeleteView(generic.BulkDeleteView):
 
 @register_model_view(Rack, 'list', path='', detail=False)
 class RackListView(generic.ObjectListView):
-    queryset = Rack.objects.annotate(
+    queryset = Rack.objects.annotate_utilization().annotate(
         device_count=count_related(Device, 'rack')
     )
     filterset = filtersets.RackFilterSet
@@ -984,9 +985,18 @@ class RackElevationListView(generic.ObjectListView):
         if rack_face not in DeviceFaceChoices.values():
             rack_face = DeviceFaceChoices.FACE_FRONT
 
+        # Render the elevations of all racks on the page in bulk
+        elevations = render_rack_elevations(
+            page.object_list,
+            face=rack_face,
+            user=request.user,
+            base_url=request.build_absolute_uri('/')
+        )
+
         return render(request, 'dcim/rack_elevation_list.html', {
             'paginator': paginator,
             'page': page,
+            'elevations': elevations,
             'total_count': total_count,
             'sort': sort,
             'sort_display_name': ORDERING_CHOICES[sort],
@@ -1112,7 +1122,7 @@ class RackBulkImportView(generic.BulkImportView):
 
 @register_model_view(Rack, 'bulk_edit', path='edit', detail=False)
 class RackBulkEditView(generic.BulkEditView):
-    queryset = Rack.objects.all()
+    queryset = Rack.objects.annotate_utilization()
     filterset = filtersets.RackFilterSet
     table = tables.RackTable
     form = forms.RackBulkEditForm
@@ -1126,7 +1136,7 @@ class RackBulkRenameView(generic.BulkRenameView):
 
 @register_model_view(Rack, 'bulk_delete', path='delete', detail=False)
 class RackBulkDeleteView(generic.BulkDeleteView):
-    queryset = Rack.objects.all()
+    queryset = Rack.objects.annotate_utilization()
     filterset = filtersets.RackFilterSet
     table = tables.RackTable
 
@@ -1,11 +1,16 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from jinja2.exceptions import TemplateError
 from rest_framework.decorators import action
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from rest_framework.status import HTTP_400_BAD_REQUEST
+from rest_framework.status import HTTP_202_ACCEPTED, HTTP_400_BAD_REQUEST
 
+from core.api.serializers import JobSerializer
 from netbox.api.authentication import TokenWritePermission
 from netbox.api.renderers import TextRenderer
+from ..jobs import RenderConfigTemplatesJob
+from ..utils import render_config_templates, rendered_configs_to_ndjson, rendered_configs_to_tar
 from .serializers import ConfigTemplateSerializer
 
 __all__ = (
@@ -28,13 +33,14 @@ class ConfigContextQuerySetMixin:
         If the `brief` query param equates to True or the `exclude` query param
         includes `config_context` as a value, return the base queryset.
 
-        Else, return the queryset annotated with config context data
+        Else, return the queryset annotated with config context data. If config contexts are materialized, each object's
+        stored context is used, and the data is computed only for objects whose context has not yet been materialized.
         """
         queryset = super().get_queryset()
         request = self.get_serializer_context()['request']
         if self.brief or 'config_context' in request.query_params.get('exclude', []):
             return queryset
-        return queryset.annotate_config_context_data()
+        return queryset.annotate_config_context_data(materialized=settings.MATERIALIZE_CONFIG_CONTEXTS)
 
 
 class ConfigTemplateRenderMixin:
@@ -67,11 +73,43 @@ class RenderConfigMixin(ConfigTemplateRenderMixin):
     """
 
     def get_permissions(self):
-        # For render_config action, check only token write ability (not model permissions)
-        if self.action == 'render_config':
+        # For render_config actions, check only token write ability (not model permissions)
+        if self.action in ('render_config', 'render_configs'):
             return [TokenWritePermission()]
         return super().get_permissions()
 
+    @action(detail=False, methods=['post'], url_path='render-config', url_name='render-configs')
+    def render_configs(self, request):
+        """
+        Resolve and render the preferred ConfigTemplate for all objects matching the specified filters. Results are
+        streamed as newline-delimited JSON, or as a tar archive if `output=tar` is specified. If `background=true` is
+        specified, rendering is performed by a background job, which saves the archive to storage.
+        """
+        # Enforce the render_config & view actions
+        queryset = self.queryset.model.objects.restrict(request.user, 'render_config').restrict(request.user, 'view')
+        queryset = self.filter_queryset(queryset)
+        control_params = ('output', 'background')
+
+        if request.query_params.get('background', '').lower() == 'true':
+            job = RenderConfigTemplatesJob.enqueue(
+                user=request.user,
+                model=queryset.model._meta.label_lower,
+                filters={
+                    k: v for k, v in request.query_params.lists() if k not in control_params
+                },
+                context=request.data
+            )
+            serializer = JobSerializer(job, context={'request': request})
+            return Response(serializer.data, status=HTTP_202_ACCEPTED)
+
+        results = render_config_templates(queryset, context=request.data)
+        if request.query_params.get('output') == 'tar':
+            response = StreamingHttpResponse(rendered_configs_to_tar(results), content_type='application/x-tar')
+            response['Content-Disposition'] = 'attachment; filename="configs.tar"'
+            return response
+
+        return StreamingHttpResponse(rendered_configs_to_ndjson(results), content_type='application/x-ndjson')
+
     @action(detail=True, methods=['post'], url_path='render-config', renderer_classes=[JSONRenderer, TextRenderer])
     def render_config(self, request, pk):
         """
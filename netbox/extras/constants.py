@@ -3,6 +3,7 @@ from extras.choices import LogLevelChoices
 
 # Custom fields
 CUSTOMFIELD_EMPTY_VALUES = (None, '', [])
+CUSTOMFIELD_INDEX_PREFIX = 'nb_cf'
 
 # ImageAttachment
 IMAGE_ATTACHMENT_IMAGE_FORMATS = {
@@ -110,10 +110,17 @@ def enqueue_event(queue, instance, request, event_type):
         queue[key]['data'] = serialize_for_event(instance)
 
 
-def process_event_rules(event_rules, object_type, event):
+def process_event_rules(event_rules, object_type, event, webhook_batches=None):
     """
     Process a list of EventRules against an event.
+
+    Events destined for webhooks which have batched delivery enabled are appended to `webhook_batches` (a mapping of
+    Webhook PK to a list of events) for later coalescing by enqueue_webhook_batches(). If no mapping is provided,
+    batched webhooks are enqueued before returning.
     """
+    flush_batches = webhook_batches is None
+    if flush_batches:
+        webhook_batches = defaultdict(list)
 
     for event_rule in event_rules:
 
@@ -122,15 +129,14 @@ def process_event_rules(event_rules, object_type, event):
             continue
 
         # Compile event data
-        event_data = event_rule.action_data or {}
+        event_data = {**(event_rule.action_data or {})}
         event_data.update(event['data'])
 
         # Webhooks
         if event_rule.action_type == EventRuleActionChoices.WEBHOOK:
 
             # Select the appropriate RQ queue
-            queue_name = get_config().QUEUE_MAPPINGS.get('webhook', RQ_QUEUE_DEFAULT)
-            rq_queue = get_queue(queue_name)
+            rq_queue = get_webhook_queue()
 
             # Compile the task parameters
             params = {
@@ -148,6 +154,11 @@ def process_event_rules(event_rules, object_type, event):
                 # which can cause pickle errors with Pillow.
                 params['request'] = copy_safe_request(event['request'], include_files=False)
 
+            # Defer batched webhooks to be coalesced with other events for the same endpoint
+            if event_rule.action_object.batch_size:
+                webhook_batches[event_rule.action_object_id].append(params)
+                continue
+
             # Enqueue the task
             rq_queue.enqueue('extras.webhooks.send_webhook', **params)
 
@@ -187,6 +198,43 @@ def process_event_rules(event_rules, object_type, event):
                 action_type=event_rule.action_type
             ))
 
+    if flush_batches:
+        enqueue_webhook_batches(webhook_batches)
+
+
+def get_webhook_queue():
+    """
+    Return the RQ queue to which webhook deliveries are dispatched.
+    """
+    queue_name = get_config().QUEUE_MAPPINGS.get('webhook', RQ_QUEUE_DEFAULT)
+    return get_queue(queue_name)
+
+
+def enqueue_webhook_batches(webhook_batches):
+    """
+    Enqueue a single delivery task for each batch of up to `batch_size` events per webhook.
+    """
+    if not webhook_batches:
+        return
+    rq_queue = get_webhook_queue()
+    timestamp = timezone.now().isoformat()
+
+    for events in webhook_batches.values():
+        webhook = events[0]['event_rule'].action_object
+        batch_size = webhook.batch_size
+        for i in range(0, len(events), batch_size):
+            batch = [
+                {k: v for k, v in event.items() if k not in ('event_rule', 'retry')}
+                for event in events[i:i + batch_size]
+            ]
+            rq_queue.enqueue(
+                'extras.webhooks.send_webhook_batch',
+                webhook=webhook,
+                events=batch,
+                timestamp=timestamp,
+                retry=get_rq_retry()
+            )
+
 
 def process_event_queue(events):
     """
@@ -195,6 +243,7 @@ def process_event_queue(events):
     This is the default processor listed in EVENTS_PIPELINE.
     """
     events_cache = defaultdict(dict)
+    webhook_batches = defaultdict(list)
 
     for event in events:
         event_type = event['event_type']
@@ -213,8 +262,12 @@ def process_event_queue(events):
             event_rules=event_rules,
             object_type=object_type,
             event=event,
+            webhook_batches=webhook_batches,
         )
 
+    # Enqueue any coalesced webhook deliveries
+    enqueue_webhook_batches(webhook_batches)
+
 
 def flush_events(events):
     """
@@ -267,8 +267,13 @@ class WebhookBulkEditForm(OwnerMixin, NetBoxModelBulkEditForm):
         required=False,
         label=_('CA file path')
     )
+    batch_size = forms.IntegerField(
+        required=False,
+        min_value=1,
+        label=_('Batch size')
+    )
 
-    nullable_fields = ('secret', 'ca_file_path')
+    nullable_fields = ('secret', 'ca_file_path', 'batch_size')
 
 
 class EventRuleBulkEditForm(OwnerMixin, NetBoxModelBulkEditForm):
@@ -444,6 +444,7 @@ class WebhookForm(OwnerMixin, NetBoxModelForm):
             name=_('HTTP Request')
         ),
         FieldSet('ssl_verification', 'ca_file_path', name=_('SSL')),
+        FieldSet('batch_size', name=_('Delivery')),
     )
 
     class Meta:
@@ -1,19 +1,29 @@
 import logging
+import tempfile
 import traceback
 from contextlib import ExitStack
 
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils.datastructures import MultiValueDict
 from django.db import router, transaction
 from django.db import DEFAULT_DB_ALIAS
 from django.utils.translation import gettext as _
 
+from core.choices import JobIntervalChoices
 from core.signals import clear_events
 from dcim.models import Device
-from extras.models import Script as ScriptModel
+from extras.models import CustomField, Script as ScriptModel
 from netbox.context_managers import event_tracking
-from netbox.jobs import JobRunner
+from netbox.jobs import JobRunner, system_job
+from netbox.metrics import Metrics
 from netbox.registry import registry
+from netbox.search.backends import search_backend
 from utilities.exceptions import AbortScript, AbortTransaction
-from .utils import is_report
+from virtualization.models import VirtualMachine
+from .utils import is_report, render_config_templates, rendered_configs_to_tar
 
 
 class ScriptJob(JobRunner):
@@ -133,3 +143,109 @@ class ScriptJob(JobRunner):
                     continue
                 stack.enter_context(request_processor(request))
             self.run_script(script, request, data, commit)
+
+
+@system_job(interval=JobIntervalChoices.INTERVAL_HOURLY)
+class MaterializeConfigContextsJob(JobRunner):
+    """
+    Compute and store the merged config context for all devices and virtual machines which do not have one (e.g.
+    because it has been invalidated by a change to a ConfigContext).
+    """
+
+    class Meta:
+        name = 'Config Context Materialization'
+
+    def run(self, *args, **kwargs):
+        if not settings.MATERIALIZE_CONFIG_CONTEXTS:
+            self.logger.info("MATERIALIZE_CONFIG_CONTEXTS is disabled; skipping")
+            return
+
+        for model in (Device, VirtualMachine):
+            self.logger.debug(f"Materializing config contexts for {model._meta.verbose_name_plural}")
+            count = model.objects.materialize_config_context()
+            self.logger.info(f"Materialized config contexts for {count} {model._meta.verbose_name_plural}")
+
+
+@system_job(interval=JobIntervalChoices.INTERVAL_DAILY)
+class SyncCustomFieldIndexesJob(JobRunner):
+    """
+    Create and drop the database indexes which support filtering on custom field data, to reflect the current set of
+    custom fields. If INDEX_CUSTOM_FIELDS is disabled, all such indexes are dropped.
+    """
+
+    class Meta:
+        name = 'Custom Field Index Synchronization'
+
+    def run(self, *args, **kwargs):
+        CustomField.objects.sync_indexes(logger=self.logger)
+
+
+@system_job(interval=JobIntervalChoices.INTERVAL_HOURLY)
+class SearchCacheUpdateJob(JobRunner):
+    """
+    Update the cached search values of all objects which have been modified or deleted since the last run. This job is
+    scheduled automatically when SEARCH_CACHE_DELAY is set; the hourly schedule serves to catch any missed updates.
+    """
+
+    class Meta:
+        name = 'Search Cache Update'
+
+    def run(self, *args, **kwargs):
+        # Determine the age of the oldest pending update (i.e. how stale the cache has become) before processing
+        staleness = search_backend.get_staleness()
+
+        count = search_backend.update_deferred()
+        self.logger.info(f"Updated cached values for {count} objects")
+
+        if settings.METRICS_ENABLED and settings.SEARCH_CACHE_DELAY is not None:
+            Metrics.get_instance().search_cache_staleness.set(staleness)
+
+
+class RenderConfigTemplatesJob(JobRunner):
+    """
+    Render the assigned ConfigTemplates for all matching devices or virtual machines, and save the output as a tar
+    archive in the default storage backend.
+    """
+
+    class Meta:
+        name = 'Render Config Templates'
+
+    def run(self, model, filters=None, context=None, *args, **kwargs):
+        """
+        Args:
+            model: The label of the model for which to render configs (e.g. "dcim.device")
+            filters: A dictionary mapping filterset parameters to lists of values, used to select objects
+            context: Additional context data to pass to each template
+        """
+        model = apps.get_model(model)
+        queryset = model.objects.restrict(self.job.user, 'render_config').restrict(self.job.user, 'view')
+        if filters:
+            filterset = registry['filtersets'][model._meta.label_lower]
+            queryset = filterset(MultiValueDict(filters), queryset).qs
+
+        errors = {}
+        rendered_count = 0
+
+        def _track(results):
+            nonlocal rendered_count
+            for result in results:
+                instance, __, __, error = result
+                if error:
+                    errors[instance.pk] = error
+                    self.logger.warning(f"Failed to render config for {instance}: {error}")
+                else:
+                    rendered_count += 1
+                yield result
+
+        with tempfile.TemporaryFile() as archive:
+            for chunk in rendered_configs_to_tar(_track(render_config_templates(queryset, context))):
+                archive.write(chunk)
+            archive.seek(0)
+            path = default_storage.save(f'{self.job.storage_path}rendered-configs.tar', File(archive))
+
+        self.logger.info(f"Rendered {rendered_count} configs ({len(errors)} errors) to {path}")
+        self.job.data = {
+            'file': path,
+            'rendered': rendered_count,
+            'errors': errors,
+        }
@@ -1,9 +1,19 @@
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
 from django.utils.translation import gettext as _
 
+from core.models import ObjectType
 from netbox.registry import registry
-from netbox.search.backends import search_backend
+from netbox.search.backends import REINDEX_PARTITION_SIZE, CachedValueSearchBackend, search_backend
+
+
+def cache_partition(partition):
+    return partition, search_backend.cache_partition(*partition)
 
 
 class Command(BaseCommand):
@@ -21,6 +31,23 @@ class Command(BaseCommand):
             action='store_true',
             help="For each model, reindex objects only if no cache entries already exist"
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help="The number of worker processes to use for indexing objects"
+        )
+        parser.add_argument(
+            '--partition-size',
+            type=int,
+            default=REINDEX_PARTITION_SIZE,
+            help="The number of objects to index per partition (default: %(default)s)"
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help="Resume an interrupted reindex"
+        )
 
     def _get_indexers(self, *model_names):
         indexers = {}
@@ -60,6 +87,85 @@ class Command(BaseCommand):
         return indexers
 
     def handle(self, *model_labels, **kwargs):
+        if not isinstance(search_backend, CachedValueSearchBackend):
+            if kwargs['resume']:
+                raise CommandError(_("The configured search backend does not support resuming a reindex."))
+            return self._reindex(*model_labels, **kwargs)
+
+        if kwargs['resume']:
+            partitions = search_backend.get_reindex_partitions()
+            if partitions is None:
+                raise CommandError(_("No interrupted reindex found."))
+            self.stdout.write(f'Resuming reindex ({len(partitions)} partitions remaining).')
+
+        else:
+            # Determine which models to reindex
+            indexers = self._get_indexers(*model_labels)
+            if not indexers:
+                raise CommandError(_("No indexers found!"))
+            self.stdout.write(f'Reindexing {len(indexers)} models.')
+
+            models = []
+            for model in indexers.keys():
+                if kwargs['lazy']:
+                    content_type = ContentType.objects.get_for_model(model)
+                    if cached_count := search_backend.count(object_types=[content_type]):
+                        self.stdout.write(
+                            f'  {model._meta.app_label}.{model._meta.model_name}: '
+                            f'Skipping (found {cached_count} existing).'
+                        )
+                        continue
+                models.append(model)
+
+            search_backend.start_reindex(models, partition_size=kwargs['partition_size'])
+            partitions = search_backend.get_reindex_partitions()
+
+        # Index models
+        self.stdout.write(f'Indexing {len(partitions)} partitions')
+        remaining = Counter(object_type_id for object_type_id, _start, _end in partitions)
+        counts = Counter()
+        for (object_type_id, _start, _end), count in self._cache_partitions(partitions, kwargs['workers']):
+            counts[object_type_id] += count
+            remaining[object_type_id] -= 1
+            if not remaining[object_type_id]:
+                model = ObjectType.objects.get_for_id(object_type_id).model_class()
+                if i := counts[object_type_id]:
+                    msg = f'{i} entries cached.'
+                else:
+                    msg = 'No objects found.'
+                self.stdout.write(f'  {model._meta.app_label}.{model._meta.model_name}... {msg}')
+
+        # Replace the existing cached values
+        self.stdout.write('Replacing cached values... ', ending='')
+        self.stdout.flush()
+        cached_count = search_backend.finish_reindex()
+        self.stdout.write(f'{cached_count} entries cached.')
+
+        msg = 'Completed.'
+        if total_count := search_backend.size:
+            msg += f' Total entries: {total_count}'
+        self.stdout.write(msg, self.style.SUCCESS)
+
+    def _cache_partitions(self, partitions, workers):
+        """
+        Cache each partition, yielding the partition and the number of cached values as each one completes.
+        """
+        if workers < 2:
+            for partition in partitions:
+                yield cache_partition(partition)
+            return
+
+        # Close all database connections before forking, so that each worker opens its own
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as executor:
+            futures = [executor.submit(cache_partition, partition) for partition in partitions]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def _reindex(self, *model_labels, **kwargs):
+        """
+        Reindex objects serially using the search backend's cache() method.
+        """
 
         # Determine which models to reindex
         indexers = self._get_indexers(*model_labels)
@@ -93,7 +199,7 @@ class Command(BaseCommand):
                     self.stdout.write(f'Skipping (found {cached_count} existing).')
                     continue
 
-            i = search_backend.cache(model.objects.iterator(), remove_existing=False)
+            i = search_backend.cache(idx.get_queryset().iterator(), remove_existing=False)
             if i:
                 self.stdout.write(f'{i} entries cached.')
             else:
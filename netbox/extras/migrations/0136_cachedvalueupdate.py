@@ -0,0 +1,33 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('extras', '0135_webhook_batch_size'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CachedValueUpdate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+                ('object_id', models.PositiveBigIntegerField()),
+                (
+                    'object_type',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+',
+                        to='contenttypes.contenttype'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'cached value update',
+                'verbose_name_plural': 'cached value updates',
+                'ordering': ('pk',),
+            },
+        ),
+    ]
@@ -229,6 +229,10 @@ class ConfigContextModel(models.Model):
     class Meta:
         abstract = True
 
+    def serialize_object(self, exclude=None):
+        exclude = [*(exclude or []), '_config_context']
+        return super().serialize_object(exclude=exclude)
+
     def get_config_context(self):
         """
         Compile all config data, overwriting lower-weight values with higher-weight values where a collision occurs.
@@ -236,12 +240,15 @@ class ConfigContextModel(models.Model):
         """
         data = {}
 
-        if not hasattr(self, 'config_context_data'):
-            # The annotation is not available, so we fall back to manually querying for the config context objects
-            config_context_data = ConfigContext.objects.get_for_object(self, aggregate_data=True) or []
-        else:
+        if hasattr(self, 'config_context_data'):
             # The attribute may exist, but the annotated value could be None if there is no config context data
             config_context_data = self.config_context_data or []
+        elif settings.MATERIALIZE_CONFIG_CONTEXTS and getattr(self, '_config_context', None) is not None:
+            # Use the materialized config context
+            config_context_data = [self._config_context]
+        else:
+            # The annotation is not available, so we fall back to manually querying for the config context objects
+            config_context_data = ConfigContext.objects.get_for_object(self, aggregate_data=True) or []
 
         for context in config_context_data:
             data = deepmerge(data, context)
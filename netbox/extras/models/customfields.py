@@ -1,6 +1,7 @@
 import decimal
 import json
 import re
+from collections import defaultdict
 from datetime import datetime, date
 
 import django_filters
@@ -8,7 +9,8 @@ from django import forms
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
 from django.core.validators import RegexValidator, ValidationError
-from django.db import models
+from django.db import connection, models
+from django.db.backends.utils import names_digest
 from django.db.models import F, Func, Value
 from django.db.models.expressions import RawSQL
 from django.urls import reverse
@@ -18,6 +20,7 @@ from django.utils.translation import gettext_lazy as _
 
 from core.models import ObjectType
 from extras.choices import *
+from extras.constants import CUSTOMFIELD_INDEX_PREFIX
 from extras.data import CHOICE_SETS
 from netbox.context import query_cache
 from netbox.models import ChangeLoggedModel
@@ -83,6 +86,98 @@ class CustomFieldManager(models.Manager.from_queryset(RestrictedQuerySet)):
             cf.name: cf.default for cf in custom_fields
         }
 
+    def get_indexes(self):
+        """
+        Return a dictionary mapping the name of each database index required to support filtering on custom field
+        data to a tuple of the model and CustomField.
+        """
+        indexes = {}
+        for custom_field in self.prefetch_related('object_types'):
+            if custom_field.index_type is None:
+                continue
+            for object_type in custom_field.object_types.all():
+                if (model := object_type.model_class()) is None:
+                    continue
+                indexes[custom_field.get_index_name(model)] = (model, custom_field)
+        return indexes
+
+    def sync_indexes(self, logger=None):
+        """
+        Create any missing custom field indexes, and drop any which are no longer required (or which are invalid,
+        e.g. as the result of an interrupted concurrent build). Indexes are created and dropped concurrently unless
+        running inside a transaction.
+        """
+        indexes = self.get_indexes() if settings.INDEX_CUSTOM_FIELDS else {}
+        concurrently = not connection.in_atomic_block
+
+        # Retrieve all existing custom field indexes
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname, i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE n.nspname = current_schema() AND starts_with(c.relname, %s)",
+                [f'{CUSTOMFIELD_INDEX_PREFIX}_']
+            )
+            existing = dict(cursor.fetchall())
+
+        with connection.schema_editor(atomic=False) as schema_editor:
+            for name, valid in existing.items():
+                if name not in indexes or not valid:
+                    if logger:
+                        logger.info(f"Dropping index {name}")
+                    schema_editor.execute(
+                        f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS "
+                        f"{schema_editor.quote_name(name)}"
+                    )
+            for name, (model, custom_field) in indexes.items():
+                if not existing.get(name):
+                    if logger:
+                        logger.info(f"Creating index {name} on {model._meta.db_table}")
+                    schema_editor.execute(
+                        custom_field.get_index_sql(model, schema_editor, concurrently=concurrently)
+                    )
+
+    def prefetch_objects(self, instances, custom_fields=None):
+        """
+        Retrieve all objects referenced by the object and multi-object custom fields of the given instances, using
+        one query per related model. The objects are stored in the request cache, so that the custom field values
+        can subsequently be deserialized without further queries. (This has no effect outside a request context.)
+
+        Args:
+            instances: A list of objects of the same model
+            custom_fields: The CustomFields to consider (defaults to all CustomFields assigned to the model)
+        """
+        cache = query_cache.get()
+        if cache is None or not instances:
+            return
+        if custom_fields is None:
+            custom_fields = self.get_for_model(instances[0])
+
+        # Collect the PKs of all referenced objects, grouped by model
+        pks = defaultdict(set)
+        for cf in custom_fields:
+            if cf.type not in (CustomFieldTypeChoices.TYPE_OBJECT, CustomFieldTypeChoices.TYPE_MULTIOBJECT):
+                continue
+            if (model := cf.related_object_type.model_class()) is None:
+                continue
+            for instance in instances:
+                value = instance.custom_field_data.get(cf.name)
+                if cf.type == CustomFieldTypeChoices.TYPE_OBJECT:
+                    value = [value]
+                if isinstance(value, list):
+                    pks[model].update(pk for pk in value if type(pk) is int)
+
+        # Retrieve the objects for each model, recording the position of each to preserve the model's ordering.
+        # Referenced objects which no longer exist are cached as None.
+        for model, model_pks in pks.items():
+            objects = cache['custom_field_objects'].setdefault(model, {})
+            if model_pks := model_pks.difference(objects):
+                for obj in model.objects.filter(pk__in=model_pks):
+                    objects[obj.pk] = (len(objects), obj)
+                for pk in model_pks.difference(objects):
+                    objects[pk] = (len(objects), None)
+
 
 class CustomField(CloningMixin, ExportTemplatesMixin, OwnerMixin, ChangeLoggedModel):
     object_types = models.ManyToManyField(
@@ -296,6 +391,54 @@ class CustomField(CloningMixin, ExportTemplatesMixin, OwnerMixin, ChangeLoggedMo
             self._choice_map = dict(self.choices)
         return self._choice_map.get(value, value)
 
+    @property
+    def index_type(self):
+        """
+        Return the type of database index (if any) which supports filtering on this field: a B-tree index for
+        exact and range matching of scalar values, a hash index for exact matching of text values (which may
+        exceed the maximum size of a B-tree index entry), or a GIN index for containment matching of arrays.
+        """
+        if self.filter_logic == CustomFieldFilterLogicChoices.FILTER_DISABLED and not self.unique:
+            return None
+        if self.type in (
+            CustomFieldTypeChoices.TYPE_TEXT,
+            CustomFieldTypeChoices.TYPE_LONGTEXT,
+            CustomFieldTypeChoices.TYPE_URL,
+        ):
+            # Loose matching (icontains) cannot make use of an index
+            if self.filter_logic == CustomFieldFilterLogicChoices.FILTER_LOOSE and not self.unique:
+                return None
+            return 'hash'
+        if self.type in (
+            CustomFieldTypeChoices.TYPE_MULTISELECT,
+            CustomFieldTypeChoices.TYPE_MULTIOBJECT,
+        ):
+            return 'gin'
+        if self.type == CustomFieldTypeChoices.TYPE_JSON:
+            return None
+        return 'btree'
+
+    def get_index_name(self, model):
+        """
+        Return the name of the index on this field's values for the given model. The name is derived from the
+        field's definition, so that any change to it results in a new index.
+        """
+        digest = names_digest(model._meta.db_table, self.name, self.index_type, length=8)
+        return f'{CUSTOMFIELD_INDEX_PREFIX}_{self.pk}_{digest}'
+
+    def get_index_sql(self, model, schema_editor, concurrently=False):
+        """
+        Return the SQL statement to create an index on this field's values for the given model. The indexed
+        expression matches that generated for custom field lookups (e.g. `custom_field_data__<name>`).
+        """
+        opclass = ' jsonb_path_ops' if self.index_type == 'gin' else ''
+        return (
+            f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}"
+            f"{schema_editor.quote_name(self.get_index_name(model))} "
+            f"ON {schema_editor.quote_name(model._meta.db_table)} USING {self.index_type} "
+            f"((custom_field_data -> {schema_editor.quote_value(self.name)}){opclass})"
+        )
+
     def populate_initial_data(self, content_types):
         """
         Populate initial custom field data upon either a) the creation of a new CustomField, or
@@ -457,12 +600,29 @@ class CustomField(CloningMixin, ExportTemplatesMixin, OwnerMixin, ChangeLoggedMo
                 return value
         if self.type == CustomFieldTypeChoices.TYPE_OBJECT:
             model = self.related_object_type.model_class()
+            # Check the request cache for prefetched objects before hitting the database
+            if (objects := self._get_cached_objects(model)) and type(value) is int and value in objects:
+                return objects[value][1]
             return model.objects.filter(pk=value).first()
         if self.type == CustomFieldTypeChoices.TYPE_MULTIOBJECT:
             model = self.related_object_type.model_class()
-            return model.objects.filter(pk__in=value)
+            queryset = model.objects.filter(pk__in=value)
+            objects = self._get_cached_objects(model)
+            if objects and isinstance(value, list) and all(type(pk) is int and pk in objects for pk in value):
+                # Populate the QuerySet's result cache with the prefetched objects
+                queryset._result_cache = [obj for _, obj in sorted(objects[pk] for pk in set(value)) if obj]
+                queryset._prefetch_done = True
+            return queryset
         return value
 
+    @staticmethod
+    def _get_cached_objects(model):
+        """
+        Return any objects of the given model prefetched by CustomFieldManager.prefetch_objects(), keyed by PK.
+        """
+        if (cache := query_cache.get()) is not None:
+            return cache['custom_field_objects'].get(model)
+
     def to_form_field(
         self,
         set_initial=True,
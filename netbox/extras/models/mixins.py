@@ -1,17 +1,21 @@
 import importlib.abc
 import importlib.util
+import itertools
 import os
 import sys
+import tempfile
 
-from django.core.files.storage import storages
+from django.core.files import File
+from django.core.files.storage import default_storage, storages
 from django.db import models
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
 
 from extras.constants import DEFAULT_MIME_TYPE, JINJA_ENV_PARAMS_WITH_PATH_IMPORT
 from extras.utils import filename_from_model, filename_from_object
-from utilities.jinja2 import render_jinja2
+from utilities.jinja2 import get_jinja2_template, render_jinja2
+from utilities.querysets import iterate_in_chunks
 
 __all__ = (
     'PythonModuleMixin',
@@ -148,23 +152,74 @@ class RenderTemplateMixin(models.Model):
 
         return output
 
+    def render_stream(self, context=None, queryset=None, buffer_size=65536):
+        """
+        Render the template incrementally, yielding the output in chunks of approximately buffer_size characters. Any
+        provided queryset is retrieved from the database in chunks as it is iterated by the template.
+        """
+        if queryset is not None:
+            queryset = iterate_in_chunks(queryset)
+        context = self.get_context(context=context, queryset=queryset)
+        template = get_jinja2_template(
+            self.template_code, self.get_environment_params(), getattr(self, 'data_file', None)
+        )
+
+        buffer = []
+        buffer_length = 0
+        for chunk in template.generate(**context):
+            buffer.append(chunk)
+            buffer_length += len(chunk)
+            if buffer_length >= buffer_size:
+                output = ''.join(buffer)
+                # Hold back a trailing carriage return, which may precede a line feed in the next chunk
+                buffer = ['\r'] if output.endswith('\r') else []
+                buffer_length = len(buffer)
+                if buffer:
+                    output = output[:-1]
+                # Replace CRLF-style line terminators
+                yield output.replace('\r\n', '\n')
+        if buffer:
+            yield ''.join(buffer).replace('\r\n', '\n')
+
+    def get_filename(self, context=None, queryset=None):
+        """
+        Return the name of the file to which the rendered output is saved.
+        """
+        extension = f'.{self.file_extension}' if self.file_extension else ''
+        if self.file_name:
+            filename = self.file_name
+        elif queryset is not None:
+            filename = filename_from_model(queryset.model)
+        elif context:
+            filename = filename_from_object(context)
+        else:
+            filename = "output"
+        return f'{filename}{extension}'
+
     def render_to_response(self, context=None, queryset=None):
-        output = self.render(context=context, queryset=queryset)
+        """
+        Render the template to a streaming HTTP response. The first chunk of output is rendered before returning, so
+        that any errors encountered when starting to render the template are raised to the caller.
+        """
+        output = self.render_stream(context=context, queryset=queryset)
+        output = itertools.chain([next(output, '')], output)
         mime_type = self.mime_type or DEFAULT_MIME_TYPE
 
         # Build the response
-        response = HttpResponse(output, content_type=mime_type)
+        response = StreamingHttpResponse(output, content_type=mime_type)
 
         if self.as_attachment:
-            extension = f'.{self.file_extension}' if self.file_extension else ''
-            if self.file_name:
-                filename = self.file_name
-            elif queryset:
-                filename = filename_from_model(queryset.model)
-            elif context:
-                filename = filename_from_object(context)
-            else:
-                filename = "output"
-            response['Content-Disposition'] = f'attachment; filename="{filename}{extension}"'
+            response['Content-Disposition'] = f'attachment; filename="{self.get_filename(context, queryset)}"'
 
         return response
+
+    def render_to_file(self, path, context=None, queryset=None):
+        """
+        Render the template and save the output to the default storage backend at the specified path. Returns the
+        name of the saved file.
+        """
+        with tempfile.TemporaryFile() as f:
+            for chunk in self.render_stream(context=context, queryset=queryset):
+                f.write(chunk.encode())
+            f.seek(0)
+            return default_storage.save(path, File(f))
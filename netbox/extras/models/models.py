@@ -5,7 +5,7 @@ from pathlib import Path
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.postgres.fields import ArrayField
-from django.core.validators import ValidationError
+from django.core.validators import MinValueValidator, ValidationError
 from django.db import models
 from django.urls import reverse
 from django.utils import timezone
@@ -236,6 +236,16 @@ class Webhook(CustomFieldsMixin, ExportTemplatesMixin, TagsMixin, OwnerMixin, Ch
             "The specific CA certificate file to use for SSL verification. Leave blank to use the system defaults."
         )
     )
+    batch_size = models.PositiveIntegerField(
+        verbose_name=_('batch size'),
+        blank=True,
+        null=True,
+        validators=(MinValueValidator(1),),
+        help_text=_(
+            "When set, events triggering this webhook are coalesced and delivered in a single request containing an "
+            "array of up to this many events. Leave blank to send one request per event."
+        )
+    )
     events = GenericRelation(
         EventRule,
         content_type_field='action_object_type',
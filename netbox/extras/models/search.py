@@ -9,6 +9,7 @@ from ..fields import CachedValueField
 
 __all__ = (
     'CachedValue',
+    'CachedValueUpdate',
 )
 
 
@@ -77,3 +78,30 @@ class CachedValue(models.Model):
                 else:
                     attrs[name] = value
         return attrs
+
+
+class CachedValueUpdate(models.Model):
+    """
+    An object whose cached values are pending an update by a background job (see SEARCH_CACHE_DELAY).
+    """
+    timestamp = models.DateTimeField(
+        verbose_name=_('timestamp'),
+        auto_now_add=True,
+        editable=False
+    )
+    object_type = models.ForeignKey(
+        to='contenttypes.ContentType',
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    object_id = models.PositiveBigIntegerField()
+
+    _netbox_private = True
+
+    class Meta:
+        ordering = ('pk',)
+        verbose_name = _('cached value update')
+        verbose_name_plural = _('cached value updates')
+
+    def __str__(self):
+        return f'{self.object_type} {self.object_id}'
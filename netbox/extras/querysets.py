@@ -1,7 +1,10 @@
 from django.contrib.postgres.aggregates import JSONBAgg
-from django.db.models import OuterRef, Subquery, Q
+from django.db import transaction
+from django.db.models import Case, JSONField, OuterRef, Subquery, Q, When
+from django.db.models.functions import JSONArray
 
 from extras.models.tags import TaggedItem
+from utilities.data import deepmerge
 from utilities.query_functions import EmptyGroupByJSONBAgg
 from utilities.querysets import RestrictedQuerySet
 
@@ -84,20 +87,113 @@ class ConfigContextModelQuerySet(RestrictedQuerySet):
     This offers a substantial performance gain over ConfigContextQuerySet.get_for_object() when dealing with
     multiple objects. This allows the annotation to be entirely optional.
     """
-    def annotate_config_context_data(self):
+    def annotate_config_context_data(self, materialized=False):
         """
-        Attach the subquery annotation to the base queryset
+        Attach the subquery annotation to the base queryset. If materialized is True, each object's stored config
+        context is used where present, and the subquery is evaluated only for objects which do not have one.
         """
         from extras.models import ConfigContext
-        return self.annotate(
-            config_context_data=Subquery(
-                ConfigContext.objects.filter(
-                    self._get_config_context_filters()
-                ).annotate(
-                    _data=EmptyGroupByJSONBAgg('data', order_by=['weight', 'name'])
-                ).values("_data").order_by()
-            )
+        config_context_data = Subquery(
+            ConfigContext.objects.filter(
+                self._get_config_context_filters()
+            ).annotate(
+                _data=EmptyGroupByJSONBAgg('data', order_by=['weight', 'name'])
+            ).values("_data").order_by()
         )
+        if materialized:
+            config_context_data = Case(
+                When(_config_context__isnull=True, then=config_context_data),
+                default=JSONArray('_config_context'),
+                output_field=JSONField()
+            )
+        return self.annotate(config_context_data=config_context_data)
+
+    def filter_for_config_context(self, config_context):
+        """
+        Return all objects to which the given ConfigContext applies by virtue of its assignments (irrespective of
+        whether the ConfigContext is active). This is the inverse of ConfigContextQuerySet.get_for_object().
+        """
+        is_device = self.model._meta.model_name == 'device'
+        query = Q()
+
+        # Hierarchical assignments match the assigned node as well as all of its descendants
+        for field_name, lookup in (
+            ('regions', 'site__region__in'),
+            ('site_groups', 'site__group__in'),
+            ('locations', 'location__in'),
+            ('roles', 'role__in'),
+            ('platforms', 'platform__in'),
+        ):
+            nodes = getattr(config_context, field_name).all()
+            if not nodes:
+                continue
+            if field_name == 'locations' and not is_device:
+                # Virtual machines match only ConfigContexts which are not assigned to locations
+                return self.none()
+            query &= Q(**{lookup: nodes.model.objects.get_queryset_descendants(nodes, include_self=True)})
+
+        # Direct assignments
+        for field_name, lookup in (
+            ('sites', 'site__in'),
+            ('device_types', 'device_type__in'),
+            ('cluster_types', 'cluster__type__in'),
+            ('cluster_groups', 'cluster__group__in'),
+            ('clusters', 'cluster__in'),
+            ('tenant_groups', 'tenant__group__in'),
+            ('tenants', 'tenant__in'),
+        ):
+            pks = list(getattr(config_context, field_name).values_list('pk', flat=True))
+            if not pks:
+                continue
+            if field_name == 'device_types' and not is_device:
+                # Virtual machines match only ConfigContexts which are not assigned to device types
+                return self.none()
+            query &= Q(**{lookup: pks})
+
+        if tags := list(config_context.tags.values_list('pk', flat=True)):
+            query &= Q(pk__in=self.model.objects.filter(tags__in=tags).values('pk'))
+
+        return self.filter(query)
+
+    def invalidate_config_context(self):
+        """
+        Clear the materialized config context of all objects in the queryset, and schedule its recomputation.
+        """
+        from extras.jobs import MaterializeConfigContextsJob
+
+        count = self.model.objects.filter(
+            pk__in=self.values('pk'),
+            _config_context__isnull=False
+        ).update(_config_context=None)
+        if count:
+            transaction.on_commit(MaterializeConfigContextsJob.enqueue_unless_pending)
+
+        return count
+
+    def materialize_config_context(self, chunk_size=1000):
+        """
+        Compute and store the merged config context for each object in the queryset which does not already have one.
+        Objects are processed in locked chunks, so that an object invalidated concurrently is never left holding a
+        stale context. Returns the number of objects updated.
+        """
+        count = 0
+        while True:
+            with transaction.atomic():
+                pks = list(
+                    self.filter(_config_context__isnull=True).select_for_update(
+                        skip_locked=True, of=('self',)
+                    ).values_list('pk', flat=True)[:chunk_size]
+                )
+                if not pks:
+                    return count
+                instances = self.model.objects.filter(pk__in=pks).annotate_config_context_data().only('pk')
+                for instance in instances:
+                    data = {}
+                    for context in instance.config_context_data or []:
+                        data = deepmerge(data, context)
+                    instance._config_context = data
+                self.model.objects.bulk_update(instances, ['_config_context'], batch_size=chunk_size)
+                count += len(instances)
 
     def _get_config_context_filters(self):
         # Construct the set of Q objects for the specific object types
@@ -1,17 +1,25 @@
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
+from mptt.models import MPTTModel
 
 from core.events import *
 from core.signals import job_end, job_start
+from dcim.models import Device, DeviceRole, Location, Platform, Region, Site, SiteGroup
 from extras.events import EventContext, process_event_rules
+from extras.jobs import SyncCustomFieldIndexesJob
 from extras.models import EventRule, Notification, Subscription
 from netbox.config import get_config
 from netbox.models.features import has_feature
 from netbox.signals import post_clean
+from tenancy.models import Tenant
 from utilities.data import get_config_value_ci
 from utilities.exceptions import AbortRequest
-from .models import CustomField, TaggedItem
+from virtualization.models import Cluster, VirtualMachine
+from .models import ConfigContext, ConfigContextModel, CustomField, TaggedItem
 from .utils import run_validators
 
 
@@ -50,10 +58,25 @@ def handle_cf_deleted(instance, **kwargs):
     instance.remove_stale_data(instance.object_types.all())
 
 
+def handle_cf_index_changed(instance, **kwargs):
+    """
+    Synchronize custom field indexes in the background when a CustomField is created, modified, or deleted, or has
+    its assigned object types changed.
+    """
+    if not settings.INDEX_CUSTOM_FIELDS:
+        return
+    if kwargs.get('action') not in (None, 'post_add', 'post_remove', 'post_clear'):
+        return
+    transaction.on_commit(SyncCustomFieldIndexesJob.enqueue_unless_pending)
+
+
 post_save.connect(handle_cf_renamed, sender=CustomField)
 pre_delete.connect(handle_cf_deleted, sender=CustomField)
 m2m_changed.connect(handle_cf_added_obj_types, sender=CustomField.object_types.through)
 m2m_changed.connect(handle_cf_removed_obj_types, sender=CustomField.object_types.through)
+post_save.connect(handle_cf_index_changed, sender=CustomField)
+post_delete.connect(handle_cf_index_changed, sender=CustomField)
+m2m_changed.connect(handle_cf_index_changed, sender=CustomField.object_types.through)
 
 
 #
@@ -89,6 +112,175 @@ def validate_assigned_tags(sender, instance, action, model, pk_set, **kwargs):
             raise AbortRequest(f"Tag {tag} cannot be assigned to {ct.model} objects.")
 
 
+#
+# Config contexts
+#
+
+# Models to which ConfigContexts are assigned, mapped to the attributes which affect assignment matching and the lookup
+# relating devices and virtual machines to them
+CONFIG_CONTEXT_DEPENDENCIES = {
+    Site: (('region', 'group'), 'site'),
+    Region: (('parent',), 'site__region'),
+    SiteGroup: (('parent',), 'site__group'),
+    Location: (('parent',), 'location'),
+    DeviceRole: (('parent',), 'role'),
+    Platform: (('parent',), 'platform'),
+    Cluster: (('type', 'group'), 'cluster'),
+    Tenant: (('group',), 'tenant'),
+}
+
+
+def get_config_context_fields(model):
+    """
+    Return the names of the fields on a device or virtual machine against which ConfigContext assignments are matched.
+    """
+    fields = ['site', 'role', 'platform', 'tenant', 'cluster']
+    if model._meta.model_name == 'device':
+        fields.extend(['location', 'device_type'])
+    return fields
+
+
+def invalidate_config_context_objects(config_context):
+    """
+    Invalidate the materialized config context of all devices and virtual machines to which a ConfigContext applies.
+    """
+    for model in (Device, VirtualMachine):
+        model.objects.filter_for_config_context(config_context).invalidate_config_context()
+
+
+def handle_config_context_saved(instance, created, **kwargs):
+    """
+    Invalidate the materialized config context of all objects to which an existing ConfigContext applies when any of
+    the attributes affecting the merged context have changed, as recorded by its pre-change snapshot (if any).
+
+    A new ConfigContext has no assignments yet, so the objects to which it applies are determined once the transaction
+    has been committed. Changes to its assignments before then are disregarded.
+    """
+    if not settings.MATERIALIZE_CONFIG_CONTEXTS:
+        return
+
+    if created:
+        if not instance.is_active:
+            return
+        instance._config_context_pending = True
+
+        def invalidate():
+            instance._config_context_pending = False
+            invalidate_config_context_objects(instance)
+        transaction.on_commit(invalidate)
+        return
+
+    snapshot = getattr(instance, '_prechange_snapshot', None)
+    if snapshot is None or any(
+        snapshot.get(field_name) != getattr(instance, field_name)
+        for field_name in ('name', 'weight', 'is_active', 'data')
+    ):
+        invalidate_config_context_objects(instance)
+
+
+def handle_config_context_deleted(instance, **kwargs):
+    """
+    Invalidate the materialized config context of all objects to which a ConfigContext applies when it is deleted.
+    """
+    if settings.MATERIALIZE_CONFIG_CONTEXTS:
+        invalidate_config_context_objects(instance)
+
+
+def handle_config_context_assignments_changed(instance, action, pk_set, **kwargs):
+    """
+    Invalidate the materialized config context of all objects to which a ConfigContext applies both before and after
+    its assignments are changed.
+    """
+    if not settings.MATERIALIZE_CONFIG_CONTEXTS or getattr(instance, '_config_context_pending', False):
+        return
+    if action in ('pre_add', 'post_add', 'pre_remove', 'post_remove') and not pk_set:
+        return
+    invalidate_config_context_objects(instance)
+
+
+def handle_config_context_object_saved(sender, instance, **kwargs):
+    """
+    Clear the materialized config context of a device or virtual machine when any of the attributes against which
+    ConfigContexts are matched has changed, as recorded by its pre-change snapshot. If no snapshot is available, the
+    context is cleared. A cleared (or new) object's context is computed by the next run of MaterializeConfigContextsJob,
+    and rendered on demand until then.
+
+    Otherwise, the context is reloaded from the database so that saving the instance does not write back a stale value
+    over an invalidation made since it was loaded (e.g. by a change to a ConfigContext or to the object's tags).
+    """
+    if not settings.MATERIALIZE_CONFIG_CONTEXTS:
+        return
+    if instance._state.adding:
+        instance._config_context = None
+        return
+
+    snapshot = getattr(instance, '_prechange_snapshot', None)
+    if snapshot is None or any(
+        snapshot.get(field_name) != getattr(instance, sender._meta.get_field(field_name).attname)
+        for field_name in get_config_context_fields(sender)
+    ):
+        instance._config_context = None
+    else:
+        instance._config_context = sender._base_manager.filter(pk=instance.pk).values_list(
+            '_config_context', flat=True
+        ).first()
+
+
+def handle_config_context_object_tagged(sender, instance, action, **kwargs):
+    """
+    Invalidate the materialized config context of a device or virtual machine when its assigned tags change.
+    """
+    if not settings.MATERIALIZE_CONFIG_CONTEXTS or not isinstance(instance, ConfigContextModel):
+        return
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        type(instance).objects.filter(pk=instance.pk).invalidate_config_context()
+
+
+def handle_config_context_dependency_changed(sender, instance, **kwargs):
+    """
+    Invalidate the materialized config context of all devices and virtual machines related to an object on which
+    ConfigContext assignments are matched (e.g. a site or region) when it is deleted or its relevant attributes change.
+    """
+    if not settings.MATERIALIZE_CONFIG_CONTEXTS or instance._state.adding:
+        return
+    fields, lookup = CONFIG_CONTEXT_DEPENDENCIES[sender]
+
+    if kwargs.get('signal') is pre_save:
+        attnames = [sender._meta.get_field(name).attname for name in fields]
+        current = sender.objects.filter(pk=instance.pk).values(*attnames).first()
+        if current is None or all(current[attname] == getattr(instance, attname) for attname in attnames):
+            return
+        # A change in a hierarchical object's parent affects all of its descendants
+        if isinstance(instance, MPTTModel):
+            related = {f'{lookup}__in': instance.get_descendants(include_self=True)}
+        else:
+            related = {lookup: instance}
+    else:
+        related = {lookup: instance}
+
+    for model in (Device, VirtualMachine):
+        try:
+            model._meta.get_field(lookup.split('__')[0])
+        except FieldDoesNotExist:
+            continue
+        model.objects.filter(**related).invalidate_config_context()
+
+
+post_save.connect(handle_config_context_saved, sender=ConfigContext)
+pre_delete.connect(handle_config_context_deleted, sender=ConfigContext)
+for field_name in (
+    'regions', 'site_groups', 'sites', 'locations', 'device_types', 'roles', 'platforms', 'cluster_types',
+    'cluster_groups', 'clusters', 'tenant_groups', 'tenants', 'tags',
+):
+    m2m_changed.connect(handle_config_context_assignments_changed, sender=getattr(ConfigContext, field_name).through)
+for model in (Device, VirtualMachine):
+    pre_save.connect(handle_config_context_object_saved, sender=model)
+m2m_changed.connect(handle_config_context_object_tagged, sender=TaggedItem)
+for model in CONFIG_CONTEXT_DEPENDENCIES:
+    pre_save.connect(handle_config_context_dependency_changed, sender=model)
+    pre_delete.connect(handle_config_context_dependency_changed, sender=model)
+
+
 #
 # Event rules
 #
@@ -1,9 +1,11 @@
 import datetime
 import json
+from collections import defaultdict
 from decimal import Decimal
 
 from django.core.exceptions import ValidationError
-from django.test import tag
+from django.db import connection
+from django.test import override_settings, tag
 from django.urls import reverse
 from rest_framework import status
 
@@ -15,6 +17,7 @@ from extras.choices import *
 from extras.models import CustomField, CustomFieldChoiceSet
 from ipam.models import VLAN
 from netbox.choices import CSVDelimiterChoices, ImportFormatChoices
+from netbox.context import query_cache
 from utilities.testing import APITestCase, TestCase
 from virtualization.models import VirtualMachine
 
@@ -670,6 +673,158 @@ class CustomFieldManagerTest(TestCase):
         self.assertEqual(CustomField.objects.get_for_model(VirtualMachine).count(), 0)
 
 
+class CustomFieldPrefetchTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        object_type = ObjectType.objects.get_for_model(Site)
+        vlan_type = ObjectType.objects.get_for_model(VLAN)
+
+        vlans = (
+            VLAN(name='VLAN 1', vid=1),
+            VLAN(name='VLAN 2', vid=2),
+            VLAN(name='VLAN 3', vid=3),
+        )
+        VLAN.objects.bulk_create(vlans)
+
+        custom_fields = (
+            CustomField(type=CustomFieldTypeChoices.TYPE_OBJECT, name='vlan', related_object_type=vlan_type),
+            CustomField(type=CustomFieldTypeChoices.TYPE_MULTIOBJECT, name='vlans', related_object_type=vlan_type),
+        )
+        for cf in custom_fields:
+            cf.save()
+            cf.object_types.set([object_type])
+
+        sites = (
+            Site(name='Site 1', slug='site-1', custom_field_data={'vlan': vlans[0].pk, 'vlans': [vlans[1].pk]}),
+            Site(name='Site 2', slug='site-2', custom_field_data={'vlan': vlans[1].pk, 'vlans': [vlans[2].pk]}),
+            Site(
+                name='Site 3',
+                slug='site-3',
+                custom_field_data={'vlan': vlans[2].pk, 'vlans': [vlans[2].pk, vlans[0].pk]}
+            ),
+        )
+        Site.objects.bulk_create(sites)
+
+    def setUp(self):
+        query_cache.set(defaultdict(dict))
+
+    def tearDown(self):
+        query_cache.set(None)
+
+    def test_prefetch_objects(self):
+        sites = list(Site.objects.order_by('name'))
+        CustomField.objects.prefetch_objects(sites)
+
+        with self.assertNumQueries(0):
+            values = [site.cf for site in sites]
+            self.assertEqual([v['vlan'].name for v in values], ['VLAN 1', 'VLAN 2', 'VLAN 3'])
+            self.assertEqual([vlan.name for vlan in values[0]['vlans']], ['VLAN 2'])
+            self.assertEqual([vlan.name for vlan in values[2]['vlans']], ['VLAN 1', 'VLAN 3'])
+
+        # The prefetched multi-object value can still be filtered
+        self.assertEqual(values[2]['vlans'].filter(vid=3).count(), 1)
+
+    def test_deleted_object(self):
+        site = Site.objects.get(name='Site 3')
+        VLAN.objects.filter(name='VLAN 3').delete()
+        CustomField.objects.prefetch_objects([site])
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(site.cf['vlan'])
+            self.assertEqual([vlan.name for vlan in site.cf['vlans']], ['VLAN 1'])
+
+    def test_no_request_cache(self):
+        query_cache.set(None)
+        site = Site.objects.get(name='Site 1')
+        CustomField.objects.prefetch_objects([site])
+        self.assertEqual(site.cf['vlan'].name, 'VLAN 1')
+
+
+class CustomFieldIndexTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        object_type = ObjectType.objects.get_for_model(Site)
+        choice_set = CustomFieldChoiceSet.objects.create(
+            name='Choice Set 1',
+            extra_choices=(('foo', 'Foo'), ('bar', 'Bar'))
+        )
+        custom_fields = (
+            CustomField(name='text', type=CustomFieldTypeChoices.TYPE_TEXT),
+            CustomField(
+                name='text_exact',
+                type=CustomFieldTypeChoices.TYPE_TEXT,
+                filter_logic=CustomFieldFilterLogicChoices.FILTER_EXACT
+            ),
+            CustomField(name='integer', type=CustomFieldTypeChoices.TYPE_INTEGER),
+            CustomField(
+                name='integer_unfiltered',
+                type=CustomFieldTypeChoices.TYPE_INTEGER,
+                filter_logic=CustomFieldFilterLogicChoices.FILTER_DISABLED
+            ),
+            CustomField(name='multiselect', type=CustomFieldTypeChoices.TYPE_MULTISELECT, choice_set=choice_set),
+        )
+        for cf in custom_fields:
+            cf.save()
+            cf.object_types.set([object_type])
+
+    @staticmethod
+    def get_index_names():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE starts_with(indexname, 'nb_cf_')")
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_index_type(self):
+        index_types = {cf.name: cf.index_type for cf in CustomField.objects.all()}
+        self.assertEqual(index_types, {
+            'text': None,
+            'text_exact': 'hash',
+            'integer': 'btree',
+            'integer_unfiltered': None,
+            'multiselect': 'gin',
+        })
+
+    @override_settings(INDEX_CUSTOM_FIELDS=True)
+    def test_sync_indexes(self):
+        CustomField.objects.sync_indexes()
+        indexes = CustomField.objects.get_indexes()
+        self.assertEqual(len(indexes), 3)
+        self.assertEqual(self.get_index_names(), set(indexes))
+
+        # Indexes are used for filtering
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        index_name = CustomField.objects.get(name='integer').get_index_name(Site)
+        self.assertIn(index_name, Site.objects.filter(custom_field_data__integer__gte=5).order_by().explain())
+
+        # Changing a field's definition replaces its index
+        cf = CustomField.objects.get(name='text')
+        cf.unique = True
+        cf.save()
+        cf = CustomField.objects.get(name='integer')
+        cf.name = 'integer2'
+        cf.save()
+        CustomField.objects.sync_indexes()
+        indexes = CustomField.objects.get_indexes()
+        self.assertEqual(len(indexes), 4)
+        self.assertNotIn(index_name, indexes)
+        self.assertEqual(self.get_index_names(), set(indexes))
+
+        # Deleting a field drops its index
+        CustomField.objects.get(name='multiselect').delete()
+        CustomField.objects.sync_indexes()
+        self.assertEqual(len(self.get_index_names()), 3)
+
+    def test_sync_indexes_disabled(self):
+        with override_settings(INDEX_CUSTOM_FIELDS=True):
+            CustomField.objects.sync_indexes()
+        self.assertEqual(len(self.get_index_names()), 3)
+
+        CustomField.objects.sync_indexes()
+        self.assertEqual(self.get_index_names(), set())
+
+
 class CustomFieldAPITest(APITestCase):
 
     @classmethod
@@ -16,7 +16,7 @@ from dcim.models import Site
 from extras.choices import EventRuleActionChoices
 from extras.events import enqueue_event, flush_events, serialize_for_event
 from extras.models import EventRule, Tag, Webhook
-from extras.webhooks import generate_signature, send_webhook
+from extras.webhooks import generate_signature, send_webhook, send_webhook_batch
 from netbox.context_managers import event_tracking
 from utilities.testing import APITestCase
 
@@ -395,6 +395,92 @@ class EventRuleTest(APITestCase):
         with patch.object(Session, 'send', dummy_send):
             send_webhook(**job.kwargs)
 
+    def test_bulk_create_batched_webhook(self):
+        """
+        Check that bulk creating multiple objects with an EventRule for a batched webhook queues a single background
+        task per batch.
+        """
+        webhook = Webhook.objects.get(name='Webhook 1')
+        webhook.batch_size = 2
+        webhook.save()
+
+        # Create multiple objects via the REST API
+        data = [
+            {'name': f'Site {i}', 'slug': f'site-{i}'} for i in range(1, 4)
+        ]
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.add_site')
+        response = self.client.post(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+
+        # Verify that the three events were coalesced into two batches
+        self.assertEqual(self.queue.count, 2)
+        jobs = self.queue.jobs
+        self.assertEqual(jobs[0].func_name, 'extras.webhooks.send_webhook_batch')
+        self.assertEqual(jobs[0].kwargs['webhook'], webhook)
+        self.assertEqual(len(jobs[0].kwargs['events']), 2)
+        self.assertEqual(len(jobs[1].kwargs['events']), 1)
+        for i, event in enumerate(jobs[0].kwargs['events'] + jobs[1].kwargs['events']):
+            self.assertEqual(event['event_type'], OBJECT_CREATED)
+            self.assertEqual(event['data']['id'], response.data[i]['id'])
+            self.assertEqual(event['data']['foo'], 1)
+
+    def test_send_webhook_batch(self):
+        webhook = Webhook.objects.get(name='Webhook 1')
+        webhook.batch_size = 10
+        webhook.payload_url = 'http://localhost:9000/?type={{ object_type }}'
+        webhook.additional_headers = 'X-Event: {{ event }}'
+        webhook.save()
+
+        def dummy_send(_, request, **kwargs):
+            """
+            A dummy implementation of Session.send() to be used for testing.
+            Always returns a 200 HTTP response.
+            """
+            signature = generate_signature(request.body, webhook.secret)
+
+            # Validate the outgoing request URL & headers, which are rendered using the context of the first event
+            self.assertEqual(request.url, 'http://localhost:9000/?type=dcim.site')
+            self.assertEqual(request.headers['Content-Type'], webhook.http_content_type)
+            self.assertEqual(request.headers['X-Hook-Signature'], signature)
+            self.assertEqual(request.headers['X-Event'], 'created')
+
+            # Validate the outgoing request body
+            body = json.loads(request.body)
+            self.assertEqual(len(body), 2)
+            for i, event in enumerate(body):
+                self.assertEqual(event['event'], 'created')
+                self.assertEqual(event['object_type'], 'dcim.site')
+                self.assertEqual(event['username'], 'testuser')
+                self.assertEqual(event['data']['name'], f'Site {i + 1}')
+
+            return HttpResponse()
+
+        # Create a dummy request
+        request = RequestFactory().get(reverse('dcim:site_add'))
+        request.id = uuid.uuid4()
+        request.user = self.user
+
+        # Enqueue a batched webhook for processing
+        webhooks_queue = {}
+        for i in range(1, 3):
+            site = Site.objects.create(name=f'Site {i}', slug=f'site-{i}')
+            enqueue_event(
+                webhooks_queue,
+                instance=site,
+                request=request,
+                event_type=OBJECT_CREATED,
+            )
+        flush_events(list(webhooks_queue.values()))
+
+        # Retrieve the job from queue
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+
+        # Patch the Session object with our dummy_send() method, then process the webhook for sending
+        with patch.object(Session, 'send', dummy_send):
+            send_webhook_batch(**job.kwargs)
+
     def test_duplicate_triggers(self):
         """
         Test for erroneous duplicate event triggers resulting from saving an object multiple times
@@ -2,13 +2,16 @@ import tempfile
 from pathlib import Path
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.forms import ValidationError
-from django.test import tag, TestCase
+from django.test import override_settings, tag, TestCase
 
 from core.models import AutoSyncRecord, DataSource, ObjectType
 from dcim.models import Device, DeviceRole, DeviceType, Location, Manufacturer, Platform, Region, Site, SiteGroup
-from extras.models import ConfigContext, ConfigContextProfile, ConfigTemplate, ImageAttachment, Tag, TaggedItem
+from extras.models import (
+    ConfigContext, ConfigContextProfile, ConfigTemplate, ExportTemplate, ImageAttachment, Tag, TaggedItem,
+)
 from tenancy.models import Tenant, TenantGroup
 from utilities.exceptions import AbortRequest
 from virtualization.models import Cluster, ClusterGroup, ClusterType, VirtualMachine
@@ -692,6 +695,139 @@ class ConfigContextTest(TestCase):
         self.assertEqual(len(distinct_subqueries), 1)
         self.assertTrue(distinct_subqueries[0].distinct)
 
+    @override_settings(MATERIALIZE_CONFIG_CONTEXTS=True)
+    def test_materialized_config_context(self):
+        site = Site.objects.first()
+        region = Region.objects.first()
+        platform = Platform.objects.first()
+        with self.captureOnCommitCallbacks(execute=True):
+            region_context = ConfigContext.objects.create(name="region", weight=100, data={"a": 1, "b": {"c": 1}})
+            region_context.regions.add(region)
+            platform_context = ConfigContext.objects.create(name="platform", weight=200, data={"b": {"d": 2}})
+            platform_context.platforms.add(platform)
+            other_site_context = ConfigContext.objects.create(name="other", weight=300, data={"a": 3})
+            other_site_context.sites.add(Site.objects.create(name='Site 2', slug='site-2'))
+
+        device = Device.objects.first()
+        self.assertIsNone(device._config_context)
+        self.assertEqual(Device.objects.materialize_config_context(), 1)
+        device.refresh_from_db()
+        self.assertEqual(device._config_context, {"a": 1, "b": {"c": 1}})
+        with self.assertNumQueries(0):
+            self.assertEqual(device.get_config_context(), {"a": 1, "b": {"c": 1}})
+
+        # Objects without a materialized context are annotated with their config context data
+        with self.assertNumQueries(1):
+            device_copy = Device.objects.annotate_config_context_data(materialized=True).get(pk=device.pk)
+            self.assertEqual(device_copy.get_config_context(), {"a": 1, "b": {"c": 1}})
+
+        # Creating a ConfigContext which does not apply to the device should not invalidate its context
+        with self.captureOnCommitCallbacks(execute=True):
+            ConfigContext.objects.create(name="other 2", weight=300, data={}).sites.add(Site.objects.last())
+        device.refresh_from_db()
+        self.assertIsNotNone(device._config_context)
+
+        # Assigning the device to a platform should invalidate its materialized context
+        device.snapshot()
+        device.platform = platform
+        device.save()
+        device.refresh_from_db()
+        self.assertIsNone(device._config_context)
+        Device.objects.materialize_config_context()
+        device.refresh_from_db()
+        self.assertEqual(device._config_context, {"a": 1, "b": {"c": 1, "d": 2}})
+
+        # Saving the device without changing relevant attributes should preserve its materialized context
+        device.snapshot()
+        device.description = 'foo'
+        device.save()
+        device.refresh_from_db()
+        self.assertIsNotNone(device._config_context)
+
+        # Saving a previously loaded instance should not restore a context which has since been invalidated
+        device.snapshot()
+        Device.objects.filter(pk=device.pk).invalidate_config_context()
+        device.description = 'bar'
+        device.save()
+        device.refresh_from_db()
+        self.assertIsNone(device._config_context)
+        Device.objects.materialize_config_context()
+        device.refresh_from_db()
+
+        # Stored contexts are used when annotating config context data
+        with self.assertNumQueries(1):
+            device_copy = Device.objects.annotate_config_context_data(materialized=True).get(pk=device.pk)
+            self.assertEqual(device_copy.get_config_context(), {"a": 1, "b": {"c": 1, "d": 2}})
+
+        # Saving an applicable ConfigContext without changing its data should not invalidate the device's context
+        region_context.snapshot()
+        region_context.description = 'foo'
+        region_context.save()
+        device.refresh_from_db()
+        self.assertIsNotNone(device._config_context)
+
+        # Modifying a ConfigContext which does not apply to the device should not invalidate its context
+        other_site_context.data = {"a": 4}
+        other_site_context.save()
+        device.refresh_from_db()
+        self.assertIsNotNone(device._config_context)
+
+        # Modifying an applicable ConfigContext should invalidate the device's context
+        region_context.snapshot()
+        region_context.data = {"a": 5}
+        region_context.save()
+        device.refresh_from_db()
+        self.assertIsNone(device._config_context)
+        Device.objects.materialize_config_context()
+        device.refresh_from_db()
+        self.assertEqual(device._config_context, {"a": 5, "b": {"d": 2}})
+
+        # Removing the site from the region should invalidate the device's context
+        site.region = None
+        site.save()
+        device.refresh_from_db()
+        self.assertIsNone(device._config_context)
+        Device.objects.materialize_config_context()
+        device.refresh_from_db()
+        self.assertEqual(device._config_context, {"b": {"d": 2}})
+
+        # Assigning the ConfigContext to the device's site should invalidate the device's context
+        other_site_context.sites.add(site)
+        device.refresh_from_db()
+        self.assertIsNone(device._config_context)
+        Device.objects.materialize_config_context()
+        device.refresh_from_db()
+        self.assertEqual(device.get_config_context(), {"a": 4, "b": {"d": 2}})
+
+        # Saving the device without a pre-change snapshot should clear its context
+        device = Device.objects.get(pk=device.pk)
+        device.save()
+        device.refresh_from_db()
+        self.assertIsNone(device._config_context)
+
+    def test_filter_for_config_context(self):
+        device = Device.objects.first()
+        site = Site.objects.first()
+        tag = Tag.objects.first()
+        context = ConfigContext.objects.create(name="context", weight=100, data={})
+        self.assertIn(device, Device.objects.filter_for_config_context(context))
+
+        context.regions.add(Region.objects.first())
+        context.sites.add(site)
+        self.assertIn(device, Device.objects.filter_for_config_context(context))
+
+        context.tags.add(tag)
+        self.assertNotIn(device, Device.objects.filter_for_config_context(context))
+        device.tags.add(tag)
+        self.assertIn(device, Device.objects.filter_for_config_context(context))
+
+        # Virtual machines never match ConfigContexts assigned to locations
+        vm = VirtualMachine.objects.create(name='VM 1', site=site)
+        vm.tags.add(tag)
+        self.assertIn(vm, VirtualMachine.objects.filter_for_config_context(context))
+        context.locations.add(Location.objects.first())
+        self.assertNotIn(vm, VirtualMachine.objects.filter_for_config_context(context))
+
 
 class ConfigTemplateTest(TestCase):
     """
@@ -804,3 +940,47 @@ class ConfigTemplateTest(TestCase):
                 object_id=config_template.pk
             )
             self.assertEqual(autosync_records.count(), 0, "AutoSyncRecord should be deleted after detaching")
+
+
+class ExportTemplateTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 6)
+        ])
+        cls.export_template = ExportTemplate.objects.create(
+            name='Export Template 1',
+            template_code='{% for site in queryset %}{{ site.name }}\r\n{% endfor %}',
+            file_extension='txt',
+        )
+
+    def test_render_stream(self):
+        queryset = Site.objects.order_by('name')
+        expected = ''.join(f'{site.name}\n' for site in queryset)
+
+        # Output is yielded in multiple chunks, with CRLF line terminators replaced
+        chunks = list(self.export_template.render_stream(queryset=queryset, buffer_size=8))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunks), expected)
+        self.assertEqual(self.export_template.render(queryset=queryset), expected)
+
+    def test_render_to_response(self):
+        queryset = Site.objects.order_by('name')
+        response = self.export_template.render_to_response(queryset=queryset)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="netbox_sites.txt"')
+        self.assertEqual(
+            b''.join(response.streaming_content).decode(),
+            ''.join(f'{site.name}\n' for site in queryset)
+        )
+
+    def test_render_to_file(self):
+        queryset = Site.objects.order_by('name')
+        path = self.export_template.render_to_file('exports/test/sites.txt', queryset=queryset)
+        try:
+            with default_storage.open(path) as f:
+                self.assertEqual(f.read().decode(), ''.join(f'{site.name}\n' for site in queryset))
+        finally:
+            default_storage.delete(path)
@@ -1,11 +1,17 @@
 import importlib
+import io
+import json
+import tarfile
+import time
 from pathlib import Path
 
+from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured, SuspiciousFileOperation
 from django.core.files.storage import default_storage
 from django.core.files.utils import validate_file_name
 from django.db import models
 from django.db.models import Q
+from django.utils.text import get_valid_filename
 from taggit.managers import _TaggableManager
 
 from netbox.context import current_request
@@ -20,6 +26,9 @@ __all__ = (
     'is_report',
     'is_script',
     'is_taggable',
+    'render_config_templates',
+    'rendered_configs_to_ndjson',
+    'rendered_configs_to_tar',
     'run_validators',
 )
 
@@ -151,3 +160,111 @@ def run_validators(instance, validators):
             raise ImproperlyConfigured(f"Invalid value for custom validator: {validator}")
 
         validator(instance, request)
+
+
+def render_config_templates(queryset, context=None):
+    """
+    Render the assigned ConfigTemplate for each object (Device or VirtualMachine) in the queryset. Config context data
+    is resolved for all objects within the query, and each ConfigTemplate is compiled only once. Yields a four-tuple of
+    (object, ConfigTemplate, output, error) for each object; if rendering fails, the output is None and the error is
+    reported without interrupting the remaining objects.
+    """
+    from utilities.jinja2 import get_jinja2_template
+
+    object_type = queryset.model._meta.model_name
+    queryset = queryset.annotate_config_context_data(materialized=settings.MATERIALIZE_CONFIG_CONTEXTS)
+    queryset = queryset.select_related('config_template', 'role__config_template', 'platform__config_template')
+
+    # Maps ConfigTemplate IDs to their base context & compiled template
+    templates = {}
+
+    for instance in queryset.iterator(chunk_size=100):
+        configtemplate = instance.get_config_template()
+        if not configtemplate:
+            yield instance, None, None, f'No config template found for this {object_type}.'
+            continue
+
+        try:
+            if configtemplate.pk not in templates:
+                templates[configtemplate.pk] = (
+                    configtemplate.get_context(),
+                    get_jinja2_template(
+                        configtemplate.template_code,
+                        configtemplate.get_environment_params(),
+                        configtemplate.data_file
+                    )
+                )
+            base_context, template = templates[configtemplate.pk]
+
+            # Compile context data
+            context_data = {
+                **base_context,
+                **instance.get_config_context(),
+                **(context or {}),
+                object_type: instance,
+            }
+            output = template.render(**context_data).replace('\r\n', '\n')
+        except Exception as e:
+            lineno = getattr(e, 'lineno', None)
+            error = f'An error occurred while rendering the template (line {lineno}): {e}' if lineno else \
+                f'An error occurred while rendering the template: {e}'
+            yield instance, configtemplate, None, error
+            continue
+
+        yield instance, configtemplate, output, None
+
+
+def rendered_configs_to_ndjson(results):
+    """
+    Serialize the results of render_config_templates() as newline-delimited JSON, yielding one line per object.
+    """
+    for instance, configtemplate, output, error in results:
+        data = {
+            'id': instance.pk,
+            'name': instance.name,
+            'configtemplate': configtemplate.pk if configtemplate else None,
+        }
+        if error:
+            data['error'] = error
+        else:
+            data['content'] = output
+        yield json.dumps(data) + '\n'
+
+
+def rendered_configs_to_tar(results):
+    """
+    Serialize the results of render_config_templates() as an uncompressed tar archive, yielding the archive in
+    chunks as each object is added. Errors are written to errors.json at the end of the archive.
+    """
+    buffer = io.BytesIO()
+    errors = {}
+    timestamp = time.time()
+
+    def _add_file(archive, filename, content):
+        data = content.encode()
+        tarinfo = tarfile.TarInfo(name=filename)
+        tarinfo.size = len(data)
+        tarinfo.mtime = timestamp
+        archive.addfile(tarinfo, io.BytesIO(data))
+
+    def _flush():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    with tarfile.open(fileobj=buffer, mode='w|') as archive:
+        for instance, configtemplate, output, error in results:
+            filename = get_valid_filename(f'{instance.pk}-{instance.name}' if instance.name else str(instance.pk))
+            if error:
+                errors[filename] = error
+                continue
+            if configtemplate.file_extension:
+                filename = f'{filename}.{configtemplate.file_extension}'
+            _add_file(archive, filename, output)
+            yield _flush()
+
+        if errors:
+            _add_file(archive, 'errors.json', json.dumps(errors, indent=4))
+
+    yield _flush()
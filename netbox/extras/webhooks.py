@@ -1,19 +1,24 @@
 import hashlib
 import hmac
+import json
 import logging
 
 import requests
 from django_rq import job
 from jinja2.exceptions import TemplateError
+from rest_framework.utils.encoders import JSONEncoder
 
 from netbox.registry import registry
 from utilities.proxy import resolve_proxies
 from .constants import WEBHOOK_EVENT_TYPES
 
 __all__ = (
+    'deliver_webhook',
     'generate_signature',
+    'get_webhook_context',
     'register_webhook_callback',
     'send_webhook',
+    'send_webhook_batch',
 )
 
 logger = logging.getLogger('netbox.webhooks')
@@ -40,14 +45,10 @@ def generate_signature(request_body, secret):
     return hmac_prep.hexdigest()
 
 
-@job('default')
-def send_webhook(event_rule, object_type, event_type, data, timestamp, username, request=None, snapshots=None):
+def get_webhook_context(object_type, event_type, data, timestamp, username, request=None, snapshots=None):
     """
-    Make a POST request to the defined Webhook
+    Compile the context data for rendering a webhook's headers, body, and URL for a single event.
     """
-    webhook = event_rule.action_object
-
-    # Prepare context data for headers & body templates
     context = {
         'event': WEBHOOK_EVENT_TYPES.get(event_type, event_type),
         'timestamp': timestamp,
@@ -73,6 +74,14 @@ def send_webhook(event_rule, object_type, event_type, data, timestamp, username,
     if callback_data:
         context['context'] = callback_data
 
+    return context
+
+
+def deliver_webhook(webhook, context, body=None):
+    """
+    Render and send the HTTP request for a webhook using the given context. If a body is not provided, it will be
+    rendered from the webhook's body template.
+    """
     # Build the headers for the HTTP request
     headers = {
         'Content-Type': webhook.http_content_type,
@@ -84,11 +93,12 @@ def send_webhook(event_rule, object_type, event_type, data, timestamp, username,
         raise e
 
     # Render the request body
-    try:
-        body = webhook.render_body(context)
-    except TemplateError as e:
-        logger.error(f"Error rendering request body for webhook {webhook}: {e}")
-        raise e
+    if body is None:
+        try:
+            body = webhook.render_body(context)
+        except TemplateError as e:
+            logger.error(f"Error rendering request body for webhook {webhook}: {e}")
+            raise e
 
     # Prepare the HTTP request
     url = webhook.render_payload_url(context)
@@ -99,7 +109,7 @@ def send_webhook(event_rule, object_type, event_type, data, timestamp, username,
         'data': body.encode('utf8'),
     }
     logger.info(
-        f"Sending {params['method']} request to {params['url']} ({context['object_type']} {context['event']})"
+        f"Sending {params['method']} request to {params['url']} ({context.get('object_type')} {context.get('event')})"
     )
     logger.debug(params)
     try:
@@ -128,3 +138,45 @@ def send_webhook(event_rule, object_type, event_type, data, timestamp, username,
         raise requests.exceptions.RequestException(
             f"Status {response.status_code} returned with content '{response.content}', webhook FAILED to process."
         )
+
+
+@job('default')
+def send_webhook(event_rule, object_type, event_type, data, timestamp, username, request=None, snapshots=None):
+    """
+    Make a POST request to the defined Webhook
+    """
+    webhook = event_rule.action_object
+    context = get_webhook_context(object_type, event_type, data, timestamp, username, request, snapshots)
+
+    return deliver_webhook(webhook, context)
+
+
+@job('default')
+def send_webhook_batch(webhook, events, timestamp):
+    """
+    Make a single request to the defined Webhook conveying multiple events. Each item in `events` is a dictionary of
+    the keyword arguments which would otherwise be passed to send_webhook() (less the timestamp).
+
+    The webhook's URL, headers, and body template are rendered once with the context of the first event in the batch,
+    extended with the batch's `timestamp` and the list of per-event contexts as `events`. If the webhook does not define
+    a body template, the request body is a JSON array of the per-event contexts.
+    """
+    contexts = [
+        get_webhook_context(
+            object_type=event['object_type'],
+            event_type=event['event_type'],
+            data=event['data'],
+            timestamp=event.get('timestamp', timestamp),
+            username=event['username'],
+            request=event.get('request'),
+            snapshots=event.get('snapshots'),
+        ) for event in events
+    ]
+    context = {
+        **contexts[0],
+        'timestamp': timestamp,
+        'events': contexts,
+    }
+    body = None if webhook.body_template else json.dumps(contexts, cls=JSONEncoder)
+
+    return deliver_webhook(webhook, context, body=body)
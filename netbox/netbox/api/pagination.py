@@ -1,5 +1,11 @@
-from django.db.models import QuerySet
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q, QuerySet
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from netbox.api.exceptions import QuerySetNotOrdered
 from netbox.config import get_config
@@ -10,9 +16,20 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
     Override the stock paginator to allow setting limit=0 to disable pagination for a request. This returns all objects
     matching a query, but retains the same format as a paginated request. The limit can only be disabled if
     MAX_PAGE_SIZE has been set to 0 or None.
+
+    Cursor (keyset) pagination can be requested by passing the `cursor` query parameter (empty for the first page).
+    Results are then ordered by the requested ordering field (if any) and primary key, and each page is retrieved by
+    filtering on the values of the last object in the previous page rather than by offset. The total count is
+    omitted unless `count=true` is also passed.
     """
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
     def __init__(self):
         self.default_limit = get_config().PAGINATE_COUNT
+        self.cursor = None
+        self.next_cursor = None
 
     def paginate_queryset(self, queryset, request, view=None):
 
@@ -22,6 +39,9 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
                 "ordering has been applied to the queryset for this API endpoint."
             )
 
+        if isinstance(queryset, QuerySet) and self.cursor_query_param in request.query_params:
+            return self.paginate_queryset_by_cursor(queryset, request)
+
         if isinstance(queryset, QuerySet):
             self.count = self.get_queryset_count(queryset)
         else:
@@ -70,12 +90,126 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
     def get_queryset_count(self, queryset):
         return queryset.count()
 
+    def paginate_queryset_by_cursor(self, queryset, request):
+        """
+        Return a page of results following the position encoded in the request's cursor.
+        """
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.offset = 0
+        self.cursor = self.decode_cursor(request.query_params[self.cursor_query_param])
+
+        # Count matching objects only if explicitly requested
+        if request.query_params.get(self.count_query_param, '').lower() == 'true':
+            self.count = self.get_queryset_count(queryset)
+        else:
+            self.count = None
+
+        # Order by the key field (if any) and primary key, and resume following the position of the cursor
+        key_field, descending = self.get_cursor_key(queryset, request)
+        queryset = queryset.order_by(*self.get_cursor_ordering(key_field, descending))
+        if self.cursor is not None:
+            queryset = queryset.filter(self.get_cursor_filter(key_field, descending, *self.cursor))
+
+        if not self.limit:
+            return list(queryset)
+
+        # Fetch one additional object to determine whether a next page exists
+        results = list(queryset[:self.limit + 1])
+        if len(results) > self.limit:
+            results = results[:self.limit]
+            last = results[-1]
+            value = getattr(last, key_field.attname) if key_field else None
+            self.next_cursor = (
+                key_field.value_to_string(last) if value is not None else None,
+                last.pk
+            )
+        return results
+
+    def get_cursor_key(self, queryset, request):
+        """
+        Return the model field (if any) by which results are ordered ahead of the primary key, and a boolean indicating
+        whether the ordering is descending.
+        """
+        ordering = [f for f in request.query_params.get('ordering', '').split(',') if f.strip()]
+        if not ordering:
+            return None, False
+        if len(ordering) > 1:
+            raise ValidationError({'ordering': 'Cursor pagination supports ordering by only a single field.'})
+
+        name = ordering[0].strip()
+        descending = name.startswith('-')
+        try:
+            field = queryset.model._meta.get_field(name.lstrip('-'))
+        except FieldDoesNotExist:
+            field = None
+        if field is None or not field.concrete or field.many_to_many:
+            raise ValidationError({'ordering': f'Cursor pagination does not support ordering by "{name}".'})
+        if field.primary_key:
+            return None, descending
+
+        return field, descending
+
+    @staticmethod
+    def get_cursor_ordering(key_field, descending):
+        pk = '-pk' if descending else 'pk'
+        if key_field is None:
+            return [pk]
+        if descending:
+            return [F(key_field.attname).desc(nulls_first=True), pk]
+        return [F(key_field.attname).asc(nulls_last=True), pk]
+
+    @staticmethod
+    def get_cursor_filter(key_field, descending, value, pk):
+        """
+        Return a Q object matching all objects which follow the given position.
+        """
+        pk_lookup = 'pk__lt' if descending else 'pk__gt'
+        if key_field is None:
+            return Q(**{pk_lookup: pk})
+
+        name = key_field.attname
+        if descending:
+            # Nulls are ordered first
+            if value is None:
+                return Q(**{f'{name}__isnull': True, pk_lookup: pk}) | Q(**{f'{name}__isnull': False})
+            return Q(**{f'{name}__lt': value}) | Q(**{name: value, pk_lookup: pk})
+
+        # Nulls are ordered last
+        if value is None:
+            return Q(**{f'{name}__isnull': True, pk_lookup: pk})
+        return Q(**{f'{name}__gt': value}) | Q(**{name: value, pk_lookup: pk}) | Q(**{f'{name}__isnull': True})
+
+    def encode_cursor(self, position):
+        data = json.dumps(position, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """
+        Decode the opaque cursor string into a two-tuple of (value, pk), or None to indicate the first page.
+        """
+        if not cursor:
+            return None
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            if value is not None and not isinstance(value, str):
+                raise ValueError()
+            return value, int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
     def get_next_link(self):
 
         # Pagination has been disabled
         if not self.limit:
             return None
 
+        if self.cursor_query_param in self.request.query_params:
+            if self.next_cursor is None:
+                return None
+            url = remove_query_param(self.request.build_absolute_uri(), self.offset_query_param)
+            return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_cursor))
+
         return super().get_next_link()
 
     def get_previous_link(self):
@@ -84,8 +218,40 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         if not self.limit:
             return None
 
+        # Cursor pagination proceeds only forward
+        if self.cursor_query_param in self.request.query_params:
+            return None
+
         return super().get_previous_link()
 
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Enables cursor pagination. Leave empty to retrieve the first page.',
+                'schema': {
+                    'type': 'string',
+                },
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Include the total count of objects when using cursor pagination.',
+                'schema': {
+                    'type': 'boolean',
+                },
+            },
+        ]
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties']['count']['nullable'] = True
+        return schema
+
 
 class StripCountAnnotationsPaginator(OptionalLimitOffsetPagination):
     """
@@ -3,15 +3,17 @@ from functools import cached_property
 
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from django.db import router, transaction
-from django.db.models import ProtectedError, RestrictedError
+from django.db.models import ProtectedError, QuerySet, RestrictedError
 from django_pglocks import advisory_lock
 from rest_framework import mixins as drf_mixins
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from extras.models import CustomField
 from netbox.api.serializers.features import ChangeLogMessageSerializer
 from netbox.constants import ADVISORY_LOCK_KEYS
+from netbox.models.features import CustomFieldsMixin
 from utilities.api import get_annotations_for_serializer, get_prefetches_for_serializer
 from utilities.exceptions import AbortRequest
 from utilities.query import reapply_model_ordering
@@ -68,6 +70,18 @@ class BaseViewSet(GenericViewSet):
 
         return qs
 
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+
+        # Retrieve all objects referenced by object & multi-object custom fields on the current page
+        if page is not None and isinstance(queryset, QuerySet) and issubclass(queryset.model, CustomFieldsMixin):
+            fields = self.field_kwargs.get('fields')
+            omit = self.field_kwargs.get('omit', [])
+            if ('custom_fields' in fields) if fields else ('custom_fields' not in omit):
+                CustomField.objects.prefetch_objects(page)
+
+        return page
+
     def get_serializer(self, *args, **kwargs):
         # Pass the fields/omit kwargs (if specified by the request) to the serializer
         kwargs.update(**self.field_kwargs)
@@ -43,6 +43,9 @@ ADVISORY_LOCK_KEYS = {
 
     # Jobs
     'job-schedules': 110100,
+
+    # Data sources
+    'data-source-mirror': 115100,
 }
 
 # TODO: Remove in NetBox v4.5
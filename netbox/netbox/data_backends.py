@@ -16,10 +16,14 @@ class DataBackend:
         is_local: A boolean indicating whether this backend accesses local data
         parameters: A dictionary mapping configuration form field names to their classes
         sensitive_parameters: An iterable of field names for which the values should not be displayed to the user
+        revision: The revision (e.g. commit hash) of the most recently fetched data, if supported by the backend
+        hash_workers: The number of threads to use when hashing files during synchronization (None to hash serially)
     """
     is_local = False
     parameters = {}
     sensitive_parameters = []
+    revision = None
+    hash_workers = None
 
     # Prevent Django's template engine from calling the backend
     # class when referenced via DataSource.backend_class
@@ -51,3 +55,11 @@ class DataBackend:
         3. Performs any necessary cleanup
         """
         raise NotImplementedError()
+
+    def get_changes(self, since):
+        """
+        Return a two-tuple of sets containing the paths (relative to the local root) of files which have been
+        updated (created or modified) and deleted since the given revision. Must be called within the `fetch()`
+        context. Returns None if the changes cannot be determined, in which case all files must be compared.
+        """
+        return None
@@ -187,6 +187,26 @@ class JobRunner(ABC):
 
         return cls.enqueue(instance=instance, schedule_at=schedule_at, interval=interval, *args, **kwargs)
 
+    @classmethod
+    def enqueue_unless_pending(cls, instance=None, *args, **kwargs):
+        """
+        Enqueue a new `Job`, unless a one-off job of this class is already pending (or scheduled) for `instance`.
+        Unlike `enqueue_once()`, this does not affect any periodic schedule set up for the job.
+
+        For additional parameters see `enqueue()`.
+
+        Args:
+            instance: The NetBox object to which this job pertains (optional)
+        """
+        job = cls.get_jobs(instance).filter(
+            status__in=(JobStatusChoices.STATUS_PENDING, JobStatusChoices.STATUS_SCHEDULED),
+            interval__isnull=True
+        ).first()
+        if job:
+            return job
+
+        return cls.enqueue(instance=instance, *args, **kwargs)
+
 
 class AsyncViewJob(JobRunner):
     """
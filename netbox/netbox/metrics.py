@@ -1,6 +1,7 @@
+from django.conf import settings
 from django_prometheus.conf import NAMESPACE
 from django_prometheus import middleware
-from prometheus_client import Counter
+from prometheus_client import Counter, Gauge
 
 __all__ = (
     'Metrics',
@@ -38,3 +39,13 @@ class Metrics(middleware.Metrics):
             "Count of total GraphQL API requests",
             namespace=NAMESPACE,
         )
+
+        # Search cache metrics (published by SearchCacheUpdateJob)
+        if settings.SEARCH_CACHE_DELAY is not None:
+            self.search_cache_staleness = self.register_metric(
+                Gauge,
+                "search_cache_staleness_seconds",
+                "Age of the oldest pending search cache update",
+                namespace=NAMESPACE,
+                multiprocess_mode="mostrecent",
+            )
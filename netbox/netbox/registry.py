@@ -22,6 +22,7 @@ class Registry(dict):
 
 # Initialize the global registry
 registry = Registry({
+    'counter_conditions': collections.defaultdict(dict),
     'counter_fields': collections.defaultdict(dict),
     'data_backends': dict(),
     'denormalized_fields': collections.defaultdict(list),
@@ -34,6 +35,7 @@ registry = Registry({
     'search': dict(),
     'system_jobs': dict(),
     'tables': collections.defaultdict(dict),
+    'tracked_fields': collections.defaultdict(set),
     'views': collections.defaultdict(dict),
     'webhook_callbacks': list(),
     'widgets': dict(),
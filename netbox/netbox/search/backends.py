@@ -1,20 +1,26 @@
 from collections import defaultdict
+from datetime import timedelta
+from itertools import batched, pairwise
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import TrigramSimilarity
 from django.core.exceptions import ImproperlyConfigured
-from django.db.models import F, Window, Q, prefetch_related_objects
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import F, Max, Min, Window, Q, prefetch_related_objects
 from django.db.models.fields.related import ForeignKey
 from django.db.models.functions import window
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.utils import timezone
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
 import netaddr
 from netaddr.core import AddrFormatError
 
 from core.models import ObjectType
-from extras.models import CachedValue, CustomField
+from extras.models import CachedValue, CachedValueUpdate, CustomField
 from netbox.registry import registry
+from netbox.signals import post_bulk_create
 from utilities.object_types import object_type_identifier
 from utilities.querysets import RestrictedPrefetch
 from utilities.string import title
@@ -22,6 +28,9 @@ from . import FieldTypes, LookupTypes, get_indexer
 
 DEFAULT_LOOKUP_TYPE = LookupTypes.PARTIAL
 MAX_RESULTS = 1000
+REINDEX_PARTITION_SIZE = 10000
+REINDEX_TABLE = 'extras_cachedvalue_reindex'
+REINDEX_PARTITION_TABLE = 'extras_cachedvalue_reindex_partition'
 
 
 class SearchBackend:
@@ -29,6 +38,7 @@ class SearchBackend:
     Base class for search backends. Subclasses must extend the `cache()`, `remove()`, and `clear()` methods below.
     """
     _object_types = None
+    _update_scheduled = None
 
     def get_object_types(self):
         """
@@ -62,14 +72,109 @@ class SearchBackend:
         """
         Receiver for the post_save signal, responsible for caching object creation/changes.
         """
+        # Objects created in bulk are handled by bulk_caching_handler()
+        if kwargs.get('bulk'):
+            return
+        if settings.SEARCH_CACHE_DELAY is not None:
+            return self.defer(instance)
         self.cache(instance, remove_existing=not created)
 
+    def bulk_caching_handler(self, sender, instances, **kwargs):
+        """
+        Receiver for the post_bulk_create signal, responsible for caching the creation of many objects at once.
+        """
+        if settings.SEARCH_CACHE_DELAY is not None:
+            return self.defer(instances)
+        self.cache(instances, remove_existing=False)
+
     def removal_handler(self, sender, instance, **kwargs):
         """
         Receiver for the post_delete signal, responsible for caching object deletion.
         """
+        if settings.SEARCH_CACHE_DELAY is not None:
+            return self.defer(instance)
         self.remove(instance)
 
+    def defer(self, instances):
+        """
+        Record one or more instances (of the same model) whose cached representations are to be updated by a
+        background job, and schedule the job (if not already scheduled) to run once SEARCH_CACHE_DELAY has elapsed.
+        """
+        # Convert a single instance to an iterable
+        if not hasattr(instances, '__iter__'):
+            instances = [instances]
+        if not instances:
+            return
+
+        # Avoid recording non-cacheable objects
+        try:
+            get_indexer(instances[0])
+        except KeyError:
+            return
+
+        object_type = ContentType.objects.get_for_model(instances[0])
+        CachedValueUpdate.objects.bulk_create([
+            CachedValueUpdate(object_type=object_type, object_id=instance.pk) for instance in instances
+        ])
+        transaction.on_commit(self._schedule_update)
+
+    def _schedule_update(self):
+        from extras.jobs import SearchCacheUpdateJob
+
+        # Skip querying for a pending job if one is already known to be scheduled for later
+        now = timezone.now()
+        if self._update_scheduled and self._update_scheduled > now:
+            return
+
+        delay = settings.SEARCH_CACHE_DELAY
+        job = SearchCacheUpdateJob.enqueue_unless_pending(
+            schedule_at=now + timedelta(seconds=delay) if delay else None
+        )
+        self._update_scheduled = job.scheduled
+
+    def update_deferred(self, batch_size=1000):
+        """
+        Update the cached representations of all objects recorded by defer(), in batches of the specified size.
+        Returns the number of objects updated.
+        """
+        last_pk = CachedValueUpdate.objects.aggregate(Max('pk'))['pk__max']
+        if last_pk is None:
+            return 0
+        count = 0
+
+        while updates := list(
+            CachedValueUpdate.objects.filter(pk__lte=last_pk).values_list('pk', 'object_type', 'object_id')[:batch_size]
+        ):
+            # Coalesce multiple updates to the same object
+            pending = defaultdict(set)
+            for _pk, object_type_id, object_id in updates:
+                pending[object_type_id].add(object_id)
+
+            with transaction.atomic():
+                for object_type_id, pks in pending.items():
+                    object_type = ObjectType.objects.get_for_id(object_type_id)
+                    if object_type_identifier(object_type) in registry['search']:
+                        self.refresh(object_type.model_class(), pks)
+                    count += len(pks)
+                CachedValueUpdate.objects.filter(pk__in=[update[0] for update in updates]).delete()
+
+        return count
+
+    def get_staleness(self):
+        """
+        Return the age (in seconds) of the oldest pending update recorded by defer(), or zero if there are none.
+        """
+        if oldest := CachedValueUpdate.objects.aggregate(Min('timestamp'))['timestamp__min']:
+            return (timezone.now() - oldest).total_seconds()
+        return 0
+
+    def migration_handler(self, sender, **kwargs):
+        """
+        Receiver for the post_migrate signal. Backends may extend this to create any database objects (e.g. indexes)
+        on which they rely.
+        """
+        pass
+
     def cache(self, instances, indexer=None, remove_existing=True):
         """
         Create or update the cached representation of an instance.
@@ -82,6 +187,15 @@ class SearchBackend:
         """
         raise NotImplementedError
 
+    def refresh(self, model, pks):
+        """
+        Update the cached representations of the specified objects, removing those of any which no longer exist.
+        """
+        instances = get_indexer(model).get_queryset().filter(pk__in=pks)
+        for pk in set(pks) - {instance.pk for instance in instances}:
+            self.remove(model(pk=pk))
+        return self.cache(instances)
+
     def clear(self, object_types=None):
         """
         Delete *all* cached data (optionally filtered by object type).
@@ -107,26 +221,8 @@ class CachedValueSearchBackend(SearchBackend):
 
     def search(self, value, user=None, object_types=None, lookup=DEFAULT_LOOKUP_TYPE):
 
-        # Build the filter used to find relevant CachedValue records
-        query_filter = Q(**{f'value__{lookup}': value})
-        if object_types:
-            # Limit results by object type
-            query_filter &= Q(object_type__in=object_types)
-        if lookup in (LookupTypes.STARTSWITH, LookupTypes.ENDSWITH):
-            # "Starts/ends with" matches are valid only on string values
-            query_filter &= Q(type=FieldTypes.STRING)
-        elif lookup in (LookupTypes.PARTIAL, LookupTypes.EXACT):
-            try:
-                # If the value looks like an IP address, add extra filters for CIDR/INET values
-                address = str(netaddr.IPNetwork(value.strip()).cidr)
-                query_filter |= Q(type=FieldTypes.INET) & Q(value__net_host=address)
-                if lookup == LookupTypes.PARTIAL:
-                    query_filter |= Q(type=FieldTypes.CIDR) & Q(value__net_contains_or_equals=address)
-            except (AddrFormatError, ValueError):
-                pass
-
         # Construct the base queryset to retrieve matching results
-        queryset = CachedValue.objects.filter(query_filter).annotate(
+        queryset = CachedValue.objects.filter(self._get_query_filter(value, object_types, lookup)).annotate(
             # Annotate the rank of each result for its object according to its weight
             row_number=Window(
                 expression=window.RowNumber(),
@@ -139,26 +235,60 @@ class CachedValueSearchBackend(SearchBackend):
         # objects). This must be done before generating the final results list, which returns
         # a RawQuerySet.
         object_type_ids = set(queryset.values_list('object_type', flat=True))
-        object_types = ObjectType.objects.filter(pk__in=object_type_ids)
-
-        # Construct a Prefetch to pre-fetch only those related objects for which the
-        # user has permission to view.
-        if user:
-            prefetch = (RestrictedPrefetch('object', user, 'view'), 'object_type')
-        else:
-            prefetch = ('object', 'object_type')
 
         # Wrap the base query to return only the lowest-weight result for each object
         # Hat-tip to https://blog.oyam.dev/django-filter-by-window-function/ for the solution
         sql, params = queryset.query.sql_with_params()
-        results = CachedValue.objects.prefetch_related(*prefetch).raw(
+        results = CachedValue.objects.prefetch_related(*self._get_prefetches(user)).raw(
             f"SELECT * FROM ({sql}) t WHERE row_number = 1",
             params
         )
 
+        return self._process_results(results, object_type_ids)
+
+    @staticmethod
+    def _get_query_filter(value, object_types=None, lookup=DEFAULT_LOOKUP_TYPE):
+        """
+        Return the Q object used to find CachedValue records matching the given value.
+        """
+        query_filter = Q(**{f'value__{lookup}': value})
+        if object_types:
+            # Limit results by object type
+            query_filter &= Q(object_type__in=object_types)
+        if lookup in (LookupTypes.STARTSWITH, LookupTypes.ENDSWITH):
+            # "Starts/ends with" matches are valid only on string values
+            query_filter &= Q(type=FieldTypes.STRING)
+        elif lookup in (LookupTypes.PARTIAL, LookupTypes.EXACT):
+            try:
+                # If the value looks like an IP address, add extra filters for CIDR/INET values
+                address = str(netaddr.IPNetwork(value.strip()).cidr)
+                query_filter |= Q(type=FieldTypes.INET) & Q(value__net_host=address)
+                if lookup == LookupTypes.PARTIAL:
+                    query_filter |= Q(type=FieldTypes.CIDR) & Q(value__net_contains_or_equals=address)
+            except (AddrFormatError, ValueError):
+                pass
+
+        return query_filter
+
+    @staticmethod
+    def _get_prefetches(user=None):
+        """
+        Return the lookups to prefetch for search results. If a user is specified, only related objects which the
+        user has permission to view are prefetched.
+        """
+        if user:
+            return RestrictedPrefetch('object', user, 'view'), 'object_type'
+        return 'object', 'object_type'
+
+    @staticmethod
+    def _process_results(results, object_type_ids):
+        """
+        Prefetch any related objects necessary to render the search results, and omit those results pertaining to
+        an object the user does not have permission to view.
+        """
         # Iterate through each ObjectType represented in the search results and prefetch any
         # related objects necessary to render the prescribed display attributes (display_attrs).
-        for object_type in object_types:
+        for object_type in ObjectType.objects.filter(pk__in=object_type_ids):
             model = object_type.model_class()
             indexer = registry['search'].get(object_type_identifier(object_type))
             if not (display_attrs := getattr(indexer, 'display_attrs', None)):
@@ -187,61 +317,63 @@ class CachedValueSearchBackend(SearchBackend):
         return ret
 
     def cache(self, instances, indexer=None, remove_existing=True):
-        custom_fields = None
 
         # Convert a single instance to an iterable
         if not hasattr(instances, '__iter__'):
             instances = [instances]
 
-        buffer = []
+        # Wipe out any previously cached values for each object
+        if remove_existing:
+            instances = self._remove_existing(instances)
+
         counter = 0
+        for batch in batched(self.get_cached_values(instances, indexer=indexer), 2000):
+            counter += len(CachedValue.objects.bulk_create(batch))
+
+        return counter
+
+    def _remove_existing(self, instances):
+        for instance in instances:
+            self.remove(instance)
+            yield instance
+
+    def get_cached_values(self, instances, indexer=None):
+        """
+        Generate the (unsaved) CachedValue records representing each of the given instances, which must all be of the
+        same model.
+        """
+        custom_fields = None
+        object_type = None
+
         for instance in instances:
 
             # First item
-            if not counter:
+            if object_type is None:
 
                 # Determine the indexer
                 if indexer is None:
                     try:
                         indexer = get_indexer(instance)
                     except KeyError:
-                        break
+                        return
 
                 # Prefetch any associated custom fields (excluding those with a zero search weight)
                 custom_fields = [
                     cf for cf in CustomField.objects.get_for_model(indexer.model)
                     if cf.search_weight > 0
                 ]
+                object_type = ObjectType.objects.get_for_model(indexer.model)
 
-            # Wipe out any previously cached values for the object
-            if remove_existing:
-                self.remove(instance)
-
-            # Generate cache data
-            object_type = ObjectType.objects.get_for_model(indexer.model)
             for field in indexer.to_cache(instance, custom_fields=custom_fields):
-                buffer.append(
-                    CachedValue(
-                        object_type=object_type,
-                        object_id=instance.pk,
-                        field=field.name,
-                        type=field.type,
-                        weight=field.weight,
-                        value=field.value
-                    )
+                yield CachedValue(
+                    object_type=object_type,
+                    object_id=instance.pk,
+                    field=field.name,
+                    type=field.type,
+                    weight=field.weight,
+                    value=field.value
                 )
 
-            # Check whether the buffer needs to be flushed
-            if len(buffer) >= 2000:
-                counter += len(CachedValue.objects.bulk_create(buffer))
-                buffer = []
-
-        # Final buffer flush
-        if buffer:
-            counter += len(CachedValue.objects.bulk_create(buffer))
-
-        return counter
-
     def remove(self, instance):
         # Avoid attempting to query for non-cacheable objects
         try:
@@ -255,6 +387,13 @@ class CachedValueSearchBackend(SearchBackend):
         # Call _raw_delete() on the queryset to avoid first loading instances into memory
         return qs._raw_delete(using=qs.db)
 
+    def refresh(self, model, pks):
+        indexer = get_indexer(model)
+        qs = CachedValue.objects.filter(object_type=ContentType.objects.get_for_model(model), object_id__in=pks)
+        qs._raw_delete(using=qs.db)
+
+        return self.cache(indexer.get_queryset().filter(pk__in=pks), indexer=indexer, remove_existing=False)
+
     def clear(self, object_types=None):
         qs = CachedValue.objects.all()
         if object_types:
@@ -273,6 +412,186 @@ class CachedValueSearchBackend(SearchBackend):
     def size(self):
         return CachedValue.objects.count()
 
+    #
+    # Reindexing
+    #
+
+    def start_reindex(self, models, partition_size=REINDEX_PARTITION_SIZE):
+        """
+        Prepare to rebuild the cached values of the given models. Cached values are first written to a shadow table,
+        one partition (a range of primary keys spanning roughly `partition_size` objects) at a time; the progress of
+        each partition is recorded, so that an interrupted rebuild can be resumed.
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {REINDEX_TABLE}, {REINDEX_PARTITION_TABLE}')
+            cursor.execute(f'CREATE UNLOGGED TABLE {REINDEX_TABLE} (LIKE {CachedValue._meta.db_table})')
+            cursor.execute(
+                f'CREATE UNLOGGED TABLE {REINDEX_PARTITION_TABLE} ('
+                f'object_type_id integer NOT NULL, start_id bigint NOT NULL, end_id bigint, timestamp timestamptz)'
+            )
+
+            for model in models:
+                object_type = ObjectType.objects.get_for_model(model)
+                pk_column = model._meta.pk.column
+
+                # Split the model's objects into partitions of equal size. The first and last partitions are
+                # unbounded, so that every object (including any created during the rebuild) falls within one.
+                cursor.execute(
+                    f'SELECT {pk_column} FROM ('
+                    f'SELECT {pk_column}, row_number() OVER (ORDER BY {pk_column}) AS n FROM {model._meta.db_table}'
+                    f') t WHERE n %% %s = 1 AND n > 1',
+                    [partition_size]
+                )
+                boundaries = [0, *(row[0] for row in cursor.fetchall()), None]
+                cursor.executemany(
+                    f'INSERT INTO {REINDEX_PARTITION_TABLE} (object_type_id, start_id, end_id) VALUES (%s, %s, %s)',
+                    [(object_type.pk, start, end) for start, end in pairwise(boundaries)]
+                )
+
+    def get_reindex_partitions(self):
+        """
+        Return a list of the (object_type_id, start_id, end_id) partitions of the current rebuild which have not yet
+        been cached, or None if no rebuild is in progress.
+        """
+        if REINDEX_PARTITION_TABLE not in connection.introspection.table_names():
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT object_type_id, start_id, end_id FROM {REINDEX_PARTITION_TABLE} '
+                f'WHERE timestamp IS NULL ORDER BY object_type_id, start_id'
+            )
+            return cursor.fetchall()
+
+    def cache_partition(self, object_type_id, start_id, end_id):
+        """
+        Write the cached values for a partition of objects to the shadow table, and mark the partition as complete.
+        Returns the number of values cached.
+        """
+        indexer = get_indexer(ObjectType.objects.get_for_id(object_type_id).model_class())
+        queryset = indexer.get_queryset().filter(pk__gte=start_id)
+        if end_id is not None:
+            queryset = queryset.filter(pk__lt=end_id)
+
+        with transaction.atomic():
+            # Record when the objects were retrieved. Any cached values written after this point (e.g. because an
+            # object was modified during the rebuild) take precedence over those generated here.
+            timestamp = timezone.now()
+
+            # Values must be fully generated before starting the COPY, which precludes any other queries
+            values = [
+                (cv.id, timestamp, object_type_id, cv.object_id, cv.field, cv.type, str(cv.value), cv.weight)
+                for cv in self.get_cached_values(queryset.iterator(), indexer=indexer)
+            ]
+            with connection.cursor() as cursor:
+                with cursor.copy(
+                    f'COPY {REINDEX_TABLE} (id, timestamp, object_type_id, object_id, field, type, value, weight) '
+                    f'FROM STDIN'
+                ) as copy:
+                    for row in values:
+                        copy.write_row(row)
+                cursor.execute(
+                    f'UPDATE {REINDEX_PARTITION_TABLE} SET timestamp = %s '
+                    f'WHERE object_type_id = %s AND start_id = %s',
+                    [timestamp, object_type_id, start_id]
+                )
+
+        return len(values)
+
+    def finish_reindex(self):
+        """
+        Replace the cached values of all rebuilt object types with the contents of the shadow table in a single
+        transaction, so that searches continue to return results throughout the rebuild. Cached values for models
+        which no longer have a registered indexer are removed as well. Returns the number of values cached.
+        """
+        table = CachedValue._meta.db_table
+        object_type_ids = [
+            ObjectType.objects.get_for_model(indexer.model).pk for indexer in registry['search'].values()
+        ]
+        # Matches a cached value written after its object's partition was rebuilt
+        newer_value = (
+            'p.object_type_id = cv.object_type_id AND cv.object_id >= p.start_id AND '
+            '(p.end_id IS NULL OR cv.object_id < p.end_id) AND cv.timestamp > p.timestamp'
+        )
+
+        with transaction.atomic(), connection.cursor() as cursor:
+
+            # Discard rebuilt values for any objects which have since been deleted or re-cached
+            cursor.execute(f'SELECT DISTINCT object_type_id FROM {REINDEX_PARTITION_TABLE}')
+            for object_type_id, in cursor.fetchall():
+                model = ObjectType.objects.get_for_id(object_type_id).model_class()
+                cursor.execute(
+                    f'DELETE FROM {REINDEX_TABLE} r WHERE object_type_id = %s AND NOT EXISTS '
+                    f'(SELECT 1 FROM {model._meta.db_table} o WHERE o.{model._meta.pk.column} = r.object_id)',
+                    [object_type_id]
+                )
+            cursor.execute(
+                f'DELETE FROM {REINDEX_TABLE} r USING {table} cv, {REINDEX_PARTITION_TABLE} p '
+                f'WHERE cv.object_type_id = r.object_type_id AND cv.object_id = r.object_id AND {newer_value}'
+            )
+            cursor.execute(
+                f'DELETE FROM {table} cv WHERE object_type_id IN '
+                f'(SELECT DISTINCT object_type_id FROM {REINDEX_PARTITION_TABLE}) AND NOT EXISTS '
+                f'(SELECT 1 FROM {REINDEX_PARTITION_TABLE} p WHERE {newer_value})'
+            )
+            cursor.execute(f'DELETE FROM {table} WHERE object_type_id <> ALL(%s)', [object_type_ids])
+            cursor.execute(
+                f'INSERT INTO {table} (id, timestamp, object_type_id, object_id, field, type, value, weight) '
+                f'SELECT id, timestamp, object_type_id, object_id, field, type, value, weight FROM {REINDEX_TABLE}'
+            )
+            count = cursor.rowcount
+            cursor.execute(f'DROP TABLE {REINDEX_TABLE}, {REINDEX_PARTITION_TABLE}')
+
+        return count
+
+
+class TrigramSearchBackend(CachedValueSearchBackend):
+    """
+    A variant of CachedValueSearchBackend which employs the PostgreSQL pg_trgm extension. Cached values are covered
+    by a trigram GIN index (created on migration), which serves partial, exact, and starts/ends with lookups. Results
+    are ranked by weight and then by their similarity to the search value.
+    """
+    index_name = 'extras_cachedvalue_value_trgm'
+
+    def search(self, value, user=None, object_types=None, lookup=DEFAULT_LOOKUP_TYPE):
+        similarity = TrigramSimilarity('value', value)
+
+        # Select the most relevant matching value for each object
+        matches = CachedValue.objects.filter(
+            self._get_query_filter(value, object_types, lookup)
+        ).annotate(
+            similarity=similarity
+        ).order_by(
+            'object_type', 'object_id', 'weight', '-similarity'
+        ).distinct(
+            'object_type', 'object_id'
+        )
+
+        results = list(
+            CachedValue.objects.filter(
+                pk__in=matches.values('pk')
+            ).annotate(
+                similarity=similarity
+            ).order_by(
+                'weight', '-similarity', 'object_type', 'object_id'
+            ).prefetch_related(
+                *self._get_prefetches(user)
+            )[:MAX_RESULTS]
+        )
+
+        return self._process_results(results, {r.object_type_id for r in results})
+
+    def migration_handler(self, sender, using=DEFAULT_DB_ALIAS, **kwargs):
+        if sender.label != 'extras':
+            return
+
+        # Install the pg_trgm extension and index cached values (this is a no-op if the index already exists)
+        with connections[using].schema_editor(atomic=False) as schema_editor:
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {schema_editor.quote_name(self.index_name)} "
+                f"ON {schema_editor.quote_name(CachedValue._meta.db_table)} USING gin (UPPER(value) gin_trgm_ops)"
+            )
+
 
 def get_backend():
     """
@@ -291,4 +610,6 @@ search_backend = get_backend()
 
 # Connect handlers to the appropriate model signals
 post_save.connect(search_backend.caching_handler)
+post_bulk_create.connect(search_backend.bulk_caching_handler)
 post_delete.connect(search_backend.removal_handler)
+post_migrate.connect(search_backend.migration_handler)
@@ -1,5 +1,39 @@
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_save
 from django.dispatch import Signal
 
+__all__ = (
+    'post_bulk_create',
+    'post_clean',
+    'send_post_bulk_create',
+)
+
 
 # Signals that a model has completed its clean() method
 post_clean = Signal()
+
+# Signals that a set of objects has been created in bulk (e.g. by bulk_create()). Receivers are passed the list of
+# newly created instances.
+post_bulk_create = Signal()
+
+
+def send_post_bulk_create(sender, instances, using=DEFAULT_DB_ALIAS):
+    """
+    Signal the creation of a set of objects by bulk_create(). post_bulk_create is sent once for all instances, allowing
+    receivers to process them together. post_save is then sent for each instance with bulk=True, for the benefit of
+    receivers which do not handle post_bulk_create; receivers which do should ignore these.
+    """
+    if not instances:
+        return
+
+    post_bulk_create.send(sender=sender, instances=instances, using=using)
+    for instance in instances:
+        post_save.send(
+            sender=sender,
+            instance=instance,
+            created=True,
+            raw=False,
+            using=using,
+            update_fields=None,
+            bulk=True
+        )
@@ -260,6 +260,22 @@ class NetBoxTable(BaseTable):
 
         super().__init__(*args, extra_columns=extra_columns, **kwargs)
 
+    def paginate(self, *args, **kwargs):
+        super().paginate(*args, **kwargs)
+
+        # Retrieve all objects referenced by visible object & multi-object custom field columns on the current page
+        custom_fields = [
+            bound_column.column.customfield for bound_column in self.columns
+            if isinstance(bound_column.column, columns.CustomFieldColumn) and bound_column.column.customfield.type in (
+                CustomFieldTypeChoices.TYPE_OBJECT, CustomFieldTypeChoices.TYPE_MULTIOBJECT
+            )
+        ]
+        if custom_fields:
+            records = [row.record for row in self.page.object_list if hasattr(row.record, 'custom_field_data')]
+            CustomField.objects.prefetch_objects(records, custom_fields=custom_fields)
+
+        return self
+
     @cached_property
     def htmx_url(self):
         """
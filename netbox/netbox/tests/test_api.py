@@ -1,9 +1,10 @@
 import uuid
 
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
 from rest_framework.request import Request
 
+from dcim.models import Site
 from netbox.api.exceptions import QuerySetNotOrdered
 from netbox.api.pagination import OptionalLimitOffsetPagination
 from utilities.testing import APITestCase
@@ -80,3 +81,73 @@ class OptionalLimitOffsetPaginationTest(TestCase):
         request = self._make_drf_request()
 
         self.paginator.paginate_queryset(iterable, request)  # Should not raise exception
+
+
+class CursorPaginationTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', facility=f'Facility {i % 3}', latitude=i % 3 if i % 4 else None)
+            for i in range(1, 11)
+        ])
+
+    def _walk(self, url):
+        """
+        Follow next links from the given URL, returning the IDs of all objects retrieved.
+        """
+        ids = []
+        while url:
+            response = self.client.get(url, **self.header)
+            self.assertHttpStatus(response, 200)
+            self.assertIsNone(response.data['previous'])
+            self.assertLessEqual(len(response.data['results']), 3)
+            ids.extend(obj['id'] for obj in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_cursor_pagination(self):
+        url = reverse('dcim-api:site-list')
+        response = self.client.get(f'{url}?cursor=&limit=3', **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertIsNone(response.data['count'])
+        self.assertIn('cursor=', response.data['next'])
+        self.assertNotIn('offset=', response.data['next'])
+
+        ids = self._walk(f'{url}?cursor=&limit=3')
+        self.assertEqual(ids, list(Site.objects.order_by('pk').values_list('pk', flat=True)))
+
+        # Count is included only on request
+        response = self.client.get(f'{url}?cursor=&limit=3&count=true', **self.header)
+        self.assertEqual(response.data['count'], 10)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_cursor_pagination_ordering(self):
+        url = reverse('dcim-api:site-list')
+        for ordering in ('name', '-name', 'facility', '-facility', 'latitude', '-latitude'):
+            with self.subTest(ordering=ordering):
+                ids = self._walk(f'{url}?cursor=&limit=3&ordering={ordering}')
+                expected = Site.objects.order_by(ordering, 'pk' if ordering[0] != '-' else '-pk')
+                self.assertEqual(ids, list(expected.values_list('pk', flat=True)))
+
+        response = self.client.get(f'{url}?cursor=&ordering=name,slug', **self.header)
+        self.assertHttpStatus(response, 400)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_cursor_pagination_concurrent_insert(self):
+        url = reverse('dcim-api:site-list')
+        response = self.client.get(f'{url}?cursor=&limit=3&ordering=name', **self.header)
+        seen = [obj['id'] for obj in response.data['results']]
+
+        # An object created ahead of the cursor's position does not shift subsequent pages
+        Site.objects.create(name='Site 0', slug='site-0')
+        seen.extend(self._walk(response.data['next']))
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(len(seen), 10)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_invalid_cursor(self):
+        url = reverse('dcim-api:site-list')
+        response = self.client.get(f'{url}?cursor=invalid', **self.header)
+        self.assertHttpStatus(response, 404)
@@ -159,6 +159,24 @@ class EnqueueTest(JobRunnerTestCase):
         self.assertRaises(Job.DoesNotExist, job1.refresh_from_db)
         self.assertEqual(TestJobRunner.get_jobs(instance).count(), 1)
 
+    def test_enqueue_unless_pending(self):
+        job1 = TestJobRunner.enqueue_unless_pending()
+        job2 = TestJobRunner.enqueue_unless_pending()
+
+        self.assertEqual(job1, job2)
+        self.assertEqual(job1.status, JobStatusChoices.STATUS_PENDING)
+        self.assertEqual(TestJobRunner.get_jobs().count(), 1)
+
+    def test_enqueue_unless_pending_with_interval(self):
+        job1 = TestJobRunner.enqueue_once(schedule_at=self.get_schedule_at(), interval=60)
+        job2 = TestJobRunner.enqueue_unless_pending()
+
+        # The periodic job is retained
+        self.assertNotEqual(job1, job2)
+        job1.refresh_from_db()
+        self.assertEqual(job1.interval, 60)
+        self.assertEqual(TestJobRunner.get_jobs().count(), 2)
+
 
 class SystemJobTest(JobRunnerTestCase):
     """
@@ -1,10 +1,23 @@
+import uuid
+from datetime import timedelta
+from io import StringIO
+from unittest import SkipTest
+from unittest.mock import patch
+
+from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
 
+from core.choices import JobStatusChoices
+from core.models import Job
 from dcim.models import Site
 from dcim.search import SiteIndex
-from extras.models import CachedValue
-from netbox.search.backends import search_backend
+from extras.jobs import SearchCacheUpdateJob
+from extras.models import CachedValue, CachedValueUpdate
+from netbox.search.backends import CachedValueSearchBackend, TrigramSearchBackend, search_backend
 
 
 class SearchBackendTestCase(TestCase):
@@ -151,3 +164,158 @@ class SearchBackendTestCase(TestCase):
         self.assertEqual(len(results), 1)
         results = search_backend.search('xxxxx')
         self.assertEqual(len(results), 0)
+
+    def test_reindex(self):
+        """
+        Test rebuilding the cached values of a model partition by partition.
+        """
+        content_type = ContentType.objects.get_for_model(Site)
+        sites = Site.objects.order_by('pk')
+        search_backend.cache(sites)
+        CachedValue.objects.filter(object_type=content_type, field='comments').update(value='stale')
+
+        search_backend.start_reindex([Site], partition_size=2)
+        partitions = search_backend.get_reindex_partitions()
+        self.assertEqual(partitions, [
+            (content_type.pk, 0, sites[2].pk),
+            (content_type.pk, sites[2].pk, None),
+        ])
+
+        # Cache the first partition, and resume with the remainder
+        self.assertEqual(search_backend.cache_partition(*partitions[0]), len(SiteIndex.fields) * 2)
+        self.assertEqual(search_backend.get_reindex_partitions(), partitions[1:])
+        search_backend.cache_partition(*partitions[1])
+
+        # Existing values remain in place until the reindex is finished
+        self.assertTrue(CachedValue.objects.filter(value='stale').exists())
+        self.assertEqual(search_backend.finish_reindex(), len(SiteIndex.fields) * 3)
+        self.assertFalse(CachedValue.objects.filter(value='stale').exists())
+        self.assertEqual(CachedValue.objects.filter(object_type=content_type).count(), len(SiteIndex.fields) * 3)
+        self.assertIsNone(search_backend.get_reindex_partitions())
+
+    def test_reindex_preserves_newer_values(self):
+        """
+        Test that objects modified or deleted after their partition was reindexed are not overwritten.
+        """
+        content_type = ContentType.objects.get_for_model(Site)
+        search_backend.start_reindex([Site])
+        for partition in search_backend.get_reindex_partitions():
+            search_backend.cache_partition(*partition)
+
+        site1, site2 = Site.objects.order_by('pk')[:2]
+        site1.description = 'Modified'
+        site1.save()
+        site2.delete()
+
+        search_backend.finish_reindex()
+        self.assertEqual(CachedValue.objects.get(object_id=site1.pk, field='description').value, 'Modified')
+        self.assertFalse(CachedValue.objects.filter(object_id=site2.pk).exists())
+        self.assertEqual(CachedValue.objects.filter(object_type=content_type).count(), len(SiteIndex.fields) * 2)
+
+    def test_reindex_command(self):
+        call_command('reindex', 'dcim.site', partition_size=2, stdout=StringIO())
+
+        content_type = ContentType.objects.get_for_model(Site)
+        self.assertEqual(CachedValue.objects.filter(object_type=content_type).count(), len(SiteIndex.fields) * 3)
+
+    @override_settings(SEARCH_CACHE_DELAY=60)
+    def test_deferred_update(self):
+        """
+        Test that changes are recorded for a deferred update of the cache when SEARCH_CACHE_DELAY is set.
+        """
+        content_type = ContentType.objects.get_for_model(Site)
+        site = Site.objects.first()
+        site.save()
+        site.save()
+        self.assertFalse(CachedValue.objects.filter(object_type=content_type).exists())
+        self.assertEqual(CachedValueUpdate.objects.count(), 2)
+        self.assertGreater(search_backend.get_staleness(), 0)
+
+        # Multiple updates to the same object are coalesced
+        self.assertEqual(search_backend.update_deferred(), 1)
+        self.assertEqual(
+            CachedValue.objects.filter(object_type=content_type, object_id=site.pk).count(),
+            len(SiteIndex.fields)
+        )
+        self.assertFalse(CachedValueUpdate.objects.exists())
+        self.assertEqual(search_backend.get_staleness(), 0)
+
+        site.delete()
+        self.assertTrue(CachedValue.objects.filter(object_type=content_type).exists())
+        self.assertEqual(search_backend.update_deferred(), 1)
+        self.assertFalse(CachedValue.objects.filter(object_type=content_type).exists())
+
+    @override_settings(SEARCH_CACHE_DELAY=60)
+    def test_deferred_update_scheduling(self):
+        """
+        Test that only a single update job is scheduled for multiple changes.
+        """
+        backend = CachedValueSearchBackend()
+        with self.captureOnCommitCallbacks(execute=True):
+            for site in Site.objects.all():
+                backend.defer(site)
+
+        job = Job.objects.get(name=SearchCacheUpdateJob.name)
+        self.assertEqual(job.status, JobStatusChoices.STATUS_SCHEDULED)
+        self.assertEqual(backend._update_scheduled, job.scheduled)
+
+    @override_settings(SEARCH_CACHE_DELAY=60, METRICS_ENABLED=True)
+    def test_deferred_update_metrics(self):
+        """
+        Test that the update job publishes the age of the oldest update it processes.
+        """
+        search_backend.defer(Site.objects.first())
+        CachedValueUpdate.objects.update(timestamp=timezone.now() - timedelta(minutes=5))
+        job = Job.objects.create(name=SearchCacheUpdateJob.name, job_id=uuid.uuid4())
+        with patch('extras.jobs.Metrics.get_instance') as mock_get_instance:
+            SearchCacheUpdateJob(job).run()
+        self.assertFalse(CachedValueUpdate.objects.exists())
+        mock_set = mock_get_instance.return_value.search_cache_staleness.set
+        mock_set.assert_called_once()
+        self.assertGreaterEqual(mock_set.call_args.args[0], 300)
+
+
+class TrigramSearchBackendTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+            if cursor.fetchone() is None:
+                raise SkipTest("The pg_trgm extension is not available")
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.backend = TrigramSearchBackend()
+        cls.backend.migration_handler(apps.get_app_config('extras'))
+
+        sites = (
+            Site(name='Alpha Bravo Charlie', slug='site-1', description='First test site'),
+            Site(name='Alpha', slug='site-2', description='Second test site'),
+            Site(name='Site 3', slug='site-3', description='Third test site'),
+        )
+        Site.objects.bulk_create(sites)
+        cls.backend.cache(Site.objects.all())
+
+    def test_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = %s", [TrigramSearchBackend.index_name])
+            self.assertIsNotNone(cursor.fetchone())
+
+    def test_search(self):
+        self.assertEqual(len(self.backend.search('site')), 3)
+        self.assertEqual(len(self.backend.search('first')), 1)
+        self.assertEqual(len(self.backend.search('xxxxx')), 0)
+        self.assertEqual(len(self.backend.search('site', object_types=[ContentType.objects.get_for_model(Site)])), 3)
+
+    def test_search_returns_best_match_per_object(self):
+        results = self.backend.search('site')
+        self.assertEqual(
+            sorted((r.object.slug, r.field) for r in results),
+            [('site-1', 'slug'), ('site-2', 'slug'), ('site-3', 'name')]
+        )
+
+    def test_search_ranked_by_similarity(self):
+        results = self.backend.search('alpha')
+        self.assertEqual([r.object.name for r in results], ['Alpha', 'Alpha Bravo Charlie'])
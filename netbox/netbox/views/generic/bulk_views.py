@@ -10,7 +10,7 @@ from django.db import IntegrityError, router, transaction
 from django.db.models import ManyToManyField, ProtectedError, RestrictedError
 from django.db.models.fields.reverse_related import ManyToManyRel
 from django.forms import ModelMultipleChoiceField, MultipleHiddenInput
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext as _
@@ -25,8 +25,8 @@ from netbox.models.features import ChangeLoggingMixin
 from netbox.object_actions import AddObject, BulkDelete, BulkEdit, BulkExport, BulkImport, BulkRename
 from utilities.error_handlers import handle_protectederror
 from utilities.exceptions import AbortRequest, PermissionsViolation
-from utilities.export import TableExport
-from utilities.forms import BulkDeleteForm, BulkRenameForm, restrict_form_fields
+from utilities.export import EXPORT_CHUNK_SIZE, StreamingTableExport
+from utilities.forms import BulkDeleteForm, BulkRenameForm, ImportLookupCache, restrict_form_fields
 from utilities.forms.bulk_import import BulkImportForm
 from utilities.htmx import htmx_partial
 from utilities.jobs import is_background_request, process_request_as_job
@@ -74,15 +74,15 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
 
     def export_yaml(self):
         """
-        Export the queryset of objects as concatenated YAML documents.
+        Export the queryset of objects as concatenated YAML documents. Returns an iterator which retrieves and
+        serializes the objects in chunks.
         """
-        yaml_data = [obj.to_yaml() for obj in self.queryset]
-
-        return '---\n'.join(yaml_data)
+        for i, obj in enumerate(self.queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)):
+            yield f'---\n{obj.to_yaml()}' if i else obj.to_yaml()
 
     def export_table(self, table, columns=None, filename=None, delimiter=None):
         """
-        Export all table data in CSV format.
+        Export all table data in CSV format. The data is streamed to the client as it is rendered.
 
         Args:
             table: The Table instance to export
@@ -97,8 +97,7 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
             exclude_columns.update({
                 col for col in all_columns if col not in columns
             })
-        exporter = TableExport(
-            export_format=TableExport.CSV,
+        exporter = StreamingTableExport(
             table=table,
             exclude_columns=exclude_columns,
             delimiter=delimiter,
@@ -109,12 +108,39 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
 
     def export_template(self, template, request):
         """
-        Render an ExportTemplate using the current queryset.
+        Render an ExportTemplate using the current queryset. If the `background_job` query parameter is set, the
+        output is instead rendered to a file by a background job.
 
         Args:
             template: ExportTemplate instance
             request: The current request
         """
+        # Defer rendering to a background job if requested
+        if request.GET.get('background_job'):
+            job_name = _('Export {object_type} ({template})').format(
+                object_type=self.queryset.model._meta.verbose_name_plural,
+                template=template.name,
+            )
+            if process_request_as_job(self.__class__, request, name=job_name):
+                query_params = request.GET.copy()
+                query_params.pop('export')
+                query_params.pop('background_job')
+                redirect_url = f'{request.path}?{query_params.urlencode()}'
+                if safe_for_redirect(redirect_url):
+                    return redirect(redirect_url)
+                return redirect(get_action_url(self.queryset.model, action='list'))
+
+        # Save the rendered output to a file when running as a background job
+        if is_background_request(request):
+            job = request.job.job
+            path = f'{job.storage_path}{template.get_filename(queryset=self.queryset)}'
+            path = template.render_to_file(path, queryset=self.queryset)
+            job.data = {
+                'file': path,
+            }
+            request.job.logger.info(f'Saved rendered export to {path}')
+            return
+
         try:
             return template.render_to_response(queryset=self.queryset)
         except Exception as e:
@@ -174,7 +200,7 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
 
             # Check for YAML export support on the model
             elif hasattr(model, 'to_yaml'):
-                response = HttpResponse(self.export_yaml(), content_type='text/yaml')
+                response = StreamingHttpResponse(self.export_yaml(), content_type='text/yaml')
                 filename = 'netbox_{}.yaml'.format(self.queryset.model._meta.verbose_name_plural)
                 response['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
                 return response
@@ -461,6 +487,16 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
             for obj in self.queryset.model.objects.filter(id__in=prefetch_ids)
         } if prefetch_ids else {}
 
+        # Resolve related objects referenced by the records in bulk. Objects of the model being imported are
+        # excluded, as they may be created or modified by the import itself.
+        lookup_cache = ImportLookupCache(records, exclude_models=[self.queryset.model])
+
+        # Retrieve any custom fields with default values to apply to new objects
+        custom_fields = [
+            cf for cf in CustomField.objects.get_for_model(self.queryset.model)
+            if cf.ui_editable == CustomFieldUIEditableChoices.YES
+        ]
+
         for i, record in enumerate(records, start=1):
             object_id = int(record.pop('id')) if record.get('id') else None
 
@@ -484,10 +520,7 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
                 instance = self.queryset.model()
 
                 # For newly created objects, apply any default values for custom fields
-                for cf in CustomField.objects.get_for_model(self.queryset.model):
-                    if cf.ui_editable != CustomFieldUIEditableChoices.YES:
-                        # Skip custom fields which are not editable via the UI
-                        continue
+                for cf in custom_fields:
                     field_name = f'cf_{cf.name}'
                     if field_name not in record:
                         record[field_name] = cf.default
@@ -512,6 +545,7 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
                     del model_form.fields[field_name]
 
             restrict_form_fields(model_form, request.user)
+            lookup_cache.bind(model_form)
 
             if model_form.is_valid():
                 obj = self._save_object(model_form, request, i)
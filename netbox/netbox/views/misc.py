@@ -1,3 +1,4 @@
+import posixpath
 import re
 from collections import namedtuple
 import logging
@@ -6,6 +7,7 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
+from django.http import Http404
 from django.shortcuts import redirect, render
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import View
@@ -134,4 +136,7 @@ class MediaView(TokenConditionalLoginRequiredMixin, View):
     Wrap Django's serve() view to enforce LOGIN_REQUIRED for static media.
     """
     def get(self, request, path):
+        # Files produced by jobs must be retrieved via the permission-checked job download view
+        if posixpath.normpath(path).lstrip('/').startswith('jobs/'):
+            raise Http404
         return serve(request, path, document_root=settings.MEDIA_ROOT)
@@ -1,8 +1,12 @@
+from collections import Counter
+
 from django.apps import apps
-from django.db.models import F, Count, OuterRef, Subquery
+from django.db.models import F, Count, OuterRef, Q, Subquery
+from django.db.models.query_utils import DeferredAttribute
 from django.db.models.signals import post_delete, post_save, pre_delete
 
 from netbox.registry import registry
+from netbox.signals import post_bulk_create
 from .fields import CounterCacheField
 
 
@@ -13,6 +17,69 @@ def get_counters_for_model(model):
     return registry['counter_fields'][model].items()
 
 
+def get_conditional_counters_for_model(model):
+    """
+    Return the counter names, foreign keys and conditions for all conditional counters registered to the given model.
+    """
+    return [
+        (counter_name, field_name, condition)
+        for counter_name, (field_name, condition) in registry['counter_conditions'][model].items()
+    ]
+
+
+def get_condition_fields(model, condition):
+    """
+    Return the attribute names of all fields referenced by the given condition (a Q object).
+    """
+    fields = set()
+    for child in condition.children:
+        if isinstance(child, Q):
+            fields.update(get_condition_fields(model, child))
+        else:
+            field_name = child[0].split('__')[0]
+            fields.add(model._meta.get_field(field_name).attname)
+    return fields
+
+
+def evaluate_condition(condition, instance, values=None):
+    """
+    Evaluate a condition (a Q object) against a model instance, without querying the database. Only exact and isnull
+    lookups on local fields are supported. Values may be passed to override those of the instance's attributes.
+    """
+    values = values or {}
+    results = []
+    for child in condition.children:
+        if isinstance(child, Q):
+            results.append(evaluate_condition(child, instance, values))
+            continue
+        lookup, value = child
+        field_name, _, lookup_type = lookup.partition('__')
+        attname = instance._meta.get_field(field_name).attname
+        field_value = values[attname] if attname in values else getattr(instance, attname)
+        if lookup_type == 'isnull':
+            results.append((field_value is None) == value)
+        elif lookup_type in ('', 'exact'):
+            results.append(field_value == value)
+        else:
+            raise ValueError(f"Unsupported lookup for counter condition: {lookup}")
+    result = all(results) if condition.connector == Q.AND else any(results)
+    return not result if condition.negated else result
+
+
+def prefix_condition(condition, prefix):
+    """
+    Return a copy of the given condition (a Q object) with all lookups prefixed by a related query name.
+    """
+    prefixed = Q()
+    prefixed.connector = condition.connector
+    prefixed.negated = condition.negated
+    prefixed.children = [
+        prefix_condition(child, prefix) if isinstance(child, Q) else (f'{prefix}__{child[0]}', child[1])
+        for child in condition.children
+    ]
+    return prefixed
+
+
 def update_counter(model, pk, counter_name, value):
     """
     Increment or decrement a counter field on an object identified by its model and primary key (PK). Positive values
@@ -23,7 +90,7 @@ def update_counter(model, pk, counter_name, value):
     )
 
 
-def update_counts(model, field_name, related_query):
+def update_counts(model, field_name, related_query, condition=None, pks=None):
     """
     Perform a bulk update for the given model and counter field. For example,
 
@@ -32,15 +99,31 @@ def update_counts(model, field_name, related_query):
     will effectively set
 
         Device.objects.update(_interface_count=Count('interfaces'))
+
+    If a condition is specified, only related objects which satisfy it are counted. The update may be limited to
+    specific objects by passing their PKs.
     """
+    count = Count(related_query, filter=prefix_condition(condition, related_query) if condition else None)
     subquery = Subquery(
-        model.objects.filter(pk=OuterRef('pk')).annotate(_count=Count(related_query)).values('_count')
+        model.objects.filter(pk=OuterRef('pk')).annotate(_count=count).values('_count')
     )
-    return model.objects.update(**{
+    queryset = model.objects.all() if pks is None else model.objects.filter(pk__in=pks)
+    return queryset.update(**{
         field_name: subquery
     })
 
 
+def recalculate_counters(model, pks):
+    """
+    Recalculate the conditional counters of the objects related to the given objects. This must be called after
+    modifying objects in a manner which does not send the post_save signal (e.g. QuerySet.update()).
+    """
+    for counter_name, field_name, condition in get_conditional_counters_for_model(model):
+        fk_field = model._meta.get_field(field_name)
+        parent_pks = model.objects.filter(pk__in=pks).values(field_name)
+        update_counts(fk_field.related_model, counter_name, fk_field.related_query_name(), condition, parent_pks)
+
+
 #
 # Signal handlers
 #
@@ -49,6 +132,10 @@ def post_save_receiver(sender, instance, created, **kwargs):
     """
     Update counter fields on related objects when a TrackingModelMixin subclass is created or modified.
     """
+    # Objects created in bulk are handled by post_bulk_create_receiver()
+    if kwargs.get('bulk'):
+        return
+
     for field_name, counter_name in get_counters_for_model(sender):
         parent_model = sender._meta.get_field(field_name).related_model
         new_pk = getattr(instance, field_name, None)
@@ -61,6 +148,61 @@ def post_save_receiver(sender, instance, created, **kwargs):
         if new_pk is not None and (has_old_field or created):
             update_counter(parent_model, new_pk, counter_name, 1)
 
+    for counter_name, field_name, condition in get_conditional_counters_for_model(sender):
+        fk_field = sender._meta.get_field(field_name)
+        new_pk = getattr(instance, field_name, None)
+        new_match = evaluate_condition(condition, instance)
+        if created:
+            if new_pk is not None and new_match:
+                update_counter(fk_field.related_model, new_pk, counter_name, 1)
+            continue
+
+        # Determine whether the instance previously satisfied the condition, and for which parent
+        old_values = {
+            name: instance.tracker.get(name)
+            for name in (field_name, *get_condition_fields(sender, condition)) if name in instance.tracker
+        }
+        old_pk = old_values.get(field_name, new_pk)
+        if DeferredAttribute in old_values.values():
+            # A prior value is unknown; recount the related objects
+            pks = {pk for pk in (old_pk, new_pk) if pk not in (None, DeferredAttribute)}
+            update_counts(fk_field.related_model, counter_name, fk_field.related_query_name(), condition, pks)
+            continue
+        old_match = evaluate_condition(condition, instance, old_values)
+
+        # Update the counters on the old and/or new parents as needed
+        if (old_pk, old_match) != (new_pk, new_match):
+            if old_pk is not None and old_match:
+                update_counter(fk_field.related_model, old_pk, counter_name, -1)
+            if new_pk is not None and new_match:
+                update_counter(fk_field.related_model, new_pk, counter_name, 1)
+
+    # Clear the recorded changes now that they have been applied. (TrackingModelMixin.save() does this too, but is not
+    # reached on models which list the mixin after Model among their bases.)
+    instance.tracker.clear()
+
+
+def post_bulk_create_receiver(sender, instances, **kwargs):
+    """
+    Update counter fields on related objects when many TrackingModelMixin subclass instances are created at once,
+    incrementing each parent's counter once by the number of its new children.
+    """
+    for field_name, counter_name in get_counters_for_model(sender):
+        parent_model = sender._meta.get_field(field_name).related_model
+        counts = Counter(getattr(instance, field_name, None) for instance in instances)
+        for parent_pk, count in counts.items():
+            if parent_pk is not None:
+                update_counter(parent_model, parent_pk, counter_name, count)
+
+    for counter_name, field_name, condition in get_conditional_counters_for_model(sender):
+        parent_model = sender._meta.get_field(field_name).related_model
+        counts = Counter(
+            getattr(instance, field_name, None) for instance in instances if evaluate_condition(condition, instance)
+        )
+        for parent_pk, count in counts.items():
+            if parent_pk is not None:
+                update_counter(parent_model, parent_pk, counter_name, count)
+
 
 def pre_delete_receiver(sender, instance, origin, **kwargs):
     model = instance._meta.model
@@ -80,6 +222,15 @@ def post_delete_receiver(sender, instance, origin, **kwargs):
         if parent_pk is not None and not hasattr(instance, '_previously_removed'):
             update_counter(parent_model, parent_pk, counter_name, -1)
 
+    for counter_name, field_name, condition in get_conditional_counters_for_model(sender):
+        parent_model = sender._meta.get_field(field_name).related_model
+        parent_pk = getattr(instance, field_name, None)
+
+        # Decrement the parent's counter by one if the instance satisfied its condition
+        if parent_pk is not None and not hasattr(instance, '_previously_removed'):
+            if evaluate_condition(condition, instance):
+                update_counter(parent_model, parent_pk, counter_name, -1)
+
 
 #
 # Registration
@@ -101,8 +252,13 @@ def connect_counters(*models):
             to_model = apps.get_model(field.to_model_name)
 
             # Register the counter in the registry
-            change_tracking_fields = registry['counter_fields'][to_model]
-            change_tracking_fields[f'{field.to_field_name}_id'] = field.name
+            fk_field_name = f'{field.to_field_name}_id'
+            if field.condition is None:
+                registry['counter_fields'][to_model][fk_field_name] = field.name
+            else:
+                registry['counter_conditions'][to_model][field.name] = (fk_field_name, field.condition)
+                registry['tracked_fields'][to_model].update(get_condition_fields(to_model, field.condition))
+            registry['tracked_fields'][to_model].add(fk_field_name)
 
             # Connect signals once per child model
             if to_model in connected:
@@ -118,6 +274,12 @@ def connect_counters(*models):
                 weak=False,
                 dispatch_uid=f'{uid_base}.post_save',
             )
+            post_bulk_create.connect(
+                post_bulk_create_receiver,
+                sender=to_model,
+                weak=False,
+                dispatch_uid=f'{uid_base}.post_bulk_create',
+            )
             pre_delete.connect(
                 pre_delete_receiver,
                 sender=to_model,
@@ -1,12 +1,22 @@
+import csv
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.utils.encoding import force_str
 from django.utils.translation import gettext_lazy as _
 from django_tables2.export import TableExport as TableExport_
+from django_tables2.rows import BoundRow
 
 from utilities.constants import CSV_DELIMITERS
 
 __all__ = (
+    'StreamingTableExport',
     'TableExport',
 )
 
+# Number of objects to retrieve from the database (and rows to render) at a time when streaming an export
+EXPORT_CHUNK_SIZE = 500
+
 
 class TableExport(TableExport_):
     """
@@ -24,3 +34,65 @@ class TableExport(TableExport_):
             delimiter = CSV_DELIMITERS[self.delimiter]
             return self.dataset.export(self.format, delimiter=delimiter)
         return super().export()
+
+
+class _Echo:
+    """
+    A file-like object which returns the value written to it, for use with csv.writer.
+    """
+    def write(self, value):
+        return value
+
+
+class StreamingTableExport:
+    """
+    Export a table's data in CSV format as a stream of rows. Unlike TableExport, the data is never held in memory in
+    its entirety: Objects are retrieved from the database in chunks, and each row is rendered and written as it is
+    retrieved.
+    """
+    content_type = 'text/csv; charset=utf-8'
+
+    def __init__(self, table, exclude_columns=None, delimiter=None, chunk_size=EXPORT_CHUNK_SIZE):
+        if delimiter and delimiter not in CSV_DELIMITERS.keys():
+            raise ValueError(_("Invalid delimiter name: {name}").format(name=delimiter))
+        self.table = table
+        self.exclude_columns = exclude_columns or ()
+        self.delimiter = CSV_DELIMITERS[delimiter or 'comma']
+        self.chunk_size = chunk_size
+
+    def get_records(self):
+        """
+        Iterate over the table's records, retrieving them from the database in chunks where possible.
+        """
+        data = self.table.data.data
+        if isinstance(data, QuerySet):
+            return data.iterator(chunk_size=self.chunk_size)
+        return iter(self.table.data)
+
+    def __iter__(self):
+        columns = [
+            column for column in self.table.columns.iterall()
+            if not (column.column.exclude_from_export or column.name in self.exclude_columns)
+        ]
+        writer = csv.writer(_Echo(), delimiter=self.delimiter)
+
+        rows = [writer.writerow([force_str(column.header, strings_only=True) for column in columns])]
+        for record in self.get_records():
+            row = BoundRow(record, table=self.table)
+            rows.append(writer.writerow([
+                force_str(row.get_cell_value(column.name), strings_only=True) for column in columns
+            ]))
+            if len(rows) >= self.chunk_size:
+                yield ''.join(rows)
+                rows = []
+        if rows:
+            yield ''.join(rows)
+
+    def response(self, filename=None):
+        """
+        Return a StreamingHttpResponse containing the exported data.
+        """
+        response = StreamingHttpResponse(iter(self), content_type=self.content_type)
+        if filename is not None:
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
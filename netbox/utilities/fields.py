@@ -155,9 +155,10 @@ class RestrictedGenericForeignKey(GenericForeignKey):
 
 class CounterCacheField(models.BigIntegerField):
     """
-    Counter field to keep track of related model counts.
+    Counter field to keep track of related model counts. If a condition (a Q object) is specified, only related objects
+    which satisfy it are counted. Conditions may reference only local fields, using exact and isnull lookups.
     """
-    def __init__(self, to_model, to_field, *args, **kwargs):
+    def __init__(self, to_model, to_field, *args, condition=None, **kwargs):
         if not isinstance(to_model, str):
             raise TypeError(
                 _("%s(%r) is invalid. to_model parameter to CounterCacheField must be "
@@ -178,8 +179,19 @@ class CounterCacheField(models.BigIntegerField):
                 )
             )
 
+        if condition is not None and not isinstance(condition, models.Q):
+            raise TypeError(
+                _("%s(%r) is invalid. condition parameter to CounterCacheField must be "
+                  "a Q object")
+                % (
+                    self.__class__.__name__,
+                    condition,
+                )
+            )
+
         self.to_model_name = to_model
         self.to_field_name = to_field
+        self.condition = condition
 
         kwargs['default'] = kwargs.get('default', 0)
         kwargs['editable'] = False
@@ -190,6 +202,8 @@ class CounterCacheField(models.BigIntegerField):
         name, path, args, kwargs = super().deconstruct()
         kwargs["to_model"] = self.to_model_name
         kwargs["to_field"] = self.to_field_name
+        if self.condition is not None:
+            kwargs["condition"] = self.condition
         return name, path, args, kwargs
 
 
@@ -1,12 +1,19 @@
+from collections import defaultdict
+from itertools import batched
+
 from django import forms
 from django.utils.translation import gettext_lazy as _
 from django.contrib.contenttypes.models import ContentType
-from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist, FieldError
+from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist, FieldError, ValidationError
+from django.db import DatabaseError, router, transaction
 from django.db.models import Q
 
 from utilities.choices import unpack_grouped_choices
 from utilities.object_types import object_type_identifier
 
+# Maximum number of values to resolve per query when looking up related objects
+CSV_LOOKUP_BATCH_SIZE = 10000
+
 __all__ = (
     'CSVChoiceField',
     'CSVContentTypeField',
@@ -76,9 +83,40 @@ class CSVModelChoiceField(forms.ModelChoiceField):
     default_error_messages = {
         'invalid_choice': _('Object not found: %(value)s'),
     }
+    # Set by ImportLookupCache to resolve values in batches
+    lookup_cache = None
+    lookup_column = None
+
+    def get_lookup_map(self, values):
+        """
+        Resolve all the given values with a single query (per batch), returning a mapping of each value to the
+        matching objects. Returns None if the values cannot be resolved in bulk.
+        """
+        key = self.to_field_name or 'pk'
+        lookup_map = defaultdict(list)
+        try:
+            with transaction.atomic(using=router.db_for_read(self.queryset.model)):
+                for batch in batched(values, CSV_LOOKUP_BATCH_SIZE):
+                    for obj in self.queryset.filter(**{f'{key}__in': batch}):
+                        lookup_map[str(obj.serializable_value(key))].append(obj)
+        except (DatabaseError, FieldError, TypeError, ValidationError, ValueError):
+            return None
+        return lookup_map
+
+    def get_cached_objects(self, value):
+        """
+        Return the objects matching the given value from the lookup cache (if any), or None on a cache miss.
+        """
+        if self.lookup_cache is None or value in self.empty_values or not isinstance(value, (str, int)):
+            return None
+        return self.lookup_cache.get(self, value)
 
     def to_python(self, value):
         try:
+            if objects := self.get_cached_objects(value):
+                if len(objects) > 1:
+                    raise MultipleObjectsReturned
+                return objects[0]
             return super().to_python(value)
         except MultipleObjectsReturned:
             raise forms.ValidationError(
@@ -113,6 +151,12 @@ class CSVContentTypeField(CSVModelChoiceField):
     def prepare_value(self, value):
         return object_type_identifier(value)
 
+    def get_lookup_map(self, values):
+        # Object types are few in number, so simply retrieve all of them
+        return {
+            object_type_identifier(object_type): [object_type] for object_type in self.queryset
+        }
+
     def to_python(self, value):
         if not value:
             return None
@@ -120,6 +164,8 @@ class CSVContentTypeField(CSVModelChoiceField):
             app_label, model = value.split('.')
         except ValueError:
             raise forms.ValidationError(_('Object type must be specified as "<app>.<model>"'))
+        if objects := self.get_cached_objects(value):
+            return objects[0]
         try:
             return self.queryset.get(app_label=app_label, model=model)
         except ObjectDoesNotExist:
@@ -1,6 +1,7 @@
 import re
 
 from django import forms
+from django.core.exceptions import EmptyResultSet
 from django.forms.models import fields_for_model
 from django.utils.translation import gettext as _
 
@@ -9,6 +10,7 @@ from utilities.querysets import RestrictedQuerySet
 from .constants import *
 
 __all__ = (
+    'ImportLookupCache',
     'add_blank_choice',
     'expand_alphanumeric_pattern',
     'expand_ipaddress_pattern',
@@ -215,6 +217,83 @@ def restrict_form_fields(form, user, action='view'):
             field.queryset = field.queryset.restrict(user, action)
 
 
+class ImportLookupCache:
+    """
+    Resolve the related objects referenced by a set of bulk import records in batches. Rather than each form field
+    querying the database once per record, the values of each column are resolved together the first time the
+    column is cleaned and the results are reused for all subsequent records.
+
+    Only columns whose field queryset is identical for every record (e.g. restricted only to the objects the user is
+    permitted to view) are cached. Once the queryset of a column is found to be rescoped for an individual form (e.g.
+    limited to the assigned device), its values are looked up individually by the field as normal, as resolving the
+    entire column once per scope would scale with the number of records times the size of the column. Values which
+    cannot be resolved from the cache are likewise looked up individually.
+
+    Args:
+        records: The list of records (dictionaries) being imported
+        exclude_models: Models whose objects should never be cached (e.g. the model being imported, as its objects
+            may be created or modified during the import)
+    """
+    def __init__(self, records, exclude_models=None):
+        self.records = records
+        self.exclude_models = set(exclude_models or ())
+        self._values = {}
+        self._scopes = {}
+        self._rescoped = set()
+        self._cache = {}
+
+    def bind(self, form):
+        """
+        Attach the cache to all supporting fields on the given form.
+        """
+        for name, field in form.fields.items():
+            if not hasattr(field, 'lookup_cache') or field.queryset is None:
+                continue
+            if field.queryset.model in self.exclude_models:
+                continue
+            field.lookup_cache = self
+            field.lookup_column = name
+
+    def get_values(self, column):
+        """
+        Return the set of all values in the given column.
+        """
+        if column not in self._values:
+            self._values[column] = {
+                value for record in self.records
+                if isinstance(value := record.get(column), (str, int)) and value != '' and '\x00' not in str(value)
+            }
+        return self._values[column]
+
+    def get(self, field, value):
+        """
+        Return a list of the objects matching the value of a field, or None if the value cannot be resolved from
+        the cache.
+        """
+        column = field.lookup_column
+        if column in self._rescoped:
+            return None
+        try:
+            sql, params = field.queryset.query.sql_with_params()
+            scope = (field.to_field_name, sql, params)
+            hash(scope)
+        except (EmptyResultSet, TypeError):
+            return None
+
+        # Stop caching the column if its queryset differs from that of the first record
+        if self._scopes.setdefault(column, scope) != scope:
+            self._rescoped.add(column)
+            self._cache.pop(column, None)
+            return None
+
+        if column not in self._cache:
+            self._cache[column] = field.get_lookup_map(self.get_values(column))
+        if self._cache[column] is None:
+            return None
+
+        return self._cache[column].get(str(value))
+
+
 def parse_csv(reader):
     """
     Parse a csv_reader object into a headers dictionary and a list of records dictionaries. Raise an error
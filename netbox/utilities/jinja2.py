@@ -1,3 +1,7 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
 from django.apps import apps
 from jinja2 import BaseLoader, TemplateNotFound
 from jinja2.meta import find_referenced_templates
@@ -6,10 +10,17 @@ from jinja2.sandbox import SandboxedEnvironment
 from netbox.config import get_config
 
 __all__ = (
+    'CachingSandboxedEnvironment',
     'DataFileLoader',
+    'TemplateCache',
+    'get_jinja2_template',
     'render_jinja2',
+    'template_cache',
 )
 
+# Maximum number of compiled templates to retain in the process-wide cache
+TEMPLATE_CACHE_SIZE = 1024
+
 
 class DataFileLoader(BaseLoader):
     """
@@ -45,19 +56,102 @@ class DataFileLoader(BaseLoader):
         self._template_cache.update(templates)
 
 
+class TemplateCache:
+    """
+    A thread-safe, size-bounded LRU cache of compiled Jinja2 template code.
+    """
+    def __init__(self, max_size=TEMPLATE_CACHE_SIZE):
+        self.max_size = max_size
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._templates)
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._templates.move_to_end(key)
+                return self._templates[key]
+            except KeyError:
+                return None
+
+    def set(self, key, code):
+        with self._lock:
+            self._templates[key] = code
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+
+template_cache = TemplateCache()
+
+
+class CachingSandboxedEnvironment(SandboxedEnvironment):
+    """
+    A sandboxed Jinja2 environment which retains the code compiled from each template source in the process-wide
+    template cache. Only the compiled code is cached: templates are always loaded (and any DataFiles read) afresh
+    by each environment, which is bound to a single render. cache_key identifies the configuration of the
+    environment; if None, templates are not cached.
+    """
+    def __init__(self, cache_key=None, **kwargs):
+        super().__init__(**kwargs)
+        self.cache_key = cache_key
+
+    def compile(self, source, name=None, filename=None, raw=False, defer_init=False):
+        if self.cache_key is None or raw or not isinstance(source, str):
+            return super().compile(source, name, filename, raw, defer_init)
+
+        key = (self.cache_key, hashlib.sha256(source.encode()).hexdigest(), name, filename, defer_init)
+        if (code := template_cache.get(key)) is None:
+            code = super().compile(source, name, filename, raw, defer_init)
+            template_cache.set(key, code)
+        return code
+
+
 #
 # Utility functions
 #
 
-def render_jinja2(template_code, context, environment_params=None, data_file=None):
+def _freeze(value):
     """
-    Render a Jinja2 template with the provided context. Return the rendered content.
+    Return a hashable representation of the given environment parameter value.
     """
-    environment_params = environment_params or {}
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    hash(value)
+    return value
+
+
+def _get_cache_key(environment_params):
+    """
+    Return the key identifying the configuration of an environment created with the given parameters (and the
+    configured filters), or None if it cannot be determined. The loader does not affect compilation and is ignored.
+    """
+    try:
+        params = _freeze({k: v for k, v in environment_params.items() if k != 'loader'})
+        filters = _freeze(get_config().JINJA2_FILTERS)
+    except TypeError:
+        return None
+    return params, filters
+
+
+def get_jinja2_template(template_code, environment_params=None, data_file=None):
+    """
+    Return a Jinja2 template for the given code, reusing previously compiled code where possible.
+    """
+    environment_params = {**(environment_params or {})}
+    cache_key = _get_cache_key(environment_params)
 
     if 'loader' not in environment_params:
         if data_file:
-            loader = DataFileLoader(data_file.source)
+            loader = DataFileLoader(data_file.source_id)
             loader.cache_templates({
                 data_file.path: template_code
             })
@@ -65,11 +159,17 @@ def render_jinja2(template_code, context, environment_params=None, data_file=Non
             loader = BaseLoader()
         environment_params['loader'] = loader
 
-    environment = SandboxedEnvironment(**environment_params)
+    environment = CachingSandboxedEnvironment(cache_key=cache_key, **environment_params)
     environment.filters.update(get_config().JINJA2_FILTERS)
 
     if data_file:
-        template = environment.get_template(data_file.path)
-    else:
-        template = environment.from_string(source=template_code)
+        return environment.get_template(data_file.path)
+    return environment.from_string(source=template_code)
+
+
+def render_jinja2(template_code, context, environment_params=None, data_file=None):
+    """
+    Render a Jinja2 template with the provided context. Return the rendered content.
+    """
+    template = get_jinja2_template(template_code, environment_params, data_file)
     return template.render(**context)
@@ -13,7 +13,7 @@ class Command(BaseCommand):
     def collect_models():
         """
         Query the registry to find all models which have one or more counter fields. Return a mapping of counter fields
-        to related query names for each model.
+        to related query names and conditions (if any) for each model.
         """
         models = defaultdict(dict)
 
@@ -22,13 +22,18 @@ class Command(BaseCommand):
                 fk_field = model._meta.get_field(field_name)        # Interface.device
                 parent_model = fk_field.related_model               # Device
                 related_query_name = fk_field.related_query_name()  # 'interfaces'
-                models[parent_model][counter_name] = related_query_name
+                models[parent_model][counter_name] = (related_query_name, None)
+
+        for model, field_mappings in registry['counter_conditions'].items():
+            for counter_name, (field_name, condition) in field_mappings.items():
+                fk_field = model._meta.get_field(field_name)
+                models[fk_field.related_model][counter_name] = (fk_field.related_query_name(), condition)
 
         return models
 
     def handle(self, *model_names, **options):
         for model, mappings in self.collect_models().items():
-            for field_name, related_query in mappings.items():
-                update_counts(model, field_name, related_query)
+            for field_name, (related_query, condition) in mappings.items():
+                update_counts(model, field_name, related_query, condition)
 
         self.stdout.write(self.style.SUCCESS('Finished.'))
@@ -6,6 +6,7 @@ from utilities.permissions import get_permission_for_model, permission_is_exempt
 __all__ = (
     'RestrictedPrefetch',
     'RestrictedQuerySet',
+    'iterate_in_chunks',
 )
 
 
@@ -68,3 +69,39 @@ class RestrictedQuerySet(QuerySet):
             return self.filter(pk__in=allowed_objects)
 
         return self
+
+
+class ChunkedIterationMixin:
+    """
+    Retrieve objects from the database in chunks when the QuerySet is iterated, rather than fetching and caching the
+    entire result set.
+    """
+    chunk_size = 1000
+
+    def __iter__(self):
+        if self._result_cache is None:
+            return self.iterator(chunk_size=self.chunk_size)
+        return super().__iter__()
+
+
+_chunked_queryset_classes = {}
+
+
+def iterate_in_chunks(queryset, chunk_size=None):
+    """
+    Return a copy of the QuerySet which retrieves objects in chunks of the specified size when iterated. This is
+    useful when passing a QuerySet to code (such as a template) which iterates over it only once.
+    """
+    queryset_class = queryset.__class__
+    if not issubclass(queryset_class, ChunkedIterationMixin):
+        if queryset_class not in _chunked_queryset_classes:
+            _chunked_queryset_classes[queryset_class] = type(
+                f'Chunked{queryset_class.__name__}', (ChunkedIterationMixin, queryset_class), {}
+            )
+        queryset_class = _chunked_queryset_classes[queryset_class]
+
+    queryset = queryset.all()
+    queryset.__class__ = queryset_class
+    if chunk_size:
+        queryset.chunk_size = chunk_size
+    return queryset
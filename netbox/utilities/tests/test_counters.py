@@ -1,3 +1,4 @@
+from django.core.management import call_command
 from django.test import override_settings
 from django.urls import reverse
 
@@ -82,6 +83,104 @@ class CountersTest(TestCase):
         self.assertEqual(device1.interface_count, 1)
         self.assertEqual(device2.interface_count, 3)
 
+    def test_enabled_interface_count(self):
+        """
+        A conditional counter should count only the tracked objects which satisfy its condition.
+        """
+        device1, device2 = Device.objects.all()
+        self.assertEqual(device1.enabled_interface_count, 2)
+        self.assertEqual(device2.enabled_interface_count, 2)
+
+        # Disable an interface
+        interface1 = Interface.objects.get(name='Interface 1')
+        interface1.enabled = False
+        interface1.save()
+        device1.refresh_from_db()
+        self.assertEqual(device1.enabled_interface_count, 1)
+
+        # Move the disabled interface to another device
+        interface1.device = device2
+        interface1.save()
+        device1.refresh_from_db()
+        device2.refresh_from_db()
+        self.assertEqual(device1.enabled_interface_count, 1)
+        self.assertEqual(device2.enabled_interface_count, 2)
+
+        # Enable the interface
+        interface1.enabled = True
+        interface1.save()
+        device2.refresh_from_db()
+        self.assertEqual(device2.enabled_interface_count, 3)
+
+        # Move an enabled interface to another device
+        interface1.device = device1
+        interface1.save()
+        device1.refresh_from_db()
+        device2.refresh_from_db()
+        self.assertEqual(device1.enabled_interface_count, 2)
+        self.assertEqual(device2.enabled_interface_count, 2)
+
+        # Delete an enabled interface
+        interface1.delete()
+        device1.refresh_from_db()
+        self.assertEqual(device1.enabled_interface_count, 1)
+
+    def test_connected_interface_count(self):
+        """
+        Connected component counters should follow the creation and deletion of cables.
+        """
+        device1, device2 = Device.objects.all()
+        self.assertEqual(device1.connected_interface_count, 0)
+        self.assertEqual(device2.connected_interface_count, 0)
+
+        # Connect two interfaces with a cable
+        cable = Cable(
+            a_terminations=[Interface.objects.get(name='Interface 1')],
+            b_terminations=[Interface.objects.get(name='Interface 3')]
+        )
+        cable.save()
+        device1.refresh_from_db()
+        device2.refresh_from_db()
+        self.assertEqual(device1.connected_interface_count, 1)
+        self.assertEqual(device2.connected_interface_count, 1)
+
+        # Mark an interface as connected
+        interface2 = Interface.objects.get(name='Interface 2')
+        interface2.mark_connected = True
+        interface2.save()
+        device1.refresh_from_db()
+        self.assertEqual(device1.connected_interface_count, 2)
+
+        # Delete the cable
+        cable.delete()
+        device1.refresh_from_db()
+        device2.refresh_from_db()
+        self.assertEqual(device1.connected_interface_count, 1)
+        self.assertEqual(device2.connected_interface_count, 0)
+        self.assertEqual(device1.get_component_summary()['interfaces'], {
+            'total': 2,
+            'connected': 1,
+            'unconnected': 1,
+            'enabled': 2,
+            'disabled': 0,
+        })
+
+    def test_calculate_cached_counts(self):
+        """
+        The calculate_cached_counts management command should recalculate conditional counters.
+        """
+        interface1 = Interface.objects.get(name='Interface 1')
+        interface1.mark_connected = True
+        interface1.save()
+        Device.objects.update(connected_interface_count=5, enabled_interface_count=0)
+
+        call_command('calculate_cached_counts')
+        device1, device2 = Device.objects.all()
+        self.assertEqual(device1.connected_interface_count, 1)
+        self.assertEqual(device2.connected_interface_count, 0)
+        self.assertEqual(device1.enabled_interface_count, 2)
+        self.assertEqual(device2.enabled_interface_count, 2)
+
     @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
     def test_mptt_child_delete(self):
         device1 = Device.objects.first()
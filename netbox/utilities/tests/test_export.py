@@ -0,0 +1,51 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase
+
+from dcim.models import Site
+from dcim.tables import SiteTable
+from utilities.export import StreamingTableExport, TableExport
+
+
+class StreamingTableExportTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', facility='Facility, "quoted"', description=f'Site {i}')
+            for i in range(1, 6)
+        ])
+
+    def _get_table(self):
+        table = SiteTable(Site.objects.order_by('-name'))
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        table.configure(request)
+        return table
+
+    def test_export_matches_table_export(self):
+        for delimiter in ('comma', 'semicolon'):
+            with self.subTest(delimiter=delimiter):
+                expected = TableExport(
+                    export_format=TableExport.CSV,
+                    table=self._get_table(),
+                    exclude_columns={'pk', 'actions'},
+                    delimiter=delimiter
+                ).export()
+                exporter = StreamingTableExport(
+                    table=self._get_table(),
+                    exclude_columns={'pk', 'actions'},
+                    delimiter=delimiter,
+                    chunk_size=2
+                )
+                chunks = list(exporter)
+                self.assertEqual(len(chunks), 3)
+                self.assertEqual(''.join(chunks), expected)
+
+    def test_response(self):
+        exporter = StreamingTableExport(table=self._get_table(), exclude_columns={'pk', 'actions'})
+        response = exporter.response(filename='sites.csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="sites.csv"')
+        content = b''.join(response.streaming_content).decode()
+        self.assertEqual(len(content.splitlines()), 6)
+        self.assertIn('Site 1', content)
@@ -4,9 +4,12 @@ from django.test import TestCase
 from dcim.models import Site
 from netbox.choices import ImportFormatChoices
 from utilities.forms.bulk_import import BulkImportForm
-from utilities.forms.fields.csv import CSVSelectWidget
+from core.models import ObjectType
+from utilities.forms.fields.csv import CSVContentTypeField, CSVModelChoiceField, CSVSelectWidget
 from utilities.forms.forms import BulkRenameForm
-from utilities.forms.utils import get_field_value, expand_alphanumeric_pattern, expand_ipaddress_pattern
+from utilities.forms.utils import (
+    ImportLookupCache, get_field_value, expand_alphanumeric_pattern, expand_ipaddress_pattern,
+)
 from utilities.forms.widgets.select import AvailableOptions, SelectedOptions
 
 
@@ -550,3 +553,94 @@ class SelectMultipleWidgetTest(TestCase):
         self.assertEqual(widget.choices[0][1], [(2, 'Option 2')])
         self.assertEqual(widget.choices[1][0], 'Group B')
         self.assertEqual(widget.choices[1][1], [(3, 'Option 3')])
+
+
+class ImportLookupCacheTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        class TestForm(forms.Form):
+            site = CSVModelChoiceField(
+                queryset=Site.objects.all(),
+                to_field_name='name',
+                required=False
+            )
+            object_type = CSVContentTypeField(
+                queryset=ObjectType.objects.all(),
+                required=False
+            )
+        cls.form_class = TestForm
+
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 6)
+        ])
+
+    def clean_records(self, records):
+        lookup_cache = ImportLookupCache(records)
+        results = []
+        for record in records:
+            form = self.form_class(data=record)
+            lookup_cache.bind(form)
+            self.assertTrue(form.is_valid(), form.errors)
+            results.append(form.cleaned_data)
+        return results
+
+    def test_resolve_in_bulk(self):
+        records = [
+            {'site': f'Site {i}', 'object_type': 'dcim.site'} for i in range(1, 6)
+        ]
+        # One query per column (plus a savepoint for the site lookup)
+        with self.assertNumQueries(4):
+            results = self.clean_records(records)
+        self.assertEqual([r['site'].name for r in results], [f'Site {i}' for i in range(1, 6)])
+        self.assertEqual(results[0]['object_type'], ObjectType.objects.get_for_model(Site))
+
+    def test_restricted_queryset(self):
+        records = [{'site': 'Site 1'}, {'site': 'Site 2'}]
+        lookup_cache = ImportLookupCache(records)
+        form = self.form_class(data=records[0])
+        form.fields['site'].queryset = form.fields['site'].queryset.filter(name='Site 2')
+        lookup_cache.bind(form)
+        self.assertFalse(form.is_valid())
+        self.assertIn('site', form.errors)
+
+        form = self.form_class(data=records[1])
+        form.fields['site'].queryset = form.fields['site'].queryset.filter(name='Site 2')
+        lookup_cache.bind(form)
+        self.assertTrue(form.is_valid())
+
+    def test_rescoped_queryset(self):
+        records = [{'site': f'Site {i}'} for i in range(1, 4)]
+        lookup_cache = ImportLookupCache(records)
+        for i, record in enumerate(records):
+            form = self.form_class(data=record)
+            form.fields['site'].queryset = form.fields['site'].queryset.filter(name=record['site'])
+            lookup_cache.bind(form)
+            if i:
+                # Records whose queryset has been rescoped are resolved individually rather than per column
+                with self.assertNumQueries(1):
+                    self.assertTrue(form.is_valid(), form.errors)
+            else:
+                self.assertTrue(form.is_valid(), form.errors)
+            self.assertEqual(form.cleaned_data['site'].name, record['site'])
+
+    def test_cache_miss(self):
+        records = [{'site': 'Site 1'}, {'site': 'Site 6'}]
+        lookup_cache = ImportLookupCache(records)
+        form = self.form_class(data=records[0])
+        lookup_cache.bind(form)
+        self.assertTrue(form.is_valid())
+
+        # Objects created after the cache has been populated are still resolved
+        Site.objects.create(name='Site 6', slug='site-6')
+        form = self.form_class(data=records[1])
+        lookup_cache.bind(form)
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['site'].name, 'Site 6')
+
+    def test_exclude_models(self):
+        lookup_cache = ImportLookupCache([], exclude_models=[Site])
+        form = self.form_class(data={})
+        lookup_cache.bind(form)
+        self.assertIsNone(form.fields['site'].lookup_cache)
+        self.assertIs(form.fields['object_type'].lookup_cache, lookup_cache)
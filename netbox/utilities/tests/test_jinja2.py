@@ -0,0 +1,75 @@
+import hashlib
+
+from django.test import TestCase
+from django.utils.timezone import now
+
+from core.models import DataFile, DataSource
+from utilities.jinja2 import TemplateCache, get_jinja2_template, render_jinja2, template_cache
+
+
+class TemplateCacheTestCase(TestCase):
+
+    def setUp(self):
+        template_cache.clear()
+
+    def test_render_cached_template(self):
+        self.assertEqual(render_jinja2('Hello {{ name }}', {'name': 'foo'}), 'Hello foo')
+        self.assertEqual(render_jinja2('Hello {{ name }}', {'name': 'bar'}), 'Hello bar')
+        self.assertEqual(len(template_cache), 1)
+
+    def test_cache_key(self):
+        get_jinja2_template('{{ foo }}')
+        get_jinja2_template('{{ foo }}')
+        self.assertEqual(len(template_cache), 1)
+
+        # Templates with different code or environment parameters are cached separately
+        get_jinja2_template('{{ bar }}')
+        get_jinja2_template('{{ foo }}', {'trim_blocks': True})
+        get_jinja2_template('{{ foo }}', {'trim_blocks': True})
+        self.assertEqual(len(template_cache), 3)
+
+    def test_environment_params_not_modified(self):
+        environment_params = {'trim_blocks': True}
+        get_jinja2_template('{{ foo }}', environment_params)
+        self.assertEqual(environment_params, {'trim_blocks': True})
+
+    def test_unhashable_environment_params(self):
+        environment_params = {'extensions': [bytearray(b'jinja2.ext.do')]}
+        with self.assertRaises(Exception):
+            # The extension is invalid, but the parameters must still be passed through to the environment
+            get_jinja2_template('{{ foo }}', environment_params)
+        self.assertEqual(len(template_cache), 0)
+
+    def test_data_file_includes(self):
+        datasource = DataSource.objects.create(name='Data Source 1', type='local', source_url='file:///tmp/foo/')
+        datafiles = []
+        for path, data in (('main.j2', b'{% include "child.j2" %}'), ('child.j2', b'foo')):
+            datafiles.append(DataFile.objects.create(
+                source=datasource,
+                path=path,
+                last_updated=now(),
+                size=len(data),
+                hash=hashlib.sha256(data).hexdigest(),
+                data=data,
+            ))
+        main = DataFile.objects.get(pk=datafiles[0].pk)
+        self.assertEqual(render_jinja2(main.data_as_string, {}, data_file=main), 'foo')
+
+        # Included files are read afresh for each render (without retrieving the DataSource)
+        datafiles[1].data = b'bar'
+        datafiles[1].save()
+        with self.assertNumQueries(1):
+            self.assertEqual(render_jinja2(main.data_as_string, {}, data_file=main), 'bar')
+        self.assertEqual(len(template_cache), 3)
+
+    def test_lru_eviction(self):
+        cache = TemplateCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+
+        # The least recently used entry has been evicted
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
@@ -0,0 +1,31 @@
+from django.test import TestCase
+
+from dcim.models import Site
+from utilities.querysets import iterate_in_chunks
+
+
+class IterateInChunksTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 6)
+        ])
+
+    def test_iterate_in_chunks(self):
+        queryset = iterate_in_chunks(Site.objects.order_by('name'), chunk_size=2)
+        self.assertIsInstance(queryset, Site.objects.none().__class__)
+        self.assertEqual([site.name for site in queryset], [f'Site {i}' for i in range(1, 6)])
+
+        # Results are not cached when iterating
+        self.assertIsNone(queryset._result_cache)
+
+        # Derived querysets are also iterated in chunks
+        queryset = queryset.filter(name__in=['Site 1', 'Site 2'])
+        self.assertEqual(len([site for site in queryset]), 2)
+        self.assertIsNone(queryset._result_cache)
+
+    def test_evaluated_queryset(self):
+        queryset = iterate_in_chunks(Site.objects.all())
+        self.assertEqual(len(queryset), 5)
+        self.assertEqual(len(list(queryset)), 5)
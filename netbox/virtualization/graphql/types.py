@@ -91,7 +91,7 @@ class ClusterTypeType(OrganizationalObjectType):
 
 @strawberry_django.type(
     models.VirtualMachine,
-    fields='__all__',
+    exclude=['_config_context'],
     filters=VirtualMachineFilter,
     pagination=True
 )
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('virtualization', '0052_gfk_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='virtualmachine',
+            name='_config_context',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
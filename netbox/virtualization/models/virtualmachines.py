@@ -150,6 +150,14 @@ class VirtualMachine(ContactsMixin, ImageAttachmentsMixin, RenderConfigMixin, Co
         to_field='virtual_machine'
     )
 
+    # Materialized merge of all applicable ConfigContexts (excluding local context data). Null if not yet computed or
+    # invalidated by a change.
+    _config_context = models.JSONField(
+        blank=True,
+        null=True,
+        editable=False
+    )
+
     objects = ConfigContextModelQuerySet.as_manager()
 
     clone_fields = (
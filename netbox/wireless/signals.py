@@ -6,6 +6,7 @@ from django.dispatch import receiver
 from dcim.exceptions import UnsupportedCablePath
 from dcim.models import CablePath, Interface
 from dcim.utils import create_cablepaths
+from utilities.counters import recalculate_counters
 from utilities.exceptions import AbortRequest
 from .models import WirelessLink
 
@@ -55,6 +56,7 @@ def nullify_connected_interfaces(instance, **kwargs):
     if instance.interface_b is not None:
         logger.debug(f"Nullifying interface B for wireless link {instance}")
         Interface.objects.filter(pk=instance.interface_b.pk).update(wireless_link=None)
+    recalculate_counters(Interface, [instance.interface_a_id, instance.interface_b_id])
 
     # Delete and retrace any dependent cable paths
     for cablepath in CablePath.objects.filter(_nodes__contains=instance):